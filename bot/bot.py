@@ -6,7 +6,6 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 import discord
-import pytz
 from discord.ext import tasks
 
 from shared import (
@@ -25,26 +24,64 @@ from shared import (
     time_funcs,
     todo,
 )
+from shared.autocomplete import (
+    AUTOCOMPLETE_KIND_CURRENCY,
+    AUTOCOMPLETE_KIND_REMINDER,
+    AUTOCOMPLETE_KIND_UNIT,
+    autocomplete_cache,
+)
 from shared.config import config
 from shared.db import db
+from shared.db.executor import db_executor, run_db
+from shared.discord_cache import (
+    forget_channel,
+    forget_user,
+    get_discord_cache_stats,
+    get_or_create_dm_channel,
+)
 from shared.errors import InvalidInputError
 from shared.live_messages import (
-    refresh_live_message,
-    should_refresh_live_message_this_tick,
-    stop_live_message,
+    LiveMessageRefreshEngine,
+    live_message_registry,
+    save_live_message_refresh_slots,
+    select_active_live_messages,
     supersede_conflicting_live_messages,
 )
 from shared.log import (
+    command_var,
+    finish_span_trace,
+    get_log_queue_stats,
+    get_log_sampling_stats,
     get_ray_id,
     log_and_send_message_command,
     log_and_send_message_interaction,
     log_event,
     log_interaction,
     ray_id_var,
+    start_span_trace,
+)
+from shared.loop_monitor import loop_lag_monitor, slow_callback_detector
+from shared.metrics import (
+    COMMAND_ERRORS_TOTAL,
+    COMMAND_LATENCY_SECONDS,
+    format_latency_table,
+    metrics,
 )
 from shared.models import LiveMessage
-from shared.reminder import EditReminderModal, Reminder
-from shared.utils import format_number, guild_only
+from shared.reminder import (
+    EditReminderModal,
+    Reminder,
+    ReminderDeliveryPipeline,
+    delete_delivered_reminders,
+    get_reminder_messages,
+    invalidate_reminder_autocomplete,
+    reload_due_reminders,
+    reminder_scheduler,
+    schedule_reminder_retry,
+    select_reminder_due_times,
+)
+from shared.timezone import timezone_index
+from shared.utils import guild_only
 
 # Create bot instance
 intents = discord.Intents.default()
@@ -130,9 +167,18 @@ async def on_ready():
         log_event("LIVE_MESSAGES_START", level="debug")
         if not refresh_live_messages.is_running():
             refresh_live_messages.start()
+        if not rebalance_live_message_slots.is_running():
+            rebalance_live_message_slots.start()
         log_event("LIVE_MESSAGES_LOOP_STARTED", level="debug")
     except Exception as e:
         log_event("LIVE_MESSAGES_START_ERROR", {"error": str(e)}, level="error")
+    if not refresh_currency_rates.is_running():
+        refresh_currency_rates.start()
+    slow_callback_detector.install()
+    loop_lag_monitor.start()
+    # Start health check loop after bot is ready
+    if not health_check.is_running():
+        health_check.start()
 
 
 @client.event
@@ -195,6 +241,10 @@ async def on_message(message: discord.Message):
             import time
 
             start_time = time.perf_counter()
+            # Unrecognised commands share one label so arbitrary user text cannot grow the metric series.
+            metric_command = f"!{command}"
+            command_token = command_var.set(metric_command)
+            span_token = start_span_trace()
             match command:
                 case "sync":
                     if message.author.id == config.bot_admin_id:
@@ -294,13 +344,13 @@ async def on_message(message: discord.Message):
                 case "todo":
                     # Use guild_id for guild messages; None for DMs (private todo list).
                     todo_guild_id = message.guild.id if message.guild else None
-                    result = todo.handle_todo_command(args, message.author, message.mentions, todo_guild_id)
+                    result = await run_db(todo.handle_todo_command, args, message.author, message.mentions, todo_guild_id)
                 case "color":
                     result, files = color.handle_color_command(args)
                 case "clock" | "clocks":
                     guild_id = message.guild.id if message.guild else None
                     user_id = None if message.guild else message.author.id
-                    result = time_funcs.handle_world_clock_command(args, guild_id, user_id)
+                    result = await run_db(time_funcs.handle_world_clock_command, args, guild_id, user_id)
                 case "encode":
                     result = encode.handle_encode_decode_command(args, "encode")
                 case "decode":
@@ -308,16 +358,23 @@ async def on_message(message: discord.Message):
                 case "transform":
                     result = text_transform.handle_text_transform_command(args)
                 case "daily":
-                    result = daily_checklist.handle_daily_checklist_command(args, message.author)
+                    result = await run_db(daily_checklist.handle_daily_checklist_command, args, message.author)
                 case "fortune":
                     result = fortune.get_fortune(message.author.id)
                 case "conversion":
                     result = conversion.handle_conversion_command(args)
                 case "currency":
-                    result = currency.handle_currency_command(args)
+                    result = await currency.handle_currency_command_async(args)
                 case "rand" | "random":
                     result = dice.random_command(args)
+                case "metrics":
+                    if message.author.id == config.bot_admin_id:
+                        result = format_latency_table()
+                    else:
+                        result = "You don't have permission to view metrics."
                 case _:
+                    metric_command = "!unknown"
+                    command_var.set(metric_command)
                     result = "Command not recognized."
             exec_time = time.perf_counter() - start_time
             if files:
@@ -326,6 +383,7 @@ async def on_message(message: discord.Message):
                 await log_and_send_message_command(message, result, exec_time=exec_time)
         except InvalidInputError as e:
             exec_time = time.perf_counter() - start_time
+            metrics.inc(COMMAND_ERRORS_TOTAL, {"command": metric_command})
             log_event(
                 "MESSAGE_COMMAND_ERROR",
                 {
@@ -341,6 +399,7 @@ async def on_message(message: discord.Message):
             await log_and_send_message_command(message, f"Error: {e}", exec_time=exec_time)
         except ValueError as e:
             exec_time = time.perf_counter() - start_time
+            metrics.inc(COMMAND_ERRORS_TOTAL, {"command": metric_command})
             log_event(
                 "MESSAGE_COMMAND_ERROR",
                 {
@@ -354,6 +413,11 @@ async def on_message(message: discord.Message):
                 level="error",
             )
             await log_and_send_message_command(message, f"Error: {e}", exec_time=exec_time)
+        finally:
+            exec_time = time.perf_counter() - start_time
+            metrics.observe(COMMAND_LATENCY_SECONDS, exec_time, {"command": metric_command})
+            finish_span_trace(span_token, command=metric_command, total_seconds=exec_time)
+            command_var.reset(command_token)
     finally:
         ray_id_var.reset(token)
 
@@ -476,29 +540,35 @@ def unit_choices(current="") -> list[discord.app_commands.Choice[str]]:
     ][:25]
 
 
-async def to_unit_list_autocomplete(interaction: discord.Interaction, current: str):
-    # Get the selected from_unit from the interaction options
-    from_unit_value = None
-    for option in interaction.data.get("options", []):
-        if option.get("name") == "from_unit":
-            from_unit_value = option.get("value")
-            break
-    # If from_unit is not set, return all units as Choices
+def build_to_unit_candidates(from_unit_value: str | None) -> list[str]:
+    # If from_unit is not set, offer all units
     if not from_unit_value:
-        return unit_choices(current)
+        return [unit.value for unit in conversion.UnitTypeChoice]
     try:
         from_enum = conversion.parse_unit(from_unit_value)
         from_category = from_enum.category
     except Exception:
-        return unit_choices(current)
-    # Only show units in the same category, excluding the from_unit
+        return [unit.value for unit in conversion.UnitTypeChoice]
+    # Only offer units in the same category, excluding the from_unit
     return [
-        discord.app_commands.Choice(name=unit.value, value=unit.value)
+        unit.value
         for unit in conversion.UnitTypeChoice
-        if getattr(conversion.parse_unit(unit.value), "category", None) == from_category
-        and unit.value != from_unit_value
-        and current.lower() in unit.value.lower()
-    ][:25]
+        if getattr(conversion.parse_unit(unit.value), "category", None) == from_category and unit.value != from_unit_value
+    ]
+
+
+async def to_unit_list_autocomplete(interaction: discord.Interaction, current: str):
+    # Get the selected from_unit from the interaction options
+    from_unit_value = None
+    for option in interaction.data.get("options", []):
+        if option.get("name") == "from_unit":
+            from_unit_value = option.get("value")
+            break
+    candidates = autocomplete_cache.get_or_build(
+        AUTOCOMPLETE_KIND_UNIT, None, from_unit_value or None, lambda: build_to_unit_candidates(from_unit_value)
+    )
+    current_lower = current.lower()
+    return [discord.app_commands.Choice(name=unit, value=unit) for unit in candidates if current_lower in unit.lower()][:25]
 
 
 @tree.command(name="conversion", description="Convert between units (length, mass, volume)")
@@ -544,23 +614,41 @@ async def height_slash_command(interaction: discord.Interaction, feet: int = Non
     )
 
 
+def build_currency_candidates() -> list[tuple[str, str, str]]:
+    # (code, choice name, lowercased search text) for every known currency
+    candidates = []
+    for code in currency.CURRENCY_NAMES:
+        name = currency.get_currency_name(code)
+        candidates.append((code, f"{code} - {name}", f"{code.lower()}\n{name.lower()}"))
+    return candidates
+
+
 # Provide choices for the dropdowns using CURRENCY_NAMES, with contains search
 async def currency_list_autocomplete(interaction: discord.Interaction, current: str):
     current_lower = current.lower()
+    candidates = autocomplete_cache.get_or_build(AUTOCOMPLETE_KIND_CURRENCY, None, None, build_currency_candidates)
     return [
-        discord.app_commands.Choice(name=f"{code} - {currency.get_currency_name(code)}", value=code)
-        for code in currency.CURRENCY_NAMES
-        if current_lower in code.lower() or current_lower in currency.get_currency_name(code).lower()
+        discord.app_commands.Choice(name=choice_name, value=code)
+        for code, choice_name, search_text in candidates
+        if current_lower in search_text
     ][:25]
 
 
 @tree.command(name="currency", description="Convert between currencies")
 @discord.app_commands.autocomplete(from_currency=currency_list_autocomplete, to_currency=currency_list_autocomplete)
+@discord.app_commands.describe(also_to="More currencies to convert to, comma or space separated (e.g. MXN, JPY)")
 @log_interaction
-async def currency_slash_command(interaction: discord.Interaction, from_currency: str, to_currency: str, amount: float):
+async def currency_slash_command(
+    interaction: discord.Interaction, from_currency: str, to_currency: str, amount: float, also_to: str = None
+):
+    try:
+        to_currencies = [to_currency] + (currency.parse_currency_codes(also_to) if also_to else [])
+    except KeyError:
+        await interaction.response.send_message(f"Unknown currency. Supported: {list(currency.CURRENCY_NAMES.keys())}", ephemeral=True)
+        return
     try:
-        result = currency.convert_currency(from_currency, to_currency, amount)
-        await interaction.response.send_message(f"{format_number(amount)} {from_currency} = {format_number(result)} {to_currency}")
+        conversions = await currency.convert_currency_batch_async(from_currency, to_currencies, [amount])
+        await interaction.response.send_message(currency.format_conversions(conversions))
     except Exception as e:
         await interaction.response.send_message(str(e), ephemeral=True)
 
@@ -573,7 +661,7 @@ async def todo_add_slash_command(
 ):
     user = user or interaction.user  # Default to the interaction user if no mention
     todo_guild_id = interaction.guild_id
-    todo.add_task(user.id, task, position, todo_guild_id)  # Add the task to the database with the user ID
+    await run_db(todo.add_task, user.id, task, position, todo_guild_id)  # Add the task to the database with the user ID
     result = f"Task added: {task}"
     await log_and_send_message_interaction(interaction, result)
 
@@ -584,7 +672,7 @@ async def todo_add_slash_command(
 async def todo_list_slash_command(interaction: discord.Interaction, user: discord.User = None):
     user = user or interaction.user  # Default to the interaction user if no mention
     todo_guild_id = interaction.guild_id
-    tasks = todo.list_tasks(user.id, todo_guild_id)  # Get tasks for the user
+    tasks = await run_db(todo.list_tasks, user.id, todo_guild_id)  # Get tasks for the user
     if tasks:
         response = todo.get_tasks_response_str(tasks)
         await log_and_send_message_interaction(interaction, response)
@@ -598,7 +686,7 @@ async def todo_list_slash_command(interaction: discord.Interaction, user: discor
 async def todo_remove_slash_command(interaction: discord.Interaction, position: int, user: discord.User = None):
     user = user or interaction.user  # Default to the interaction user if no mention
     todo_guild_id = interaction.guild_id
-    response = todo.remove_task(user.id, position, todo_guild_id)
+    response = await run_db(todo.remove_task, user.id, position, todo_guild_id)
     await log_and_send_message_interaction(interaction, response)
 
 
@@ -608,7 +696,7 @@ async def todo_remove_slash_command(interaction: discord.Interaction, position:
 async def todo_move_slash_command(interaction: discord.Interaction, old_position: int, new_position: int, user: discord.User = None):
     user = user or interaction.user  # Default to the interaction user if no mention
     todo_guild_id = interaction.guild_id
-    result = todo.move_task(user.id, old_position, new_position, todo_guild_id)
+    result = await run_db(todo.move_task, user.id, old_position, new_position, todo_guild_id)
     await log_and_send_message_interaction(interaction, result)
 
 
@@ -619,7 +707,7 @@ async def todo_edit_slash_command(interaction: discord.Interaction, position: in
     user = user or interaction.user  # Default to the interaction user if no mention
     user_id = user.id
     todo_guild_id = interaction.guild_id
-    existing_task = todo.get_task(user_id, position, todo_guild_id)
+    existing_task = await run_db(todo.get_task, user_id, position, todo_guild_id)
 
     if existing_task is None:
         await log_and_send_message_interaction(interaction, "Task not found.")
@@ -667,21 +755,24 @@ async def clock_list_slash_command(interaction: discord.Interaction, duration: s
         await log_and_send_message_interaction(interaction, str(exc))
         return
 
-    embed = time_funcs.build_world_clock_embed(guild_id, user_id, now=now, expires_at=expires_at)
+    embed = await run_db(time_funcs.build_world_clock_embed, guild_id, user_id, now=now, expires_at=expires_at)
     response_message = await log_and_send_message_interaction(
         interaction,
         embed=embed,
         fetch_response_message=True,
     )
 
-    live_message = LiveMessage.create(
+    live_message = await run_db(
+        LiveMessage.create,
         message_type=time_funcs.LIVE_MESSAGE_TYPE_WORLD_CLOCK,
         message_id=response_message.id,
         channel_id=response_message.channel.id,
         guild_id=guild_id,
         user_id=interaction.user.id,
         expires_at=expires_at,
+        refresh_slot=live_message_registry.least_loaded_slot(),
     )
+    live_message_registry.add(live_message)
     await supersede_conflicting_live_messages(client, live_message, now)
     log_event(
         "LIVE_MESSAGE_CREATED",
@@ -702,14 +793,14 @@ async def clock_list_slash_command(interaction: discord.Interaction, duration: s
 
 async def clock_full_list_autocomplete(interaction: discord.Interaction, current: str) -> list[discord.app_commands.Choice[str]]:
     user_id = None if interaction.guild_id is not None else interaction.user.id
-    existing = [x.timezone_str for x in time_funcs.list_timezones(interaction.guild_id, user_id)]
-    options = [tz for tz in pytz.all_timezones if tz not in existing]
-    return [discord.app_commands.Choice(name=option, value=option) for option in options if option.lower().startswith(current.lower())][:25]
+    existing = await time_funcs.fetch_scope_timezone_strs(interaction.guild_id, user_id)
+    options = timezone_index.search(current, exclude=existing)
+    return [discord.app_commands.Choice(name=option, value=option) for option in options]
 
 
 async def clock_existing_list_autocomplete(interaction: discord.Interaction, current: str) -> list[discord.app_commands.Choice[str]]:
     user_id = None if interaction.guild_id is not None else interaction.user.id
-    options = [x.timezone_str for x in time_funcs.list_timezones(interaction.guild_id, user_id)]
+    options = await time_funcs.fetch_scope_timezone_strs(interaction.guild_id, user_id)
     return [discord.app_commands.Choice(name=option, value=option) for option in options if option.lower().startswith(current.lower())][:25]
 
 
@@ -721,7 +812,7 @@ async def clock_add_slash_command(interaction: discord.Interaction, timezone: st
     guild_id = interaction.guild_id
     user_id = None if interaction.guild_id is not None else interaction.user.id
     tz = time_funcs.get_valid_timezone(timezone)
-    result = time_funcs.add_timezone(guild_id, user_id, tz, label)
+    result = await run_db(time_funcs.add_timezone, guild_id, user_id, tz, label)
     await log_and_send_message_interaction(interaction, result)
 
 
@@ -732,7 +823,7 @@ async def clock_add_slash_command(interaction: discord.Interaction, timezone: st
 async def clock_remove_slash_command(interaction: discord.Interaction, timezone: str):
     guild_id = interaction.guild_id
     user_id = None if interaction.guild_id is not None else interaction.user.id
-    result = time_funcs.remove_timezone(guild_id, user_id, timezone)
+    result = await run_db(time_funcs.remove_timezone, guild_id, user_id, timezone)
     await log_and_send_message_interaction(interaction, result)
 
 
@@ -743,7 +834,7 @@ async def clock_remove_slash_command(interaction: discord.Interaction, timezone:
 async def clock_edit_slash_command(interaction: discord.Interaction, timezone: str):
     guild_id = interaction.guild_id
     user_id = None if interaction.guild_id is not None else interaction.user.id
-    existing_tz = time_funcs.get_timezone(guild_id, user_id, timezone)
+    existing_tz = await run_db(time_funcs.get_timezone, guild_id, user_id, timezone)
 
     if existing_tz is None:
         await log_and_send_message_interaction(interaction, "Timezone not found.")
@@ -768,13 +859,15 @@ async def hangman_startgame_slash_command(
         await log_and_send_message_interaction(interaction, error_msg, ephemeral=True)
         return
 
-    hg = hangman.get_active_hangman_game(interaction.guild_id)
+    hg = await run_db(hangman.get_active_hangman_game, interaction.guild_id)
     if hg is not None:
         await log_and_send_message_interaction(interaction, "There is already an active hangman game.")
         return
 
-    hg = hangman.HangmanGame.create(guild_id=interaction.guild_id, user_id=interaction.user.id, phrase=phrase, num_guesses=num_guesses)
-    hg.calculate_board()
+    hg = await run_db(
+        hangman.HangmanGame.create, guild_id=interaction.guild_id, user_id=interaction.user.id, phrase=phrase, num_guesses=num_guesses
+    )
+    await run_db(hg.calculate_board)
     response = hg.print_board()
     await log_and_send_message_interaction(interaction, response)
 
@@ -784,7 +877,7 @@ async def hangman_startgame_slash_command(
 @guild_only
 @log_interaction
 async def hangman_display_slash_command(interaction: discord.Interaction):
-    hg = hangman.get_active_hangman_game(interaction.guild_id)
+    hg = await run_db(hangman.get_active_hangman_game, interaction.guild_id)
     if hg is None:
         await log_and_send_message_interaction(interaction, "No hangman game active.")
         return
@@ -805,18 +898,21 @@ async def hangman_guess_slash_command(interaction: discord.Interaction, guess: s
         await log_and_send_message_interaction(interaction, error_msg, ephemeral=True)
         return
 
-    hg = hangman.get_active_hangman_game(interaction.guild_id)
+    hg = await run_db(hangman.get_active_hangman_game, interaction.guild_id)
     if hg is None:
         await log_and_send_message_interaction(interaction, "No hangman game active.")
         return
 
-    hg.guess_new_letters(guess)
+    await run_db(hg.guess_new_letters, guess)
     response = hg.print_board()
     await log_and_send_message_interaction(interaction, response)
 
 
 async def reminder_existing_list_autocomplete(interaction: discord.Interaction, current: str) -> list[discord.app_commands.Choice[str]]:
-    options = [x.message for x in Reminder.select().where(Reminder.user_id == interaction.user.id).order_by(Reminder.remind_at)]
+    user_id = interaction.user.id
+    options = await autocomplete_cache.get_or_fetch(
+        AUTOCOMPLETE_KIND_REMINDER, user_id, None, lambda: run_db(get_reminder_messages, user_id)
+    )
     return [discord.app_commands.Choice(name=option, value=option) for option in options if option.lower().startswith(current.lower())][:25]
 
 
@@ -837,9 +933,17 @@ async def reminder_add_slash_command(
     remind_time = datetime.now() + timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
     guild_id = None if is_private else interaction.guild_id
     channel_id = interaction.channel_id if interaction.channel_id is not None else interaction.channel.id
-    Reminder.create(
-        user_id=user.id, guild_id=guild_id, channel_id=channel_id, message=message, remind_at=remind_time, is_private=is_private
+    reminder = await run_db(
+        Reminder.create,
+        user_id=user.id,
+        guild_id=guild_id,
+        channel_id=channel_id,
+        message=message,
+        remind_at=remind_time,
+        is_private=is_private,
     )
+    reminder_scheduler.schedule(reminder.id, remind_time)
+    invalidate_reminder_autocomplete(user.id)
 
     if is_private:
         await log_and_send_message_interaction(
@@ -854,11 +958,13 @@ async def reminder_add_slash_command(
 @log_interaction
 async def reminder_list_slash_command(interaction: discord.Interaction, user: discord.User = None):
     user = user or interaction.user  # Default to the interaction user if no mention
-    public_reminders = (
-        Reminder.select().where(Reminder.user_id == user.id, Reminder.is_private == False).order_by(Reminder.remind_at)  # noqa: E712
+    public_reminders = await run_db(
+        list,
+        Reminder.select().where(Reminder.user_id == user.id, Reminder.is_private == False).order_by(Reminder.remind_at),  # noqa: E712
     )
-    private_reminders = (
-        Reminder.select().where(Reminder.user_id == user.id, Reminder.is_private == True).order_by(Reminder.remind_at)  # noqa: E712
+    private_reminders = await run_db(
+        list,
+        Reminder.select().where(Reminder.user_id == user.id, Reminder.is_private == True).order_by(Reminder.remind_at),  # noqa: E712
     )
 
     response = "**Your upcoming public reminders:**\n"
@@ -885,7 +991,7 @@ async def reminder_list_slash_command(interaction: discord.Interaction, user: di
 @log_interaction
 async def reminder_remove_slash_command(interaction: discord.Interaction, reminder: str):
     user = interaction.user
-    reminder_instance = Reminder.get_or_none(Reminder.user_id == user.id, Reminder.message == reminder)
+    reminder_instance = await run_db(Reminder.get_or_none, Reminder.user_id == user.id, Reminder.message == reminder)
 
     if reminder_instance:
         log_event(
@@ -907,7 +1013,9 @@ async def reminder_remove_slash_command(interaction: discord.Interaction, remind
         )
         channel = client.get_channel(reminder_instance.channel_id)
         channel_mention = channel.mention if channel else "Unknown Channel"
-        reminder_instance.delete_instance()
+        await run_db(reminder_instance.delete_instance)
+        reminder_scheduler.unschedule(reminder_instance.id)
+        invalidate_reminder_autocomplete(user.id)
         response_message = f"Reminder `{reminder}` in {channel_mention} has been removed."
         await log_and_send_message_interaction(interaction, response_message, ephemeral=reminder_instance.is_private)
     else:
@@ -920,7 +1028,7 @@ async def reminder_remove_slash_command(interaction: discord.Interaction, remind
 @log_interaction
 async def reminder_edit_slash_command(interaction: discord.Interaction, reminder: str):
     user = interaction.user
-    reminder_instance = Reminder.get_or_none(Reminder.user_id == user.id, Reminder.message == reminder)
+    reminder_instance = await run_db(Reminder.get_or_none, Reminder.user_id == user.id, Reminder.message == reminder)
 
     if reminder_instance:
         await interaction.response.send_modal(
@@ -934,7 +1042,7 @@ async def reminder_edit_slash_command(interaction: discord.Interaction, reminder
 @daily_command_group.command(name="add", description="Add an item to your daily checklist")
 @log_interaction
 async def daily_add_slash_command(interaction: discord.Interaction, item: str):
-    daily_checklist.add_item(interaction.user.id, item)
+    await run_db(daily_checklist.add_item, interaction.user.id, item)
     await log_and_send_message_interaction(interaction, f"Item added: {item}")
 
 
@@ -942,7 +1050,7 @@ async def daily_add_slash_command(interaction: discord.Interaction, item: str):
 @daily_command_group.command(name="remove", description="Remove an item by its position")
 @log_interaction
 async def daily_remove_slash_command(interaction: discord.Interaction, position: discord.app_commands.Range[int, 1, 100]):
-    success, msg = daily_checklist.remove_item(interaction.user.id, position)
+    success, msg = await run_db(daily_checklist.remove_item, interaction.user.id, position)
     await log_and_send_message_interaction(interaction, msg, ephemeral=not success)
 
 
@@ -951,7 +1059,7 @@ async def daily_remove_slash_command(interaction: discord.Interaction, position:
 @log_interaction
 async def daily_list_slash_command(interaction: discord.Interaction):
     current_day = daily_checklist.get_current_day()
-    items = daily_checklist.get_checklist_for_date(interaction.user.id, current_day)
+    items = await run_db(daily_checklist.get_checklist_for_date, interaction.user.id, current_day)
     response = daily_checklist.format_checklist_response(items, current_day)
     await log_and_send_message_interaction(interaction, response)
 
@@ -960,7 +1068,7 @@ async def daily_list_slash_command(interaction: discord.Interaction):
 @daily_command_group.command(name="check", description="Mark an item as completed by its position")
 @log_interaction
 async def daily_check_slash_command(interaction: discord.Interaction, position: discord.app_commands.Range[int, 1, 100]):
-    success, msg = daily_checklist.check_item(interaction.user.id, position)
+    success, msg = await run_db(daily_checklist.check_item, interaction.user.id, position)
     await log_and_send_message_interaction(interaction, msg)
 
 
@@ -968,7 +1076,7 @@ async def daily_check_slash_command(interaction: discord.Interaction, position:
 @daily_command_group.command(name="uncheck", description="Remove completion mark from an item")
 @log_interaction
 async def daily_uncheck_slash_command(interaction: discord.Interaction, position: discord.app_commands.Range[int, 1, 100]):
-    success, msg = daily_checklist.uncheck_item(interaction.user.id, position)
+    success, msg = await run_db(daily_checklist.uncheck_item, interaction.user.id, position)
     await log_and_send_message_interaction(interaction, msg)
 
 
@@ -976,7 +1084,7 @@ async def daily_uncheck_slash_command(interaction: discord.Interaction, position
 @daily_command_group.command(name="edit", description="Edit an item in your checklist")
 @log_interaction
 async def daily_edit_slash_command(interaction: discord.Interaction, position: discord.app_commands.Range[int, 1, 100]):
-    items = daily_checklist.list_items(interaction.user.id)
+    items = await run_db(daily_checklist.list_items, interaction.user.id)
     if not items or position > len(items):
         await log_and_send_message_interaction(interaction, "Invalid index.", ephemeral=True)
         return
@@ -992,7 +1100,7 @@ async def daily_move_slash_command(
     old_position: discord.app_commands.Range[int, 1, 100],
     new_position: discord.app_commands.Range[int, 1, 100],
 ):
-    success, msg = daily_checklist.move_item(interaction.user.id, old_position, new_position)
+    success, msg = await run_db(daily_checklist.move_item, interaction.user.id, old_position, new_position)
     await log_and_send_message_interaction(interaction, msg)
 
 
@@ -1009,7 +1117,7 @@ async def daily_history_slash_command(interaction: discord.Interaction, date: st
         await log_and_send_message_interaction(interaction, "Invalid date format. Please use YYYY-MM-DD", ephemeral=True)
         return
 
-    items = daily_checklist.get_checklist_for_date(interaction.user.id, target_date)
+    items = await run_db(daily_checklist.get_checklist_for_date, interaction.user.id, target_date)
     response = daily_checklist.format_checklist_response(items, target_date)
     await log_and_send_message_interaction(interaction, response)
 
@@ -1054,39 +1162,57 @@ async def on_error(interaction: discord.Interaction[discord.Client], error: disc
         await interaction.followup.send(f"An error occurred: {message}")
 
 
-@tasks.loop(seconds=10)
-async def check_reminders():
-    log_event("CHECK_REMINDERS_LOOP_TICK", level="debug")
-    now = datetime.now()
-    reminders = Reminder.select().where(Reminder.remind_at <= now)
-
-    for r in reminders:
-        try:
-            delivered = False
-            if r.is_private:
-                user = await client.fetch_user(r.user_id)
-                if user:
-                    await user.send(f"⏰ Reminder: {r.message}")
-                    delivered = True
-                    log_event(
-                        "REMINDER_DELIVERED",
-                        {
-                            "ray_id": get_ray_id(),
-                            "event": "REMINDER_DELIVERED",
-                            "reminder_id": r.id,
-                            "user_id": r.user_id,
-                            "guild_id": r.guild_id,
-                            "channel_id": None,
-                            "is_private": True,
-                            "message": r.message,
-                            "delivery_type": "dm",
-                        },
-                        level="info",
-                    )
+async def deliver_reminder(r: Reminder) -> bool:
+    """Send a single due reminder, deleting it on success and backing it off (or dead-lettering it) on failure."""
+    delivered = False
+    error_type = "NotDelivered"
+    error = f"Neither Channel {r.channel_id} nor User {r.user_id} could be resolved."
+    try:
+        if r.is_private:
+            dm_channel = await get_or_create_dm_channel(client, r.user_id)
+            if dm_channel:
+                await dm_channel.send(f"⏰ Reminder: {r.message}")
+                delivered = True
+                log_event(
+                    "REMINDER_DELIVERED",
+                    {
+                        "ray_id": get_ray_id(),
+                        "event": "REMINDER_DELIVERED",
+                        "reminder_id": r.id,
+                        "user_id": r.user_id,
+                        "guild_id": r.guild_id,
+                        "channel_id": None,
+                        "is_private": True,
+                        "message": r.message,
+                        "delivery_type": "dm",
+                    },
+                    level="info",
+                )
+        else:
+            channel = client.get_channel(r.channel_id)
+            if channel:
+                await channel.send(f"⏰ Reminder for <@{r.user_id}>: {r.message}")
+                delivered = True
+                log_event(
+                    "REMINDER_DELIVERED",
+                    {
+                        "ray_id": get_ray_id(),
+                        "event": "REMINDER_DELIVERED",
+                        "reminder_id": r.id,
+                        "user_id": r.user_id,
+                        "guild_id": r.guild_id,
+                        "channel_id": r.channel_id,
+                        "is_private": False,
+                        "message": r.message,
+                        "delivery_type": "channel",
+                    },
+                    level="info",
+                )
             else:
-                channel = client.get_channel(r.channel_id)
-                if channel:
-                    await channel.send(f"⏰ Reminder for <@{r.user_id}>: {r.message}")
+                # If channel is None, try sending as DM (for DM reminders)
+                dm_channel = await get_or_create_dm_channel(client, r.user_id)
+                if dm_channel:
+                    await dm_channel.send(f"⏰ Reminder: {r.message}")
                     delivered = True
                     log_event(
                         "REMINDER_DELIVERED",
@@ -1096,113 +1222,184 @@ async def check_reminders():
                             "reminder_id": r.id,
                             "user_id": r.user_id,
                             "guild_id": r.guild_id,
-                            "channel_id": r.channel_id,
+                            "channel_id": None,
                             "is_private": False,
                             "message": r.message,
-                            "delivery_type": "channel",
+                            "delivery_type": "fallback_dm",
                         },
                         level="info",
                     )
-                else:
-                    # If channel is None, try sending as DM (for DM reminders)
-                    user = await client.fetch_user(r.user_id)
-                    if user:
-                        await user.send(f"⏰ Reminder: {r.message}")
-                        delivered = True
-                        log_event(
-                            "REMINDER_DELIVERED",
-                            {
-                                "ray_id": get_ray_id(),
-                                "event": "REMINDER_DELIVERED",
-                                "reminder_id": r.id,
-                                "user_id": r.user_id,
-                                "guild_id": r.guild_id,
-                                "channel_id": None,
-                                "is_private": False,
-                                "message": r.message,
-                                "delivery_type": "fallback_dm",
-                            },
-                            level="info",
-                        )
-
-            # Delete the reminder after sending it
-            if delivered:
-                r.delete_instance()
-                log_event(
-                    "REMINDER_DELETED",
-                    {
-                        "ray_id": get_ray_id(),
-                        "event": "REMINDER_DELETED",
-                        "reminder_id": r.id,
-                        "user_id": r.user_id,
-                        "guild_id": r.guild_id,
-                        "channel_id": r.channel_id,
-                        "is_private": r.is_private,
-                        "message": r.message,
-                    },
-                    level="debug",
-                )
 
-        except discord.NotFound:
+        # Delete the reminder after sending it
+        if delivered:
+            await run_db(r.delete_instance)
+            invalidate_reminder_autocomplete(r.user_id)
             log_event(
-                "REMINDER_DELIVERY_ERROR",
+                "REMINDER_DELETED",
                 {
                     "ray_id": get_ray_id(),
-                    "event": "REMINDER_DELIVERY_ERROR",
+                    "event": "REMINDER_DELETED",
                     "reminder_id": r.id,
                     "user_id": r.user_id,
+                    "guild_id": r.guild_id,
                     "channel_id": r.channel_id,
-                    "error_type": "NotFound",
-                    "error": f"User {r.user_id} or Channel {r.channel_id} not found.",
+                    "is_private": r.is_private,
+                    "message": r.message,
                 },
-                level="error",
+                level="debug",
             )
-        except discord.Forbidden:
-            log_event(
-                "REMINDER_DELIVERY_ERROR",
-                {
-                    "ray_id": get_ray_id(),
-                    "event": "REMINDER_DELIVERY_ERROR",
-                    "reminder_id": r.id,
-                    "user_id": r.user_id,
-                    "channel_id": r.channel_id,
-                    "error_type": "Forbidden",
-                    "error": f"Cannot send message to {r.user_id} or Channel {r.channel_id} (they might have DMs or messages disabled).",
-                },
-                level="error",
-            )
-        except discord.HTTPException as e:
-            log_event(
-                "REMINDER_DELIVERY_ERROR",
-                {
-                    "ray_id": get_ray_id(),
-                    "event": "REMINDER_DELIVERY_ERROR",
-                    "reminder_id": r.id,
-                    "user_id": r.user_id,
-                    "channel_id": r.channel_id,
-                    "error_type": "HTTPException",
-                    "error": f"Failed to send reminder to {r.user_id} or Channel {r.channel_id}: {e}",
-                },
-                level="error",
-            )
-        except Exception as e:
-            import traceback
 
-            tb_str = traceback.format_exc()
-            log_event(
-                "REMINDER_DELIVERY_ERROR",
-                {
-                    "ray_id": get_ray_id(),
-                    "event": "REMINDER_DELIVERY_ERROR",
-                    "reminder_id": r.id,
-                    "user_id": r.user_id,
-                    "channel_id": r.channel_id,
-                    "error_type": type(e).__name__,
-                    "error": str(e),
-                    "traceback": tb_str,
-                },
-                level="error",
-            )
+    except discord.NotFound:
+        forget_user(r.user_id)
+        forget_channel(r.channel_id)
+        error_type = "NotFound"
+        error = f"User {r.user_id} or Channel {r.channel_id} not found."
+        log_event(
+            "REMINDER_DELIVERY_ERROR",
+            {
+                "ray_id": get_ray_id(),
+                "event": "REMINDER_DELIVERY_ERROR",
+                "reminder_id": r.id,
+                "user_id": r.user_id,
+                "channel_id": r.channel_id,
+                "error_type": error_type,
+                "error": error,
+            },
+            level="error",
+        )
+    except discord.Forbidden:
+        error_type = "Forbidden"
+        error = f"Cannot send message to {r.user_id} or Channel {r.channel_id} (they might have DMs or messages disabled)."
+        log_event(
+            "REMINDER_DELIVERY_ERROR",
+            {
+                "ray_id": get_ray_id(),
+                "event": "REMINDER_DELIVERY_ERROR",
+                "reminder_id": r.id,
+                "user_id": r.user_id,
+                "channel_id": r.channel_id,
+                "error_type": error_type,
+                "error": error,
+            },
+            level="error",
+        )
+    except discord.HTTPException as e:
+        error_type = "HTTPException"
+        error = f"Failed to send reminder to {r.user_id} or Channel {r.channel_id}: {e}"
+        log_event(
+            "REMINDER_DELIVERY_ERROR",
+            {
+                "ray_id": get_ray_id(),
+                "event": "REMINDER_DELIVERY_ERROR",
+                "reminder_id": r.id,
+                "user_id": r.user_id,
+                "channel_id": r.channel_id,
+                "error_type": error_type,
+                "error": error,
+            },
+            level="error",
+        )
+    except Exception as e:
+        import traceback
+
+        tb_str = traceback.format_exc()
+        error_type = type(e).__name__
+        error = str(e)
+        log_event(
+            "REMINDER_DELIVERY_ERROR",
+            {
+                "ray_id": get_ray_id(),
+                "event": "REMINDER_DELIVERY_ERROR",
+                "reminder_id": r.id,
+                "user_id": r.user_id,
+                "channel_id": r.channel_id,
+                "error_type": error_type,
+                "error": error,
+                "traceback": tb_str,
+            },
+            level="error",
+        )
+    finally:
+        if not delivered:
+            await schedule_reminder_retry(r, error_type, error)
+    return delivered
+
+
+async def deliver_coalesced_reminders(reminders: list[Reminder], content: str) -> bool | None:
+    """
+    Send several due reminders for one channel or DM recipient as a single message, deleting them together on success.
+    Returns None when the channel is gone so the pipeline delivers them one by one, with the DM fallback.
+    """
+    first = reminders[0]
+    reminder_ids = [r.id for r in reminders]
+    try:
+        if first.is_private:
+            target = await get_or_create_dm_channel(client, first.user_id)
+        else:
+            target = client.get_channel(first.channel_id)
+        if target is None:
+            return None
+        await target.send(content)
+    except Exception as e:
+        if isinstance(e, discord.NotFound):
+            forget_user(first.user_id)
+        log_event(
+            "REMINDER_DELIVERY_ERROR",
+            {
+                "ray_id": get_ray_id(),
+                "event": "REMINDER_DELIVERY_ERROR",
+                "reminder_ids": reminder_ids,
+                "user_id": first.user_id if first.is_private else None,
+                "channel_id": None if first.is_private else first.channel_id,
+                "error_type": type(e).__name__,
+                "error": str(e),
+            },
+            level="error",
+        )
+        for r in reminders:
+            await schedule_reminder_retry(r, type(e).__name__, str(e))
+        return False
+
+    await run_db(delete_delivered_reminders, reminders)
+    log_event(
+        "REMINDER_DELIVERED",
+        {
+            "ray_id": get_ray_id(),
+            "event": "REMINDER_DELIVERED",
+            "reminder_ids": reminder_ids,
+            "user_id": first.user_id if first.is_private else None,
+            "guild_id": first.guild_id,
+            "channel_id": None if first.is_private else first.channel_id,
+            "is_private": first.is_private,
+            "delivery_type": "coalesced_dm" if first.is_private else "coalesced_channel",
+        },
+        level="info",
+    )
+    return True
+
+
+async def reload_popped_reminders(reminders: list[Reminder]) -> list[Reminder]:
+    return await run_db(reload_due_reminders, [r.id for r in reminders], datetime.now())
+
+
+reminder_delivery_pipeline = ReminderDeliveryPipeline(
+    deliver_reminder,
+    width=config.reminder_delivery_concurrency,
+    deliver_coalesced=deliver_coalesced_reminders if config.reminder_coalesce else None,
+    reload=reload_popped_reminders,
+)
+
+
+# Runs back-to-back; each iteration sleeps inside the scheduler until the next reminder is due.
+@tasks.loop(seconds=0)
+async def check_reminders():
+    await reminder_scheduler.wait_until_due()
+    now = datetime.now()
+    due_ids = reminder_scheduler.pop_due(now)
+    log_event("CHECK_REMINDERS_LOOP_TICK", {"due_count": len(due_ids), "pending_count": len(reminder_scheduler)}, level="debug")
+    if due_ids:
+        due_reminders = await run_db(list, Reminder.select().where(Reminder.id.in_(due_ids)).order_by(Reminder.remind_at))
+        reminder_delivery_pipeline.submit(due_reminders)
 
 
 @check_reminders.before_loop
@@ -1215,6 +1412,13 @@ async def before_check_reminders():
             log_event("CHECK_REMINDERS_BEFORE_LOOP_DONE", level="info")
         except asyncio.TimeoutError:
             log_event("CHECK_REMINDERS_BEFORE_LOOP_TIMEOUT", level="error")
+        pending_count = reminder_scheduler.load(await run_db(select_reminder_due_times))
+        reminder_delivery_pipeline.start()
+        log_event(
+            "CHECK_REMINDERS_SCHEDULER_LOADED",
+            {"pending_count": pending_count, **reminder_delivery_pipeline.stats()},
+            level="info",
+        )
     except Exception as e:
         import traceback
 
@@ -1222,62 +1426,42 @@ async def before_check_reminders():
         log_event("CHECK_REMINDERS_BEFORE_LOOP_ERROR", {"error": str(e), "traceback": tb_str}, level="error")
 
 
+live_message_refresh_engine = LiveMessageRefreshEngine(
+    client,
+    concurrency=config.live_message_refresh_concurrency,
+    registry=live_message_registry,
+    global_edits_per_second=config.live_message_edits_per_second,
+)
+
+
+def get_cache_counters(counter: str) -> dict:
+    """Hit or miss counts of the bot's in-process caches, labelled by cache, for the metrics registry."""
+    cache_stats = {
+        "world_clock_render": time_funcs.world_clock_render_cache.stats(),
+        **{f"discord_{name.removesuffix('_cache')}": stats for name, stats in get_discord_cache_stats().items()},
+    }
+    counts = {(("cache", name),): stats[counter] for name, stats in cache_stats.items()}
+    for kind, stats in autocomplete_cache.stats()["kinds"].items():
+        counts[(("cache", f"autocomplete_{kind}"),)] = stats[counter]
+    parsed_rates_stats = currency.parsed_rates_cache.stats()
+    counts[(("cache", "parsed_currency_rates"),)] = parsed_rates_stats["hits"] if counter == "hits" else parsed_rates_stats["reloads"]
+    return counts
+
+
+metrics.register_callback("live_messages_active", "gauge", lambda: len(live_message_registry))
+metrics.register_callback("reminders_pending", "gauge", lambda: len(reminder_scheduler))
+metrics.register_callback("reminder_delivery_queue_depth", "gauge", lambda: reminder_delivery_pipeline.queue_depth)
+metrics.register_callback("live_message_edits_deferred_total", "counter", lambda: live_message_refresh_engine.deferred_total)
+metrics.register_callback("db_executor_in_flight", "gauge", lambda: db_executor.in_flight)
+metrics.register_callback("cache_hits_total", "counter", lambda: get_cache_counters("hits"))
+metrics.register_callback("cache_misses_total", "counter", lambda: get_cache_counters("misses"))
+
+
 @tasks.loop(seconds=10)
 async def refresh_live_messages():
     log_event("LIVE_MESSAGES_LOOP_TICK", level="debug")
     now = datetime.now(timezone.utc)
-    now_naive = now.replace(tzinfo=None)
-    active_messages = LiveMessage.select().where(LiveMessage.stopped_at.is_null()).order_by(LiveMessage.id.asc())
-    for live_message in active_messages:
-        try:
-            if live_message.expires_at is not None and live_message.expires_at <= now_naive:
-                stop_live_message(live_message, "expired")
-                continue
-            if not should_refresh_live_message_this_tick(live_message, now):
-                continue
-            await refresh_live_message(client, live_message, now)
-        except discord.NotFound:
-            stop_live_message(live_message, "message_or_channel_not_found", level="warning")
-        except discord.Forbidden:
-            stop_live_message(live_message, "forbidden", level="warning")
-        except discord.HTTPException as e:
-            log_event(
-                "LIVE_MESSAGE_REFRESH_ERROR",
-                {
-                    "ray_id": get_ray_id(),
-                    "event": "LIVE_MESSAGE_REFRESH_ERROR",
-                    "live_message_id": live_message.id,
-                    "message_type": live_message.message_type,
-                    "message_id": live_message.message_id,
-                    "channel_id": live_message.channel_id,
-                    "guild_id": live_message.guild_id,
-                    "user_id": live_message.user_id,
-                    "error_type": "HTTPException",
-                    "error": str(e),
-                },
-                level="error",
-            )
-        except Exception as e:
-            import traceback
-
-            tb_str = traceback.format_exc()
-            log_event(
-                "LIVE_MESSAGE_REFRESH_ERROR",
-                {
-                    "ray_id": get_ray_id(),
-                    "event": "LIVE_MESSAGE_REFRESH_ERROR",
-                    "live_message_id": live_message.id,
-                    "message_type": live_message.message_type,
-                    "message_id": live_message.message_id,
-                    "channel_id": live_message.channel_id,
-                    "guild_id": live_message.guild_id,
-                    "user_id": live_message.user_id,
-                    "error_type": type(e).__name__,
-                    "error": str(e),
-                    "traceback": tb_str,
-                },
-                level="error",
-            )
+    await live_message_refresh_engine.run_registry_tick(now)
 
 
 @refresh_live_messages.before_loop
@@ -1293,6 +1477,36 @@ async def before_refresh_live_messages():
 
         tb_str = traceback.format_exc()
         log_event("LIVE_MESSAGES_BEFORE_LOOP_ERROR", {"error": str(e), "traceback": tb_str}, level="error")
+    loaded_count = live_message_registry.load(await run_db(select_active_live_messages))
+    log_event("LIVE_MESSAGES_REGISTRY_LOADED", {"loaded_count": loaded_count}, level="info")
+
+
+# Keeps stored rates fresh ahead of REFRESH_HOURS so /currency never waits on the API.
+@tasks.loop(minutes=30)
+async def refresh_currency_rates():
+    try:
+        if await currency.refresh_rates_if_due_async():
+            log_event("CURRENCY_RATES_PREFETCHED", level="info")
+    except Exception as e:
+        log_event("CURRENCY_RATES_PREFETCH_ERROR", {"error_type": type(e).__name__, "error": str(e)}, level="error")
+
+
+@tasks.loop(minutes=10)
+async def rebalance_live_message_slots():
+    before = live_message_registry.stats()
+    moved = live_message_registry.rebalance_slots()
+    await run_db(save_live_message_refresh_slots, moved)
+    moved_count = len(moved)
+    if moved_count:
+        log_event(
+            "LIVE_MESSAGE_SLOTS_REBALANCED",
+            {
+                "moved_count": moved_count,
+                "slot_sizes_before": before["slot_sizes"],
+                "slot_sizes_after": live_message_registry.stats()["slot_sizes"],
+            },
+            level="info",
+        )
 
 
 @tasks.loop(minutes=5)
@@ -1317,19 +1531,20 @@ async def health_check():
             "python_version": platform.python_version(),
             "os": os.name,
             "platform": platform.platform(),
+            "discord_cache": get_discord_cache_stats(),
+            "live_message_registry": live_message_registry.stats(),
+            "db_executor": db_executor.stats(),
+            "autocomplete_cache": autocomplete_cache.stats(),
+            "log_queue": get_log_queue_stats(),
+            "log_sampling": get_log_sampling_stats(),
+            "event_loop_lag": loop_lag_monitor.stats(reset_window=True),
+            "slow_callbacks": slow_callback_detector.stats(),
             "ray_id": get_ray_id(),
         },
         level="info",
     )
 
 
-# Start health check loop after bot is ready
-@client.event
-async def on_ready_health():
-    if not health_check.is_running():
-        health_check.start()
-
-
 async def bot_shutdown():
     log_event("SHUTDOWN_BOT", {"event": "SHUTDOWN", "ray_id": get_ray_id()}, level="info")
     await client.close()
@@ -0,0 +1,44 @@
+"""Peewee migrations -- 007_add_reminder_retry_and_dead_letter.py.
+
+Track delivery attempts on reminders and park reminders that keep failing
+in a reminder_dead_letter table.
+"""
+
+import datetime
+
+import peewee as pw
+from peewee_migrate import Migrator
+
+
+def migrate(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Add reminder retry columns and the reminder_dead_letter table."""
+    migrator.add_fields(
+        "reminder",
+        attempt_count=pw.IntegerField(default=0),
+        next_attempt_at=pw.TimestampField(null=True, default=None),
+    )
+
+    @migrator.create_model
+    class ReminderDeadLetter(pw.Model):
+        id = pw.AutoField()
+        reminder_id = pw.IntegerField()
+        user_id = pw.IntegerField()
+        guild_id = pw.IntegerField(null=True)
+        channel_id = pw.IntegerField()
+        message = pw.TextField()
+        is_private = pw.BooleanField(default=False)
+        remind_at = pw.TimestampField()
+        attempt_count = pw.IntegerField()
+        last_error_type = pw.CharField(max_length=255, null=True)
+        last_error = pw.TextField(null=True)
+        created_at = pw.DateTimeField()
+        dead_lettered_at = pw.DateTimeField(default=datetime.datetime.now)
+
+        class Meta:
+            table_name = "reminder_dead_letter"
+
+
+def rollback(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Drop the reminder_dead_letter table and reminder retry columns."""
+    migrator.remove_model("reminder_dead_letter")
+    migrator.remove_fields("reminder", "attempt_count", "next_attempt_at")
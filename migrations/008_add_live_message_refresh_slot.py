@@ -0,0 +1,18 @@
+"""Peewee migrations -- 008_add_live_message_refresh_slot.py.
+
+Persist each live message's refresh slot so slots can be assigned and rebalanced
+evenly instead of being derived from the row ID.
+"""
+
+import peewee as pw
+from peewee_migrate import Migrator
+
+
+def migrate(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Add livemessage.refresh_slot."""
+    migrator.add_fields("livemessage", refresh_slot=pw.IntegerField(null=True))
+
+
+def rollback(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Drop livemessage.refresh_slot."""
+    migrator.remove_fields("livemessage", "refresh_slot")
@@ -0,0 +1,56 @@
+"""
+Measure convert_currency throughput with the parsed-rates cache cold on every call (the old per-call
+SELECT + json.loads path) versus warm.
+
+Usage: python scripts/bench_currency_convert.py [iterations]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from peewee import SqliteDatabase
+
+from shared import currency
+from shared.log import logger
+from shared.models import CurrencyRate
+
+
+def conversions_per_second(iterations: int, *, clear_cache: bool) -> float:
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        if clear_cache:
+            currency.parsed_rates_cache.clear()
+        currency.convert_currency("MXN", "JPY", 10)
+    return iterations / (time.perf_counter() - start_time)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    # Keep the debug CURRENCY_* events from dominating the measurement.
+    logger.disabled = True
+    rates = {code: 1.0 + index for index, code in enumerate(currency.CURRENCY_NAMES)}
+    rates.update({f"X{index:02d}": 1.0 + index for index in range(140)})
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database = SqliteDatabase(os.path.join(temp_dir, "bench.db"))
+        with database.bind_ctx([CurrencyRate]):
+            database.create_tables([CurrencyRate])
+            CurrencyRate.create(base_currency=currency.BASE_CURRENCY, rates_json=json.dumps(rates), last_updated=currency.utcnow())
+            cold = conversions_per_second(iterations // 10, clear_cache=True)
+            currency.parsed_rates_cache.clear()
+            warm = conversions_per_second(iterations, clear_cache=False)
+        database.close()
+
+    print(f"{len(rates)} rates")
+    print(f"uncached (SELECT + json.loads per call): {cold:,.0f} conversions/s")
+    print(f"parsed-rates cache hit:                  {warm:,.0f} conversions/s")
+    print(f"speedup: {warm / cold:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
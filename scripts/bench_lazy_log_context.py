@@ -0,0 +1,103 @@
+"""
+Measure what the DEBUG LIVE_MESSAGE_REFRESHED event costs a live message refresh tick at LOG_LEVEL=INFO
+when its context dict is built eagerly (the old call shape) versus passed as a lazy builder.
+
+Usage: python scripts/bench_lazy_log_context.py [messages_per_tick] [ticks]
+"""
+
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from shared.log import get_ray_id, log_event, logger
+from shared.models import LiveMessage
+
+
+def eager_tick(live_messages: list[LiveMessage]):
+    for live_message in live_messages:
+        log_event(
+            "LIVE_MESSAGE_REFRESHED",
+            {
+                "ray_id": get_ray_id(),
+                "event": "LIVE_MESSAGE_REFRESHED",
+                "live_message_id": live_message.id,
+                "message_type": live_message.message_type,
+                "message_id": live_message.message_id,
+                "channel_id": live_message.channel_id,
+                "guild_id": live_message.guild_id,
+                "user_id": live_message.user_id,
+            },
+            level="debug",
+        )
+
+
+def lazy_tick(live_messages: list[LiveMessage]):
+    for live_message in live_messages:
+        log_event(
+            "LIVE_MESSAGE_REFRESHED",
+            lambda: {
+                "ray_id": get_ray_id(),
+                "event": "LIVE_MESSAGE_REFRESHED",
+                "live_message_id": live_message.id,
+                "message_type": live_message.message_type,
+                "message_id": live_message.message_id,
+                "channel_id": live_message.channel_id,
+                "guild_id": live_message.guild_id,
+                "user_id": live_message.user_id,
+            },
+            level="debug",
+        )
+
+
+def transient_bytes_per_tick(tick, live_messages: list[LiveMessage]) -> int:
+    # Each context is freed right after its log_event call, so sum the per-call peaks rather than one peak per tick.
+    total = 0
+    tracemalloc.start()
+    for live_message in live_messages:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        tick([live_message])
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - baseline
+    tracemalloc.stop()
+    return total
+
+
+def microseconds_per_tick(tick, live_messages: list[LiveMessage], ticks: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(ticks):
+        tick(live_messages)
+    return (time.perf_counter() - start_time) / ticks * 1_000_000
+
+
+def main():
+    messages_per_tick = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    logger.setLevel(logging.INFO)
+    live_messages = [
+        LiveMessage(
+            id=index,
+            message_type="world_clock_list_v1",
+            message_id=10**18 + index,
+            channel_id=10**17 + index,
+            guild_id=10**16,
+            user_id=None,
+            created_at=datetime(2030, 1, 1),
+        )
+        for index in range(messages_per_tick)
+    ]
+    get_ray_id()
+
+    for name, tick in (("eager context", eager_tick), ("lazy context", lazy_tick)):
+        micros = microseconds_per_tick(tick, live_messages, ticks)
+        allocated = transient_bytes_per_tick(tick, live_messages)
+        print(f"{name}: {micros:,.0f} us and {allocated / 1024:,.0f} KiB allocated per tick of {messages_per_tick} refreshes")
+
+
+if __name__ == "__main__":
+    main()
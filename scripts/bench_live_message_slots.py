@@ -0,0 +1,84 @@
+"""
+Compare peak per-tick live message work for ID-modulo slots, least-loaded slot assignment and rebalanced slots.
+
+Usage: python scripts/bench_live_message_slots.py [active_count]
+"""
+
+import heapq
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from peewee import SqliteDatabase
+
+from shared.live_messages import LiveMessageRegistry
+from shared.models import LiveMessage
+
+# A doomed message is stopped after up to this many newer messages have been created.
+STOP_LAG_MAX_CREATIONS = 200
+
+
+def is_stopped(live_message_id: int, rng: random.Random) -> bool:
+    # Users re-running /clock list supersede their previous message, so stops cluster on ID patterns.
+    return rng.random() < (0.8 if live_message_id % 3 == 0 else 0.2)
+
+
+def build_registry(active_count: int, *, assign_least_loaded: bool) -> LiveMessageRegistry:
+    """
+    Create messages in ID order and stop each doomed one a little later, interleaved with newer creations, the way
+    a superseded or expired message is stopped while other users keep creating messages.
+    """
+    rng = random.Random(12)
+    registry = LiveMessageRegistry()
+    pending_stops: list[tuple[int, int]] = []
+    live_message_id = 0
+    while len(registry) < active_count or pending_stops:
+        live_message_id += 1
+        while pending_stops and pending_stops[0][0] <= live_message_id:
+            registry.remove(heapq.heappop(pending_stops)[1])
+        if len(registry) >= active_count:
+            continue
+        refresh_slot = registry.least_loaded_slot() if assign_least_loaded else None
+        registry.add(
+            LiveMessage(
+                id=live_message_id,
+                message_type="world_clock",
+                message_id=live_message_id,
+                channel_id=live_message_id,
+                guild_id=1,
+                user_id=1,
+                refresh_slot=refresh_slot,
+            )
+        )
+        if is_stopped(live_message_id, rng):
+            heapq.heappush(pending_stops, (live_message_id + rng.randint(1, STOP_LAG_MAX_CREATIONS), live_message_id))
+    return registry
+
+
+def describe(name: str, registry: LiveMessageRegistry):
+    slot_sizes = registry.stats()["slot_sizes"]
+    print(f"{name:<24} peak per tick: {max(slot_sizes):>5}  slots: {slot_sizes}")
+
+
+def main():
+    active_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    describe("id % slot_count", build_registry(active_count, assign_least_loaded=False))
+    least_loaded = build_registry(active_count, assign_least_loaded=True)
+    describe("least-loaded at create", least_loaded)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database = SqliteDatabase(os.path.join(temp_dir, "bench.db"))
+        with database.bind_ctx([LiveMessage]):
+            database.create_tables([LiveMessage])
+            LiveMessage.bulk_create(list(least_loaded._by_id.values()), batch_size=500)
+            moved_count = least_loaded.rebalance()
+        database.close()
+    describe(f"rebalanced ({moved_count} moved)", least_loaded)
+
+
+if __name__ == "__main__":
+    main()
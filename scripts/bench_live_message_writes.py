@@ -0,0 +1,72 @@
+"""
+Compare per-row live message UPDATEs with the batched per-tick flush.
+
+Usage: python scripts/bench_live_message_writes.py [message_count] [stop_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from peewee import SqliteDatabase
+
+from shared.live_messages import LiveMessageWriteBatch
+from shared.models import LiveMessage
+
+
+def seed(message_count: int):
+    LiveMessage.delete().execute()
+    LiveMessage.insert_many(
+        [
+            {"message_type": "world_clock", "message_id": i, "channel_id": i, "guild_id": 1, "user_id": 1}
+            for i in range(1, message_count + 1)
+        ]
+    ).execute()
+    return [live_message_id for (live_message_id,) in LiveMessage.select(LiveMessage.id).tuples()]
+
+
+def run_per_row(live_message_ids: list[int], stop_count: int, now: datetime) -> float:
+    start_time = time.perf_counter()
+    for live_message_id in live_message_ids[stop_count:]:
+        LiveMessage.update(last_refreshed_at=now).where(LiveMessage.id == live_message_id).execute()
+    for live_message_id in live_message_ids[:stop_count]:
+        LiveMessage.update(stopped_at=now, stop_reason="expired").where(LiveMessage.id == live_message_id).execute()
+    return time.perf_counter() - start_time
+
+
+def run_batched(live_message_ids: list[int], stop_count: int, now: datetime) -> float:
+    start_time = time.perf_counter()
+    batch = LiveMessageWriteBatch()
+    for live_message_id in live_message_ids[stop_count:]:
+        batch.record_refresh(live_message_id, now)
+    for live_message_id in live_message_ids[:stop_count]:
+        batch.record_stop(live_message_id, now, "expired")
+    batch.flush()
+    return time.perf_counter() - start_time
+
+
+def main():
+    message_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    stop_count = int(sys.argv[2]) if len(sys.argv) > 2 else message_count // 10
+    now = datetime.now()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database = SqliteDatabase(os.path.join(temp_dir, "bench.db"))
+        with database.bind_ctx([LiveMessage]):
+            database.create_tables([LiveMessage])
+            per_row_seconds = run_per_row(seed(message_count), stop_count, now)
+            batched_seconds = run_batched(seed(message_count), stop_count, now)
+        database.close()
+
+    print(f"{message_count} messages, {stop_count} stops per tick")
+    print(f"per-row: {per_row_seconds * 1000:.1f} ms ({message_count} transactions)")
+    print(f"batched: {batched_seconds * 1000:.1f} ms (1 transaction)")
+    print(f"speedup: {per_row_seconds / batched_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measure what log_event costs the calling thread (the event loop in the bot) with the old synchronous handlers,
+which format the record once per handler and write it inline, versus the queue pipeline, which only enqueues.
+
+Usage: python scripts/bench_log_event.py [iterations]
+"""
+
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from shared import log
+from shared.log import (
+    BoundedQueueHandler,
+    FormatOnceQueueListener,
+    JsonFormatter,
+    _PreformattedFormatter,
+)
+
+EVENT_CONTEXT = {
+    "ray_id": "0b4a3c9e-7a55-4c64-8f0e-2f7b7c1a9d10",
+    "event": "OUTGOING_SLASH_COMMAND",
+    "interaction_id": 1234567890123456789,
+    "channel_id": 1234567890123456789,
+    "guild_id": 1234567890123456789,
+    "user_id": 1234567890123456789,
+    "content": "Reminder set for <t:1767225600:F>!",
+    "embeds": [],
+    "file_count": 0,
+    "exec_time": 0.0123,
+}
+
+
+def microseconds_per_call(iterations: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        log.log_event("OUTGOING_INTERACTION", EVENT_CONTEXT)
+    return (time.perf_counter() - start_time) / iterations * 1_000_000
+
+
+def make_sinks(temp_dir: str, formatter: logging.Formatter) -> list[logging.Handler]:
+    file_handler = RotatingFileHandler(os.path.join(temp_dir, "bench.log"), maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
+    console_handler = logging.StreamHandler(open(os.devnull, "w", encoding="utf-8"))
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+    return [file_handler, console_handler]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    bench_logger = logging.getLogger("bench_log_event")
+    bench_logger.setLevel(logging.INFO)
+    bench_logger.propagate = False
+    log.logger = bench_logger
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sync_sinks = make_sinks(temp_dir, JsonFormatter())
+        for handler in sync_sinks:
+            bench_logger.addHandler(handler)
+        synchronous = microseconds_per_call(iterations)
+        for handler in sync_sinks:
+            bench_logger.removeHandler(handler)
+            handler.close()
+
+        log_queue = queue.Queue(maxsize=iterations)
+        queue_handler = BoundedQueueHandler(log_queue)
+        listener = FormatOnceQueueListener(log_queue, JsonFormatter(), queue_handler, *make_sinks(temp_dir, _PreformattedFormatter()))
+        bench_logger.addHandler(queue_handler)
+        listener.start()
+        queued = microseconds_per_call(iterations)
+        drain_start = time.perf_counter()
+        listener.stop()
+        drain_seconds = time.perf_counter() - drain_start
+        for handler in listener.handlers:
+            handler.close()
+
+    print(f"{iterations:,} log_event calls")
+    print(f"synchronous handlers (format per handler, inline I/O): {synchronous:.1f} us/call")
+    print(f"queue pipeline (enqueue only on the caller):           {queued:.1f} us/call")
+    print(f"listener drained the backlog {drain_seconds * 1000:.0f} ms after the last call, dropped {queue_handler.dropped}")
+
+
+if __name__ == "__main__":
+    main()
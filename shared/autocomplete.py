@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+
+from .cache import TTLCache
+from .log import get_ray_id, log_event
+
+AUTOCOMPLETE_KIND_CLOCK = "clock"
+AUTOCOMPLETE_KIND_REMINDER = "reminder"
+AUTOCOMPLETE_KIND_CURRENCY = "currency"
+AUTOCOMPLETE_KIND_UNIT = "unit"
+AUTOCOMPLETE_CACHE_MAXSIZE = 4096
+# Writes invalidate their own entries, so the TTL only bounds memory and catches writes made outside the bot.
+AUTOCOMPLETE_CACHE_TTL_SECONDS = 3600
+# Discord sends one autocomplete request per keystroke; log hit rates every this many lookups.
+AUTOCOMPLETE_STATS_LOG_EVERY = 500
+# Scope slot that invalidate_user records for every scope of a user.
+_ALL_SCOPES = object()
+
+
+class AutocompleteCache:
+    """
+    Candidate lists for autocomplete callbacks keyed on (kind, user_id, scope).
+    Callbacks filter the cached candidates by what the user has typed so far; the write paths for each kind
+    invalidate the matching entries so a new or removed item shows up on the next keystroke.
+    Those writes run on DB executor threads, so the counters are guarded by a lock as well as the entries.
+    Every invalidation is numbered, and candidates fetched while their key was invalidated are not stored, so a
+    fetch that raced a write cannot put the old list back. Only the latest ``maxsize`` invalidated keys are
+    remembered; a fetch that started before an invalidation that was forgotten is conservatively not stored.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = AUTOCOMPLETE_CACHE_MAXSIZE,
+        ttl_seconds: float = AUTOCOMPLETE_CACHE_TTL_SECONDS,
+        *,
+        log_every: int = AUTOCOMPLETE_STATS_LOG_EVERY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._cache = TTLCache(maxsize, ttl_seconds, clock=clock)
+        self._lock = threading.Lock()
+        self.log_every = log_every
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.invalidations: Counter[str] = Counter()
+        self._generation_maxsize = maxsize
+        self._generation = 0
+        self._invalidated_at: OrderedDict[tuple, int] = OrderedDict()
+        self._forgotten_through = 0
+        self._lookups_since_log = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, kind: str, user_id: int | None, scope: Hashable = None) -> tuple | None:
+        candidates = self._cache.get((kind, user_id, scope))
+        with self._lock:
+            if candidates is None:
+                self.misses[kind] += 1
+            else:
+                self.hits[kind] += 1
+            self._lookups_since_log += 1
+            should_log = self._lookups_since_log >= self.log_every
+            if should_log:
+                self._lookups_since_log = 0
+        if should_log:
+            log_event("AUTOCOMPLETE_CACHE_STATS", {"ray_id": get_ray_id(), **self.stats()}, level="info")
+        return candidates
+
+    def generation(self, kind: str, user_id: int | None, scope: Hashable = None) -> int:
+        """Token to pass back to ``set`` after fetching candidates; the key's later invalidations are numbered above it."""
+        with self._lock:
+            return self._generation
+
+    def _last_invalidated(self, kind: str, user_id: int | None, scope: Hashable) -> int:
+        return max(
+            self._invalidated_at.get((kind, user_id, scope), self._forgotten_through),
+            self._invalidated_at.get((kind, user_id, _ALL_SCOPES), self._forgotten_through),
+        )
+
+    def _record_invalidation(self, key: tuple):
+        self._generation += 1
+        self._invalidated_at[key] = self._generation
+        self._invalidated_at.move_to_end(key)
+        while len(self._invalidated_at) > self._generation_maxsize:
+            _, self._forgotten_through = self._invalidated_at.popitem(last=False)
+
+    def set(self, kind: str, user_id: int | None, scope: Hashable, candidates: Iterable, *, generation: int | None = None) -> tuple:
+        """Store ``candidates``, unless the key was invalidated since ``generation`` was taken. Returns them either way."""
+        candidates = tuple(candidates)
+        with self._lock:
+            if generation is None or self._last_invalidated(kind, user_id, scope) <= generation:
+                self._cache.set((kind, user_id, scope), candidates)
+        return candidates
+
+    def get_or_build(self, kind: str, user_id: int | None, scope: Hashable, build: Callable[[], Iterable]) -> tuple:
+        candidates = self.get(kind, user_id, scope)
+        if candidates is None:
+            generation = self.generation(kind, user_id, scope)
+            candidates = self.set(kind, user_id, scope, build(), generation=generation)
+        return candidates
+
+    async def get_or_fetch(self, kind: str, user_id: int | None, scope: Hashable, fetch: Callable[[], Awaitable[Iterable]]) -> tuple:
+        """``get_or_build`` for candidates fetched asynchronously, e.g. through run_db."""
+        candidates = self.get(kind, user_id, scope)
+        if candidates is None:
+            generation = self.generation(kind, user_id, scope)
+            candidates = self.set(kind, user_id, scope, await fetch(), generation=generation)
+        return candidates
+
+    def invalidate(self, kind: str, user_id: int | None, scope: Hashable = None):
+        with self._lock:
+            self.invalidations[kind] += 1
+            self._record_invalidation((kind, user_id, scope))
+            self._cache.invalidate((kind, user_id, scope))
+
+    def invalidate_user(self, kind: str, user_id: int) -> int:
+        """Drop every scope cached for ``user_id`` under ``kind``."""
+        with self._lock:
+            self.invalidations[kind] += 1
+            self._record_invalidation((kind, user_id, _ALL_SCOPES))
+            return self._cache.invalidate_where(lambda key: key[0] == kind and key[1] == user_id)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._generation += 1
+            self._forgotten_through = self._generation
+            self._invalidated_at.clear()
+            self.hits.clear()
+            self.misses.clear()
+            self.invalidations.clear()
+            self._lookups_since_log = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits_by_kind, misses_by_kind, invalidations_by_kind = Counter(self.hits), Counter(self.misses), Counter(self.invalidations)
+        kinds = {}
+        for kind in sorted(set(hits_by_kind) | set(misses_by_kind)):
+            hits, misses = hits_by_kind[kind], misses_by_kind[kind]
+            kinds[kind] = {
+                "hits": hits,
+                "misses": misses,
+                "invalidations": invalidations_by_kind[kind],
+                "hit_rate": hits / (hits + misses),
+            }
+        total_hits, total_misses = sum(hits_by_kind.values()), sum(misses_by_kind.values())
+        return {
+            "size": len(self._cache),
+            "hits": total_hits,
+            "misses": total_misses,
+            "hit_rate": total_hits / (total_hits + total_misses) if total_hits + total_misses else None,
+            "kinds": kinds,
+        }
+
+
+autocomplete_cache = AutocompleteCache()
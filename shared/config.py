@@ -57,11 +57,24 @@ class Config:
 
         # Logging configuration
         self.log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+        self.log_queue_size = self._load_positive_int("LOG_QUEUE_SIZE", 10000)
+        self.log_sample_rates = self._load_log_sample_rates()
 
         # Configurations for various features
 
         self.performance_warning_threshold = self._load_performance_warning_threshold()
         self.home_timezone = self._load_home_timezone()
+        self.reminder_delivery_concurrency = self._load_positive_int("REMINDER_DELIVERY_CONCURRENCY", 8)
+        self.reminder_max_attempts = self._load_positive_int("REMINDER_MAX_ATTEMPTS", 5)
+        self.reminder_coalesce = self._load_bool("REMINDER_COALESCE", False)
+        self.live_message_refresh_concurrency = self._load_positive_int("LIVE_MESSAGE_REFRESH_CONCURRENCY", 5)
+        self.live_message_edits_per_second = self._load_positive_int("LIVE_MESSAGE_EDITS_PER_SECOND", 5)
+        self.db_executor_workers = self._load_positive_int("DB_EXECUTOR_WORKERS", 4)
+        self.query_budget_per_request = self._load_positive_int("QUERY_BUDGET_PER_REQUEST", 20)
+        self.slow_query_threshold_ms = self._load_positive_int("SLOW_QUERY_THRESHOLD_MS", 100)
+        self.currency_fetch_timeout_seconds = self._load_positive_int("CURRENCY_FETCH_TIMEOUT_SECONDS", 10)
+        self.loop_lag_probe_interval_ms = self._load_positive_int("LOOP_LAG_PROBE_INTERVAL_MS", 250)
+        self.slow_callback_threshold_ms = self._load_positive_int("SLOW_CALLBACK_THRESHOLD_MS", 100)
 
     def _buffer_log_event(self, event_type, context, level):
         self._log_buffer.append((event_type, context, level))
@@ -97,6 +110,62 @@ class Config:
             )
             return 1.0
 
+    def _load_positive_int(self, name: str, default: int) -> int:
+        """Load a positive integer setting from the environment, falling back to ``default`` when unset or invalid."""
+        raw_value = os.environ.get(name, str(default))
+        try:
+            val = int(raw_value)
+            if val < 1:
+                raise ValueError(raw_value)
+            self._buffer_log_event("CONFIG_LOADED", {"event": "CONFIG_LOADED", "message": f"Loaded {name}", "value": val}, "DEBUG")
+            return val
+        except ValueError:
+            self._buffer_log_event(
+                "CONFIG_ERROR",
+                {"event": "CONFIG_ERROR", "message": f"Invalid {name}, defaulting to {default}", "value": raw_value},
+                "WARNING",
+            )
+            return default
+
+    def _load_bool(self, name: str, default: bool) -> bool:
+        """Load a boolean setting (true/false, 1/0, yes/no, on/off) from the environment."""
+        raw_value = os.environ.get(name, str(default))
+        val = raw_value.strip().lower()
+        if val in ("1", "true", "yes", "on"):
+            val = True
+        elif val in ("0", "false", "no", "off"):
+            val = False
+        else:
+            self._buffer_log_event(
+                "CONFIG_ERROR",
+                {"event": "CONFIG_ERROR", "message": f"Invalid {name}, defaulting to {default}", "value": raw_value},
+                "WARNING",
+            )
+            return default
+        self._buffer_log_event("CONFIG_LOADED", {"event": "CONFIG_LOADED", "message": f"Loaded {name}", "value": val}, "DEBUG")
+        return val
+
+    def _load_log_sample_rates(self) -> dict[str, float]:
+        """Load per-event sampling rates, e.g. ``LOG_SAMPLE_RATES=EXECUTION_TIME=0.1,INCOMING_WEB_REQUEST=0.05``."""
+        raw_value = os.environ.get("LOG_SAMPLE_RATES", "")
+        rates = {}
+        for entry in filter(None, (part.strip() for part in raw_value.split(","))):
+            event_type, _, raw_rate = entry.partition("=")
+            try:
+                rate = float(raw_rate)
+                if not event_type.strip() or not 0.0 <= rate <= 1.0:
+                    raise ValueError(entry)
+            except ValueError:
+                self._buffer_log_event(
+                    "CONFIG_ERROR",
+                    {"event": "CONFIG_ERROR", "message": "Invalid LOG_SAMPLE_RATES entry, logging that event unsampled", "value": entry},
+                    "WARNING",
+                )
+                continue
+            rates[event_type.strip()] = rate
+        self._buffer_log_event("CONFIG_LOADED", {"event": "CONFIG_LOADED", "message": "Loaded LOG_SAMPLE_RATES", "value": rates}, "DEBUG")
+        return rates
+
     def _load_home_timezone(self):
         """Load the home timezone from environment variable or default to US/Pacific."""
         raw_value = os.environ.get("HOME_TIMEZONE", "US/Pacific")
@@ -1,10 +1,18 @@
+import asyncio
 import datetime
 import json
+import threading
+import time
+from collections.abc import Callable
+from typing import NamedTuple
 
+import aiohttp
 import pytz
 import requests
 
-from .log import get_ray_id, log_event
+from .config import config
+from .db.executor import run_db
+from .log import get_ray_id, log_event, span
 from .models import CurrencyRate, orm_db
 from .utils import format_number
 
@@ -72,11 +80,18 @@ def get_currency_name(code: str) -> str:
 API_URL = "https://open.er-api.com/v6/latest/"
 
 REFRESH_HOURS = 24
+# The bot refreshes rates this long before they expire so user requests never wait on the API.
+PREFETCH_MARGIN_HOURS = 1
+# How long the parsed-rates cache trusts itself before re-checking the DB row's last_updated.
+RATES_VERSION_CHECK_SECONDS = 60
+# Upper bound on amounts x targets in one batch conversion, so one request cannot produce an unbounded reply.
+MAX_BATCH_CONVERSIONS = 100
 
 BASE_CURRENCY = "USD"
 
 
 # Only fetch/store rates with USD as base currency
+@span("currency_fetch")
 def fetch_and_store_rates() -> dict:
     """Fetch exchange rates from the API and store them in the database."""
     url = API_URL + BASE_CURRENCY
@@ -87,19 +102,99 @@ def fetch_and_store_rates() -> dict:
         level="info",
     )
     response = requests.get(url)
-    data = response.json()
+    return _store_rates(_parse_rates_response(url, response.json()))
+
+
+def _parse_rates_response(url: str, data: dict) -> dict:
     if data["result"] != "success":
         log_event(
             "CURRENCY_API_ERROR",
-            {"event": "CURRENCY_API_ERROR", "url": url, "base_currency": BASE_CURRENCY, "response": data, "ray_id": ray_id},
+            {"event": "CURRENCY_API_ERROR", "url": url, "base_currency": BASE_CURRENCY, "response": data, "ray_id": get_ray_id()},
             level="error",
         )
         raise Exception("Failed to fetch exchange rates.")
-    rates = data["rates"]
+    return data["rates"]
+
+
+class StoredRates(NamedTuple):
+    rates: dict
+    last_updated: datetime.datetime
+
+
+class ParsedRatesCache:
+    """
+    Process-wide copy of the parsed rates dict, stamped with the DB row's last_updated.
+    Within ``version_check_seconds`` of the last check a lookup does no DB I/O and no JSON parsing;
+    after that, one cheap last_updated query decides whether the row must be re-read.
+    Shared by the bot's event loop, the DB executor threads and the web backend, so access is locked.
+    """
+
+    def __init__(self, *, version_check_seconds: float = RATES_VERSION_CHECK_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.version_check_seconds = version_check_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stored: StoredRates | None = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.version_checks = 0
+        self.reloads = 0
+
+    def get_unchecked(self) -> StoredRates | None:
+        """Return the cached rates if they were verified against the DB recently, without touching the DB."""
+        with self._lock:
+            if self._stored is None or self._clock() - self._checked_at >= self.version_check_seconds:
+                return None
+            self.hits += 1
+            return self._stored
+
+    def set(self, stored: StoredRates | None):
+        with self._lock:
+            self._stored = stored
+            self._checked_at = self._clock()
+
+    def clear(self):
+        self.set(None)
+
+    def load(self) -> StoredRates | None:
+        """Return the current rates, re-reading and re-parsing the DB row only if its last_updated changed."""
+        stored = self.get_unchecked()
+        if stored is not None:
+            return stored
+        last_updated = _get_stored_rates_version()
+        with self._lock:
+            self.version_checks += 1
+            if last_updated is not None and self._stored is not None and self._stored.last_updated == last_updated:
+                self._checked_at = self._clock()
+                return self._stored
+        stored = None
+        if last_updated is not None:
+            rate = CurrencyRate.select().where(CurrencyRate.base_currency == BASE_CURRENCY).first()
+            if rate is not None:
+                stored = StoredRates(rate.rates, rate.last_updated)
+        with self._lock:
+            self.reloads += 1
+        self.set(stored)
+        return stored
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "version_checks": self.version_checks, "reloads": self.reloads}
+
+
+parsed_rates_cache = ParsedRatesCache()
+
+
+def _get_stored_rates_version() -> datetime.datetime | None:
+    return CurrencyRate.select(CurrencyRate.last_updated).where(CurrencyRate.base_currency == BASE_CURRENCY).scalar()
+
+
+def _store_rates(rates: dict) -> dict:
     now = utcnow()
     with orm_db.atomic():
         CurrencyRate.delete().where(CurrencyRate.base_currency == BASE_CURRENCY).execute()
         CurrencyRate.create(base_currency=BASE_CURRENCY, rates_json=json.dumps(rates), last_updated=now)
+        # Stamp the cache with the value as the DB returns it, so the next version check matches.
+        parsed_rates_cache.set(StoredRates(rates, _get_stored_rates_version()))
     log_event(
         "CURRENCY_API_SUCCESS",
         {
@@ -107,25 +202,27 @@ def fetch_and_store_rates() -> dict:
             "base_currency": BASE_CURRENCY,
             "fetched_at": str(now),
             "rate_count": len(rates),
-            "ray_id": ray_id,
+            "ray_id": get_ray_id(),
         },
         level="info",
     )
     return rates
 
 
+def _get_rate_age_seconds(stored: StoredRates) -> float:
+    # Make sure the last_updated is using UTC timezone to compare with now
+    return (utcnow() - stored.last_updated.replace(tzinfo=pytz.UTC)).total_seconds()
+
+
 def get_rates() -> dict:
-    """Get the latest exchange rates from the database or fetch them if outdated."""
-    rate = CurrencyRate.select().where(CurrencyRate.base_currency == BASE_CURRENCY).first()
-    now = utcnow()
+    """Get the latest exchange rates from the process cache or database, or fetch them if outdated."""
+    stored = parsed_rates_cache.load()
     ray_id = get_ray_id()
-    if not rate:
+    if not stored:
         log_event("CURRENCY_CACHE_MISS", {"event": "CURRENCY_CACHE_MISS", "base_currency": BASE_CURRENCY, "ray_id": ray_id}, level="info")
         return fetch_and_store_rates()
-    # Make sure the last_updated is using UTC timezone to compare with now
-    last_updated = rate.last_updated
-    last_updated_tzaware = last_updated.replace(tzinfo=pytz.UTC)
-    age_seconds = (now - last_updated_tzaware).total_seconds()
+    last_updated_tzaware = stored.last_updated.replace(tzinfo=pytz.UTC)
+    age_seconds = _get_rate_age_seconds(stored)
     if age_seconds > REFRESH_HOURS * 3600:
         log_event(
             "CURRENCY_CACHE_EXPIRED",
@@ -141,7 +238,7 @@ def get_rates() -> dict:
         return fetch_and_store_rates()
     log_event(
         "CURRENCY_CACHE_HIT",
-        {
+        lambda: {
             "event": "CURRENCY_CACHE_HIT",
             "base_currency": BASE_CURRENCY,
             "last_updated": str(last_updated_tzaware),
@@ -150,18 +247,98 @@ def get_rates() -> dict:
         },
         level="debug",
     )
-    return rate.rates
+    return stored.rates
 
 
-def convert_currency(from_currency: str, to_currency: str, amount: float) -> float:
-    """Convert currency from one type to another using the latest exchange rates."""
-    ray_id = get_ray_id()
+# In-flight API fetch shared by every concurrent caller, so a burst of requests triggers at most one fetch.
+_refresh_task: asyncio.Task | None = None
+
+
+@span("currency_fetch")
+async def fetch_and_store_rates_async(*, timeout_seconds: float | None = None) -> dict:
+    """Fetch exchange rates with aiohttp and store them on the DB executor, without blocking the event loop."""
+    url = API_URL + BASE_CURRENCY
     log_event(
-        "CURRENCY_CONVERT",
-        {"event": "CURRENCY_CONVERT", "from_currency": from_currency, "to_currency": to_currency, "amount": amount, "ray_id": ray_id},
-        level="debug",
+        "CURRENCY_API_REQUEST",
+        {"event": "CURRENCY_API_REQUEST", "url": url, "base_currency": BASE_CURRENCY, "ray_id": get_ray_id()},
+        level="info",
     )
-    rates = get_rates()
+    timeout = aiohttp.ClientTimeout(total=timeout_seconds or config.currency_fetch_timeout_seconds)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with session.get(url) as response:
+            data = await response.json(content_type=None)
+    rates = _parse_rates_response(url, data)
+    return await run_db(_store_rates, rates)
+
+
+def _log_background_refresh_result(task: asyncio.Task):
+    if task.cancelled() or task.exception() is None:
+        return
+    error = task.exception()
+    log_event(
+        "CURRENCY_BACKGROUND_REFRESH_ERROR",
+        {
+            "event": "CURRENCY_BACKGROUND_REFRESH_ERROR",
+            "base_currency": BASE_CURRENCY,
+            "error_type": type(error).__name__,
+            "error": str(error),
+            "ray_id": get_ray_id(),
+        },
+        level="error",
+    )
+
+
+def _get_refresh_task() -> asyncio.Task:
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(fetch_and_store_rates_async())
+        _refresh_task.add_done_callback(_log_background_refresh_result)
+    return _refresh_task
+
+
+async def refresh_rates_async() -> dict:
+    """Fetch fresh rates, joining the fetch already in flight if there is one."""
+    # Shield so one cancelled caller does not cancel the fetch for everyone else waiting on it.
+    return await asyncio.shield(_get_refresh_task())
+
+
+async def get_rates_async() -> dict:
+    """
+    Get exchange rates without waiting on the network unless there are no stored rates at all.
+    Expired rates are served immediately while a single background refresh replaces them.
+    """
+    stored = parsed_rates_cache.get_unchecked() or await run_db(parsed_rates_cache.load)
+    ray_id = get_ray_id()
+    if not stored:
+        log_event("CURRENCY_CACHE_MISS", {"event": "CURRENCY_CACHE_MISS", "base_currency": BASE_CURRENCY, "ray_id": ray_id}, level="info")
+        return await refresh_rates_async()
+    age_seconds = _get_rate_age_seconds(stored)
+    if age_seconds > REFRESH_HOURS * 3600:
+        log_event(
+            "CURRENCY_CACHE_STALE_SERVED",
+            {
+                "event": "CURRENCY_CACHE_STALE_SERVED",
+                "base_currency": BASE_CURRENCY,
+                "age_seconds": age_seconds,
+                "ray_id": ray_id,
+            },
+            level="info",
+        )
+        _get_refresh_task()
+    return stored.rates
+
+
+async def refresh_rates_if_due_async(*, margin_hours: float = PREFETCH_MARGIN_HOURS) -> bool:
+    """Refresh stored rates if they are missing or within ``margin_hours`` of expiring. Returns whether a fetch ran."""
+    stored = await run_db(parsed_rates_cache.load)
+    if stored is not None and _get_rate_age_seconds(stored) < (REFRESH_HOURS - margin_hours) * 3600:
+        return False
+    await refresh_rates_async()
+    return True
+
+
+def _convert_with_rates(rates: dict, from_currency: str, to_currency: str, amount: float) -> float:
+    ray_id = get_ray_id()
     if from_currency not in rates or to_currency not in rates:
         log_event(
             "CURRENCY_CONVERT_ERROR",
@@ -194,32 +371,145 @@ def convert_currency(from_currency: str, to_currency: str, amount: float) -> flo
     return result
 
 
-def handle_currency_command(args: list[str]) -> str:
-    """Handle the currency conversion command."""
-    usage = "Usage: !currency <from_currency> <to_currency> <amount> (e.g., !currency USD EUR 10)"
+def _log_convert_request(from_currency: str, to_currency: str, amount: float):
+    log_event(
+        "CURRENCY_CONVERT",
+        {"event": "CURRENCY_CONVERT", "from_currency": from_currency, "to_currency": to_currency, "amount": amount, "ray_id": get_ray_id()},
+        level="debug",
+    )
+
+
+def convert_currency(from_currency: str, to_currency: str, amount: float) -> float:
+    """Convert currency from one type to another using the latest exchange rates."""
+    _log_convert_request(from_currency, to_currency, amount)
+    return _convert_with_rates(get_rates(), from_currency, to_currency, amount)
+
+
+async def convert_currency_async(from_currency: str, to_currency: str, amount: float) -> float:
+    """Async variant of convert_currency for the bot; never blocks the event loop on the API."""
+    _log_convert_request(from_currency, to_currency, amount)
+    return _convert_with_rates(await get_rates_async(), from_currency, to_currency, amount)
+
+
+class CurrencyConversion(NamedTuple):
+    amount: float
+    from_currency: str
+    to_currency: str
+    result: float
+
+
+def _convert_batch_with_rates(rates: dict, from_currency: str, to_currencies: list[str], amounts: list[float]) -> list[CurrencyConversion]:
+    if not to_currencies or not amounts:
+        raise Exception("Nothing to convert.")
+    if len(to_currencies) * len(amounts) > MAX_BATCH_CONVERSIONS:
+        raise Exception(f"Too many conversions; the limit is {MAX_BATCH_CONVERSIONS}.")
+    unsupported = [code for code in (from_currency, *to_currencies) if code not in rates]
+    if unsupported:
+        log_event(
+            "CURRENCY_CONVERT_ERROR",
+            {
+                "event": "CURRENCY_CONVERT_ERROR",
+                "from_currency": from_currency,
+                "to_currencies": to_currencies,
+                "amounts": amounts,
+                "unsupported": unsupported,
+                "reason": "Currency not supported",
+                "ray_id": get_ray_id(),
+            },
+            level="error",
+        )
+        raise Exception("Currency not supported.")
+    conversions = []
+    for amount in amounts:
+        amount_in_usd = amount / rates[from_currency] if from_currency != BASE_CURRENCY else amount
+        for to_currency in to_currencies:
+            result = amount_in_usd * rates[to_currency] if to_currency != BASE_CURRENCY else amount_in_usd
+            conversions.append(CurrencyConversion(amount, from_currency, to_currency, result))
+    log_event(
+        "CURRENCY_CONVERT_BATCH",
+        {
+            "event": "CURRENCY_CONVERT_BATCH",
+            "from_currency": from_currency,
+            "to_currencies": to_currencies,
+            "amount_count": len(amounts),
+            "conversion_count": len(conversions),
+            "ray_id": get_ray_id(),
+        },
+        level="debug",
+    )
+    return conversions
+
+
+def convert_currency_batch(from_currency: str, to_currencies: list[str], amounts: list[float]) -> list[CurrencyConversion]:
+    """Convert every amount into every target currency using one load of the rates."""
+    return _convert_batch_with_rates(get_rates(), from_currency, to_currencies, amounts)
+
+
+async def convert_currency_batch_async(from_currency: str, to_currencies: list[str], amounts: list[float]) -> list[CurrencyConversion]:
+    return _convert_batch_with_rates(await get_rates_async(), from_currency, to_currencies, amounts)
+
+
+def format_conversions(conversions: list[CurrencyConversion]) -> str:
+    return "\n".join(
+        f"{format_number(conversion.amount)} {conversion.from_currency} = {format_number(conversion.result)} {conversion.to_currency}"
+        for conversion in conversions
+    )
+
+
+def parse_currency_codes(raw: str) -> list[str]:
+    """Split a comma and/or space separated list of currency codes, raising KeyError on unknown codes."""
+    codes = [code.upper() for code in raw.replace(",", " ").split()]
+    if any(code not in CURRENCY_NAMES for code in codes):
+        raise KeyError
+    return codes
+
+
+def _parse_currency_command(args: list[str]) -> tuple[str | None, tuple[str, list[str], list[float]] | None]:
+    """Return either a reply to send as-is, or the parsed (from_currency, to_currencies, amounts)."""
+    usage = (
+        "Usage: !currency <from_currency> <to_currency[,to_currency...]> <amount[,amount...]> "
+        "(e.g., !currency USD EUR 10 or !currency USD EUR,MXN,JPY 10)"
+    )
     # Secret list option
     if args and args[0].lower() == "list":
         lines = ["```Code | Name", "----------------------------"]
         for code in CURRENCY_NAMES.keys():
             lines.append(f"{code}  | {get_currency_name(code)}")
-        return "Supported currencies:\n" + "\n".join(lines) + "```"
+        return "Supported currencies:\n" + "\n".join(lines) + "```", None
 
     # Normal conversion
     if len(args) != 3:
-        return f"Invalid arguments. {usage}"
+        return f"Invalid arguments. {usage}", None
     from_cur, to_cur, amt = args
     try:
         from_currency = from_cur.upper()
-        to_currency = to_cur.upper()
-        amount = float(amt)
-        if from_currency not in CURRENCY_NAMES or to_currency not in CURRENCY_NAMES:
+        to_currencies = parse_currency_codes(to_cur)
+        amounts = [float(value) for value in amt.split(",")]
+        if from_currency not in CURRENCY_NAMES or not to_currencies:
             raise KeyError
     except KeyError:
-        return f"Unknown currency. Supported: {list(CURRENCY_NAMES.keys())}"
+        return f"Unknown currency. Supported: {list(CURRENCY_NAMES.keys())}", None
     except ValueError:
-        return f"Invalid amount: {amt}"
+        return f"Invalid amount: {amt}", None
+    return None, (from_currency, to_currencies, amounts)
+
+
+def handle_currency_command(args: list[str]) -> str:
+    """Handle the currency conversion command."""
+    reply, parsed = _parse_currency_command(args)
+    if reply is not None:
+        return reply
+    try:
+        return format_conversions(convert_currency_batch(*parsed))
+    except Exception as e:
+        return str(e)
+
+
+async def handle_currency_command_async(args: list[str]) -> str:
+    reply, parsed = _parse_currency_command(args)
+    if reply is not None:
+        return reply
     try:
-        result = convert_currency(from_currency, to_currency, amount)
-        return f"{format_number(amount)} {from_currency} = {format_number(result)} {to_currency}"
+        return format_conversions(await convert_currency_batch_async(*parsed))
     except Exception as e:
         return str(e)
@@ -3,6 +3,7 @@ from typing import List, Tuple
 
 import discord
 import pytz
+from peewee import Case
 
 from .log import get_ray_id, log_event, ray_id_var
 from .models import DailyChecklist, DailyChecklistCheck, orm_db
@@ -137,7 +138,16 @@ def get_checklist_for_date(user_id: int, date: datetime.date) -> List[Tuple[Dail
         .order_by(DailyChecklist.sort_order)
     )
 
-    return [(item, is_item_checked(item, date)[1]) for item in items]
+    if not items:
+        return []
+    # One query for every item's check on that date, rather than one is_item_checked call per item.
+    checked_item_ids = {
+        check.checklist_item_id
+        for check in DailyChecklistCheck.select(DailyChecklistCheck.checklist_item).where(
+            DailyChecklistCheck.checklist_item.in_([item.id for item in items]), DailyChecklistCheck.checked_at == date
+        )
+    }
+    return [(item, item.id in checked_item_ids) for item in items]
 
 
 def edit_item(user_id: int, position: int, new_text: str) -> Tuple[bool, str]:
@@ -170,17 +180,18 @@ def edit_item(user_id: int, position: int, new_text: str) -> Tuple[bool, str]:
 
 
 def move_item(user_id: int, old_pos: int, new_pos: int) -> Tuple[bool, str]:
+    active_items = list(
+        DailyChecklist.select(DailyChecklist.id, DailyChecklist.sort_order).where(
+            DailyChecklist.user_id == user_id, DailyChecklist.deleted_at.is_null()
+        )
+    )
     # Verify positions are valid
-    count = DailyChecklist.select().where(DailyChecklist.user_id == user_id, DailyChecklist.deleted_at.is_null()).count()
+    count = len(active_items)
     if old_pos < 1 or old_pos > count or new_pos < 1 or new_pos > count:
         return False, "Invalid position."
 
     # Get item to move
-    item_to_move = (
-        DailyChecklist.select()
-        .where(DailyChecklist.user_id == user_id, DailyChecklist.sort_order == old_pos, DailyChecklist.deleted_at.is_null())
-        .first()
-    )
+    item_to_move = next((item for item in active_items if item.sort_order == old_pos), None)
     if not item_to_move:
         return False, "Item not found."
 
@@ -197,34 +208,20 @@ def move_item(user_id: int, old_pos: int, new_pos: int) -> Tuple[bool, str]:
         },
         level="info",
     )
-    with orm_db.atomic():
-        if old_pos < new_pos:
-            # Moving down: shift items up
-            (
-                DailyChecklist.update({DailyChecklist.sort_order: DailyChecklist.sort_order - 1})
-                .where(
-                    DailyChecklist.user_id == user_id,
-                    DailyChecklist.sort_order > old_pos,
-                    DailyChecklist.sort_order <= new_pos,
-                    DailyChecklist.deleted_at.is_null(),
-                )
-                .execute()
-            )
-        else:
-            # Moving up: shift items down
-            (
-                DailyChecklist.update({DailyChecklist.sort_order: DailyChecklist.sort_order + 1})
-                .where(
-                    DailyChecklist.user_id == user_id,
-                    DailyChecklist.sort_order >= new_pos,
-                    DailyChecklist.sort_order < old_pos,
-                    DailyChecklist.deleted_at.is_null(),
-                )
-                .execute()
-            )
-
-        item_to_move.sort_order = new_pos
-        item_to_move.save()
+    if old_pos < new_pos:
+        # Moving down: shift items up
+        shifted = (DailyChecklist.sort_order > old_pos) & (DailyChecklist.sort_order <= new_pos)
+        shifted_order = DailyChecklist.sort_order - 1
+    else:
+        # Moving up: shift items down
+        shifted = (DailyChecklist.sort_order >= new_pos) & (DailyChecklist.sort_order < old_pos)
+        shifted_order = DailyChecklist.sort_order + 1
+    # Shift the items in between and place the moved item in one UPDATE, which is atomic on its own.
+    (
+        DailyChecklist.update({DailyChecklist.sort_order: Case(None, [(DailyChecklist.id == item_to_move.id, new_pos)], shifted_order)})
+        .where(DailyChecklist.user_id == user_id, DailyChecklist.deleted_at.is_null(), shifted | (DailyChecklist.id == item_to_move.id))
+        .execute()
+    )
 
     return True, f"Moved item from position {old_pos} to {new_pos}."
 
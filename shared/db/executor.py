@@ -0,0 +1,104 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from ..config import config
+from ..log import get_ray_id, log_event, span
+from ..models import orm_db
+
+T = TypeVar("T")
+
+
+class DBExecutor:
+    """
+    Runs blocking peewee calls on a dedicated thread pool so they never stall the Discord event loop.
+    peewee keeps one SQLite connection per thread, so each worker reuses its own connection for its lifetime.
+    Tracks how long calls wait for a worker and how long the query work itself takes.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.call_count = 0
+        self.error_count = 0
+        self.in_flight = 0
+        self.total_queue_wait_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+        self.total_query_seconds = 0.0
+        self.max_query_seconds = 0.0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db")
+        return self._pool
+
+    def _call(self, submitted_at: float, func: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        started_at = time.perf_counter()
+        orm_db.connect(reuse_if_open=True)
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.error_count += 1
+            raise
+        finally:
+            finished_at = time.perf_counter()
+            self._record(started_at - submitted_at, finished_at - started_at)
+
+    def _record(self, queue_wait_seconds: float, query_seconds: float):
+        with self._lock:
+            self.call_count += 1
+            self.total_queue_wait_seconds += queue_wait_seconds
+            self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, queue_wait_seconds)
+            self.total_query_seconds += query_seconds
+            self.max_query_seconds = max(self.max_query_seconds, query_seconds)
+        if query_seconds >= config.performance_warning_threshold:
+            log_event(
+                "DB_EXECUTOR_SLOW_CALL",
+                {"ray_id": get_ray_id(), "queue_wait_seconds": queue_wait_seconds, "query_seconds": query_seconds},
+                level="warning",
+            )
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``func(*args, **kwargs)`` on a DB worker thread, carrying over the caller's context (ray_id etc.)."""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._call, time.perf_counter(), func, args, kwargs)
+        self.in_flight += 1
+        try:
+            async with span("db"):
+                return await loop.run_in_executor(self._get_pool(), call)
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            call_count = self.call_count
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self.in_flight,
+                "call_count": call_count,
+                "error_count": self.error_count,
+                "avg_queue_wait_seconds": self.total_queue_wait_seconds / call_count if call_count else 0.0,
+                "max_queue_wait_seconds": self.max_queue_wait_seconds,
+                "avg_query_seconds": self.total_query_seconds / call_count if call_count else 0.0,
+                "max_query_seconds": self.max_query_seconds,
+            }
+
+
+db_executor = DBExecutor(config.db_executor_workers)
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await db_executor.run(func, *args, **kwargs)
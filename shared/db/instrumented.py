@@ -0,0 +1,32 @@
+import time
+
+from peewee import SqliteDatabase
+
+from ..config import config
+from ..log import get_ray_id, log_event, query_stats_var
+from ..metrics import metrics
+
+DB_QUERY_LATENCY_SECONDS = "db_query_latency_seconds"
+
+metrics.describe(DB_QUERY_LATENCY_SECONDS, "Latency of individual SQL statements on the ORM database.")
+
+
+class InstrumentedSqliteDatabase(SqliteDatabase):
+    """
+    SqliteDatabase that times every statement. The time is attributed to the current request's QueryStats (carried
+    into DB executor threads with the rest of the context) and recorded in the metrics registry.
+    Statements slower than SLOW_QUERY_THRESHOLD_MS are logged.
+    """
+
+    def execute_sql(self, sql, params=None, commit=None):
+        started_at = time.perf_counter()
+        try:
+            return super().execute_sql(sql, params, commit)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            query_stats = query_stats_var.get()
+            if query_stats is not None:
+                query_stats.record(sql, elapsed)
+            metrics.observe(DB_QUERY_LATENCY_SECONDS, elapsed)
+            if elapsed * 1000 >= config.slow_query_threshold_ms:
+                log_event("DB_SLOW_QUERY", {"ray_id": get_ray_id(), "sql": sql, "seconds": elapsed}, level="warning")
@@ -0,0 +1,61 @@
+import discord
+from discord import Client
+
+from .cache import TTLCache
+
+DISCORD_CACHE_MAXSIZE = 10_000
+DISCORD_CACHE_TTL_SECONDS = 15 * 60
+
+user_cache = TTLCache(DISCORD_CACHE_MAXSIZE, DISCORD_CACHE_TTL_SECONDS)
+dm_channel_cache = TTLCache(DISCORD_CACHE_MAXSIZE, DISCORD_CACHE_TTL_SECONDS)
+channel_cache = TTLCache(DISCORD_CACHE_MAXSIZE, DISCORD_CACHE_TTL_SECONDS)
+
+
+async def get_or_fetch_user(client: Client, user_id: int) -> discord.User:
+    """Resolve a user from the gateway cache, then our TTL cache, and only then over REST."""
+    user = client.get_user(user_id)
+    if user is not None:
+        return user
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await client.fetch_user(user_id)
+        user_cache.set(user_id, user)
+    return user
+
+
+async def get_or_create_dm_channel(client: Client, user_id: int) -> discord.DMChannel:
+    channel = dm_channel_cache.get(user_id)
+    if channel is None:
+        user = await get_or_fetch_user(client, user_id)
+        channel = user.dm_channel or await user.create_dm()
+        dm_channel_cache.set(user_id, channel)
+    return channel
+
+
+async def get_or_fetch_channel(client: Client, channel_id: int):
+    channel = client.get_channel(channel_id)
+    if channel is not None:
+        return channel
+    channel = channel_cache.get(channel_id)
+    if channel is None:
+        channel = await client.fetch_channel(channel_id)
+        channel_cache.set(channel_id, channel)
+    return channel
+
+
+def forget_user(user_id: int):
+    """Drop cached objects for a user, e.g. after Discord reports them as not found."""
+    user_cache.invalidate(user_id)
+    dm_channel_cache.invalidate(user_id)
+
+
+def forget_channel(channel_id: int):
+    channel_cache.invalidate(channel_id)
+
+
+def get_discord_cache_stats() -> dict:
+    return {
+        "user_cache": user_cache.stats(),
+        "dm_channel_cache": dm_channel_cache.stats(),
+        "channel_cache": channel_cache.stats(),
+    }
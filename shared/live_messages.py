@@ -1,20 +1,299 @@
+import asyncio
+import contextlib
+import contextvars
+import time
+import traceback
+from collections.abc import Callable, Iterable
 from datetime import datetime, timezone
 
 import discord
 from discord import Client
+from peewee import Case, Value
 
 from . import time_funcs
-from .log import get_ray_id, log_event
+from .db.executor import run_db
+from .discord_cache import forget_channel, get_or_fetch_channel
+from .log import get_ray_id, log_event, span
 from .models import LiveMessage
+from .rate_limit import TokenBucket, TokenBucketRegistry
 
 SUPERSEDED_BY_NEW_MESSAGE_REASON = "superseded_by_new_message"
 LIVE_MESSAGE_REFRESH_INTERVAL_SECONDS = 60
 LIVE_MESSAGE_REFRESH_SLOT_SECONDS = 10
+# Leave headroom inside each 10 second slot so one tick never runs into the next.
+LIVE_MESSAGE_TICK_DEADLINE_SECONDS = 8
+# Live message edits share the bot's global request budget with interactive traffic, so only a slice of it is spent here.
+LIVE_MESSAGE_GLOBAL_EDITS_PER_SECOND = 5
+# The rebalancer tolerates this much difference between the fullest and emptiest slot.
+LIVE_MESSAGE_SLOT_REBALANCE_TOLERANCE = 1
+# Discord allows roughly 5 message edits per 5 seconds in one channel.
+LIVE_MESSAGE_CHANNEL_EDITS_PER_SECOND = 1.0
+LIVE_MESSAGE_CHANNEL_EDIT_BURST = 5
+# Discord error code for a channel that no longer exists; our cached handle for it must be dropped.
+DISCORD_UNKNOWN_CHANNEL_ERROR_CODE = 10003
+
+
+def get_live_message_slot_count(
+    refresh_interval_seconds: int = LIVE_MESSAGE_REFRESH_INTERVAL_SECONDS,
+    slot_seconds: int = LIVE_MESSAGE_REFRESH_SLOT_SECONDS,
+) -> int:
+    return max(1, refresh_interval_seconds // slot_seconds)
+
+
+def get_current_live_message_slot(now: datetime, *, slot_seconds: int = LIVE_MESSAGE_REFRESH_SLOT_SECONDS, slot_count: int) -> int:
+    return int(now.timestamp()) // slot_seconds % slot_count
+
+
+def get_live_message_refresh_slot(live_message: LiveMessage, slot_count: int) -> int:
+    # Rows created before refresh_slot existed, or whose slot is out of range after a slot count change, fall back to the ID.
+    if live_message.refresh_slot is not None and 0 <= live_message.refresh_slot < slot_count:
+        return live_message.refresh_slot
+    return live_message.id % slot_count
+
+
+class LiveMessageRegistry:
+    """
+    In-memory index of active live messages, bucketed by refresh slot.
+    Loaded once from the DB at startup and kept current write-through by create, stop and supersede,
+    so a refresh tick only touches the messages due in its slot instead of re-selecting every active row.
+    """
+
+    def __init__(self, *, slot_count: int | None = None):
+        self.slot_count = slot_count or get_live_message_slot_count()
+        self._by_id: dict[int, LiveMessage] = {}
+        self._slots: list[dict[int, LiveMessage]] = [{} for _ in range(self.slot_count)]
+        self._expiring: dict[int, LiveMessage] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, live_message_id: int) -> bool:
+        return live_message_id in self._by_id
+
+    def load(self, live_messages: Iterable[LiveMessage] | None = None) -> int:
+        """
+        Replace the registry contents with ``live_messages``, or with every active live message stored in the DB.
+        The bot selects them on the DB executor and passes them in, so only the in-memory part runs on the event loop.
+        """
+        if live_messages is None:
+            live_messages = select_active_live_messages()
+        self.clear()
+        for live_message in live_messages:
+            self.add(live_message)
+        return len(self._by_id)
+
+    def clear(self):
+        self._by_id.clear()
+        self._expiring.clear()
+        for slot in self._slots:
+            slot.clear()
+
+    def add(self, live_message: LiveMessage):
+        self.remove(live_message.id)
+        self._by_id[live_message.id] = live_message
+        self._slots[get_live_message_refresh_slot(live_message, self.slot_count)][live_message.id] = live_message
+        if live_message.expires_at is not None:
+            self._expiring[live_message.id] = live_message
+
+    def remove(self, live_message_id: int):
+        live_message = self._by_id.pop(live_message_id, None)
+        if live_message is None:
+            return
+        self._slots[get_live_message_refresh_slot(live_message, self.slot_count)].pop(live_message_id, None)
+        self._expiring.pop(live_message_id, None)
+
+    def get(self, live_message_id: int) -> LiveMessage | None:
+        return self._by_id.get(live_message_id)
+
+    def least_loaded_slot(self) -> int:
+        return min(range(self.slot_count), key=lambda slot: len(self._slots[slot]))
+
+    def rebalance(self, *, tolerance: int = LIVE_MESSAGE_SLOT_REBALANCE_TOLERANCE) -> int:
+        """Rebalance the slots and persist the moved messages in one transaction. Returns the number of messages moved."""
+        moved = self.rebalance_slots(tolerance=tolerance)
+        save_live_message_refresh_slots(moved)
+        return len(moved)
+
+    def rebalance_slots(self, *, tolerance: int = LIVE_MESSAGE_SLOT_REBALANCE_TOLERANCE) -> list[LiveMessage]:
+        """
+        Move messages from the fullest slots to the emptiest until every slot is within ``tolerance`` of the others.
+        Only the in-memory slots change; the caller persists the returned messages with save_live_message_refresh_slots.
+        """
+        moved: dict[int, LiveMessage] = {}
+        while True:
+            fullest = max(range(self.slot_count), key=lambda slot: len(self._slots[slot]))
+            emptiest = self.least_loaded_slot()
+            if len(self._slots[fullest]) - len(self._slots[emptiest]) <= tolerance:
+                break
+            # Move the newest message; older ones keep the cadence users have already seen.
+            live_message = self._slots[fullest].pop(max(self._slots[fullest]))
+            live_message.refresh_slot = emptiest
+            self._slots[emptiest][live_message.id] = live_message
+            moved[live_message.id] = live_message
+        return list(moved.values())
+
+    def due_this_tick(self, now: datetime) -> list[LiveMessage]:
+        """Return the expired messages plus the messages in the current slot, ordered by ID."""
+        now_naive = now.replace(tzinfo=None)
+        due = {
+            live_message_id: live_message
+            for live_message_id, live_message in self._expiring.items()
+            if live_message.expires_at <= now_naive
+        }
+        due.update(self._slots[get_current_live_message_slot(now, slot_count=self.slot_count)])
+        return [due[live_message_id] for live_message_id in sorted(due)]
+
+    def stats(self) -> dict:
+        slot_sizes = [len(slot) for slot in self._slots]
+        return {
+            "active_count": len(self._by_id),
+            "expiring_count": len(self._expiring),
+            "slot_sizes": slot_sizes,
+            "slot_spread": max(slot_sizes) - min(slot_sizes),
+        }
+
+
+def select_active_live_messages() -> list[LiveMessage]:
+    return list(LiveMessage.select().where(LiveMessage.stopped_at.is_null()).order_by(LiveMessage.id.asc()))
+
+
+def save_live_message_refresh_slots(live_messages: Iterable[LiveMessage]):
+    """Persist the refresh slots of rebalanced messages, one UPDATE per slot in a single transaction."""
+    live_messages_by_slot: dict[int, list[int]] = {}
+    for live_message in live_messages:
+        live_messages_by_slot.setdefault(live_message.refresh_slot, []).append(live_message.id)
+    if not live_messages_by_slot:
+        return
+    with LiveMessage._meta.database.atomic():
+        for refresh_slot, live_message_ids in live_messages_by_slot.items():
+            LiveMessage.update(refresh_slot=refresh_slot).where(LiveMessage.id.in_(live_message_ids)).execute()
+
+
+live_message_registry = LiveMessageRegistry()
+
+
+class LiveMessageWriteBatch:
+    """
+    Collects the last_refreshed_at and stop writes made during one refresh tick so they can be flushed
+    in a single transaction instead of one autocommit UPDATE per message.
+    A crash before the flush only loses bookkeeping: unrecorded refreshes are redone on the next pass,
+    and unrecorded stops are re-detected because the message is still expired or still gone on Discord.
+    """
+
+    def __init__(self):
+        self.refreshed_at: dict[int, datetime] = {}
+        self.stopped: dict[int, tuple[datetime, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.refreshed_at) + len(self.stopped)
+
+    def record_refresh(self, live_message_id: int, refreshed_at: datetime):
+        self.refreshed_at[live_message_id] = refreshed_at
+
+    def record_stop(self, live_message_id: int, stopped_at: datetime, stop_reason: str):
+        self.stopped[live_message_id] = (stopped_at, stop_reason)
+
+    def _flush_bulk(self):
+        with LiveMessage._meta.database.atomic():
+            if self.refreshed_at:
+                LiveMessage.update(
+                    last_refreshed_at=Case(
+                        LiveMessage.id,
+                        [
+                            (live_message_id, Value(refreshed_at, converter=LiveMessage.last_refreshed_at.db_value))
+                            for live_message_id, refreshed_at in self.refreshed_at.items()
+                        ],
+                    )
+                ).where(LiveMessage.id.in_(list(self.refreshed_at))).execute()
+            if self.stopped:
+                LiveMessage.update(
+                    stopped_at=Case(
+                        LiveMessage.id,
+                        [
+                            (live_message_id, Value(stopped_at, converter=LiveMessage.stopped_at.db_value))
+                            for live_message_id, (stopped_at, _) in self.stopped.items()
+                        ],
+                    ),
+                    stop_reason=Case(
+                        LiveMessage.id,
+                        [(live_message_id, stop_reason) for live_message_id, (_, stop_reason) in self.stopped.items()],
+                    ),
+                ).where(LiveMessage.id.in_(list(self.stopped))).execute()
+
+    def _flush_per_row(self) -> int:
+        failed_count = 0
+        for live_message_id, refreshed_at in self.refreshed_at.items():
+            try:
+                LiveMessage.update(last_refreshed_at=refreshed_at).where(LiveMessage.id == live_message_id).execute()
+            except Exception:
+                failed_count += 1
+        for live_message_id, (stopped_at, stop_reason) in self.stopped.items():
+            try:
+                LiveMessage.update(stopped_at=stopped_at, stop_reason=stop_reason).where(LiveMessage.id == live_message_id).execute()
+            except Exception:
+                failed_count += 1
+        return failed_count
+
+    def flush(self) -> dict:
+        """Write everything in one transaction, falling back to per-row updates if the bulk write fails."""
+        stats = {"refreshed_count": len(self.refreshed_at), "stopped_count": len(self.stopped), "fallback": False, "failed_count": 0}
+        if not self:
+            return stats
+        try:
+            self._flush_bulk()
+        except Exception as e:
+            log_event(
+                "LIVE_MESSAGE_WRITE_BATCH_ERROR",
+                {
+                    "ray_id": get_ray_id(),
+                    "event": "LIVE_MESSAGE_WRITE_BATCH_ERROR",
+                    "refreshed_count": len(self.refreshed_at),
+                    "stopped_count": len(self.stopped),
+                    "error_type": type(e).__name__,
+                    "error": str(e),
+                },
+                level="error",
+            )
+            stats["fallback"] = True
+            stats["failed_count"] = self._flush_per_row()
+        self.refreshed_at.clear()
+        self.stopped.clear()
+        return stats
+
+
+# Set while a refresh tick is running so its refresh and stop writes are batched rather than written immediately.
+_live_message_write_batch: contextvars.ContextVar[LiveMessageWriteBatch | None] = contextvars.ContextVar(
+    "live_message_write_batch", default=None
+)
+
+
+@contextlib.asynccontextmanager
+async def batched_live_message_writes():
+    """
+    Record refresh and stop writes made inside the block and flush them on the DB executor when it exits,
+    so async callers never write to the DB from the event loop. Nested blocks share the outermost batch.
+    """
+    if _live_message_write_batch.get() is not None:
+        yield
+        return
+    write_batch = LiveMessageWriteBatch()
+    token = _live_message_write_batch.set(write_batch)
+    try:
+        yield
+    finally:
+        _live_message_write_batch.reset(token)
+        if write_batch:
+            await run_db(write_batch.flush)
 
 
 def stop_live_message(live_message: LiveMessage, stop_reason: str, *, level: str = "info"):
     stopped_at = datetime.now(timezone.utc).replace(tzinfo=None)
-    LiveMessage.update(stopped_at=stopped_at, stop_reason=stop_reason).where(LiveMessage.id == live_message.id).execute()
+    write_batch = _live_message_write_batch.get()
+    if write_batch is not None:
+        write_batch.record_stop(live_message.id, stopped_at, stop_reason)
+    else:
+        LiveMessage.update(stopped_at=stopped_at, stop_reason=stop_reason).where(LiveMessage.id == live_message.id).execute()
+    live_message_registry.remove(live_message.id)
     log_event(
         "LIVE_MESSAGE_STOPPED",
         {
@@ -34,27 +313,44 @@ def stop_live_message(live_message: LiveMessage, stop_reason: str, *, level: str
 
 
 async def _get_live_message_channel(client: Client, channel_id: int):
-    channel = client.get_channel(channel_id)
-    if channel is not None:
-        return channel
-    return await client.fetch_channel(channel_id)
+    return await get_or_fetch_channel(client, channel_id)
+
+
+@span("discord")
+async def _edit_live_message(client: Client, live_message: LiveMessage, **fields):
+    """
+    Edit a live message by ID through a partial message handle, skipping the fetch_message round trip.
+    Every channel type a live message can be posted in (text channels, threads and DMs) hands out partial messages.
+    An unknown channel is dropped from the channel cache and the NotFound is raised to the caller, which stops the message.
+    """
+    channel = await _get_live_message_channel(client, live_message.channel_id)
+    try:
+        await channel.get_partial_message(live_message.message_id).edit(**fields)
+    except discord.NotFound as exc:
+        if exc.code == DISCORD_UNKNOWN_CHANNEL_ERROR_CODE:
+            forget_channel(live_message.channel_id)
+        raise
 
 
 async def _refresh_world_clock_live_message(client: Client, live_message: LiveMessage, now: datetime):
     scope_user_id = None if live_message.guild_id is not None else live_message.user_id
-    embed = time_funcs.build_world_clock_embed(
+    embed = await run_db(
+        time_funcs.build_world_clock_embed,
         live_message.guild_id,
         scope_user_id,
         now=now,
         expires_at=live_message.expires_at,
     )
-    channel = await _get_live_message_channel(client, live_message.channel_id)
-    message = await channel.fetch_message(live_message.message_id)
-    await message.edit(embed=embed)
-    LiveMessage.update(last_refreshed_at=now.replace(tzinfo=None)).where(LiveMessage.id == live_message.id).execute()
+    await _edit_live_message(client, live_message, embed=embed)
+    live_message.last_refreshed_at = now.replace(tzinfo=None)
+    write_batch = _live_message_write_batch.get()
+    if write_batch is not None:
+        write_batch.record_refresh(live_message.id, live_message.last_refreshed_at)
+    else:
+        LiveMessage.update(last_refreshed_at=live_message.last_refreshed_at).where(LiveMessage.id == live_message.id).execute()
     log_event(
         "LIVE_MESSAGE_REFRESHED",
-        {
+        lambda: {
             "ray_id": get_ray_id(),
             "event": "LIVE_MESSAGE_REFRESHED",
             "live_message_id": live_message.id,
@@ -70,16 +366,15 @@ async def _refresh_world_clock_live_message(client: Client, live_message: LiveMe
 
 async def _mark_world_clock_live_message_superseded(client: Client, live_message: LiveMessage, now: datetime):
     scope_user_id = None if live_message.guild_id is not None else live_message.user_id
-    embed = time_funcs.build_world_clock_embed(
+    embed = await run_db(
+        time_funcs.build_world_clock_embed,
         live_message.guild_id,
         scope_user_id,
         now=now,
         expires_at=live_message.expires_at,
         live_status_text=time_funcs.WORLD_CLOCK_SUPERSEDED_STATUS,
     )
-    channel = await _get_live_message_channel(client, live_message.channel_id)
-    message = await channel.fetch_message(live_message.message_id)
-    await message.edit(embed=embed)
+    await _edit_live_message(client, live_message, embed=embed)
 
 
 def _live_message_scope_filter(guild_id: int | None, user_id: int) -> object:
@@ -116,6 +411,11 @@ def find_conflicting_live_messages(
 
 
 async def supersede_live_message(client: Client, live_message: LiveMessage, now: datetime):
+    async with batched_live_message_writes():
+        await _supersede_live_message(client, live_message, now)
+
+
+async def _supersede_live_message(client: Client, live_message: LiveMessage, now: datetime):
     try:
         if live_message.message_type == time_funcs.LIVE_MESSAGE_TYPE_WORLD_CLOCK:
             await _mark_world_clock_live_message_superseded(client, live_message, now)
@@ -141,15 +441,17 @@ async def supersede_live_message(client: Client, live_message: LiveMessage, now:
 
 
 async def supersede_conflicting_live_messages(client: Client, live_message: LiveMessage, now: datetime):
-    conflicts = find_conflicting_live_messages(
+    conflicts = await run_db(
+        find_conflicting_live_messages,
         live_message.message_type,
         live_message.guild_id,
         live_message.user_id,
         live_message.expires_at,
         exclude_id=live_message.id,
     )
-    for conflict in conflicts:
-        await supersede_live_message(client, conflict, now)
+    async with batched_live_message_writes():
+        for conflict in conflicts:
+            await supersede_live_message(client, conflict, now)
     return conflicts
 
 
@@ -160,10 +462,9 @@ def should_refresh_live_message_this_tick(
     refresh_interval_seconds: int = LIVE_MESSAGE_REFRESH_INTERVAL_SECONDS,
     slot_seconds: int = LIVE_MESSAGE_REFRESH_SLOT_SECONDS,
 ) -> bool:
-    slot_count = max(1, refresh_interval_seconds // slot_seconds)
-    current_slot = int(now.timestamp()) // slot_seconds % slot_count
-    message_slot = live_message.id % slot_count
-    return message_slot == current_slot
+    slot_count = get_live_message_slot_count(refresh_interval_seconds, slot_seconds)
+    current_slot = get_current_live_message_slot(now, slot_seconds=slot_seconds, slot_count=slot_count)
+    return get_live_message_refresh_slot(live_message, slot_count) == current_slot
 
 
 LIVE_MESSAGE_REFRESH_HANDLERS = {
@@ -177,3 +478,197 @@ async def refresh_live_message(client: Client, live_message: LiveMessage, now: d
         stop_live_message(live_message, "unsupported_message_type", level="warning")
         return
     await refresh_handler(client, live_message, now)
+
+
+async def refresh_live_message_safely(client: Client, live_message: LiveMessage, now: datetime) -> bool:
+    """Refresh a live message, stopping it when Discord reports it gone or inaccessible. Returns whether the refresh succeeded."""
+    try:
+        await refresh_live_message(client, live_message, now)
+        return True
+    except discord.NotFound:
+        stop_live_message(live_message, "message_or_channel_not_found", level="warning")
+    except discord.Forbidden:
+        stop_live_message(live_message, "forbidden", level="warning")
+    except discord.HTTPException as e:
+        log_event(
+            "LIVE_MESSAGE_REFRESH_ERROR",
+            {
+                "ray_id": get_ray_id(),
+                "event": "LIVE_MESSAGE_REFRESH_ERROR",
+                "live_message_id": live_message.id,
+                "message_type": live_message.message_type,
+                "message_id": live_message.message_id,
+                "channel_id": live_message.channel_id,
+                "guild_id": live_message.guild_id,
+                "user_id": live_message.user_id,
+                "error_type": "HTTPException",
+                "error": str(e),
+            },
+            level="error",
+        )
+    except Exception as e:
+        log_event(
+            "LIVE_MESSAGE_REFRESH_ERROR",
+            {
+                "ray_id": get_ray_id(),
+                "event": "LIVE_MESSAGE_REFRESH_ERROR",
+                "live_message_id": live_message.id,
+                "message_type": live_message.message_type,
+                "message_id": live_message.message_id,
+                "channel_id": live_message.channel_id,
+                "guild_id": live_message.guild_id,
+                "user_id": live_message.user_id,
+                "error_type": type(e).__name__,
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+            },
+            level="error",
+        )
+    return False
+
+
+class LiveMessageRefreshEngine:
+    """
+    Refreshes the live messages due in a tick concurrently, bounded by a semaphore.
+    Anything still unfinished at the tick deadline is cancelled and carried over to the front of the next tick.
+    With a registry, each tick is handed only that slot's messages, so carried-over messages outside the slot
+    are kept as long as the registry still lists them as active.
+    Edits are also budgeted globally and per channel; messages over budget are deferred to the next tick
+    rather than risking a 429, which stretches their refresh interval and is reported as budget lag.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        *,
+        concurrency: int,
+        deadline_seconds: float = LIVE_MESSAGE_TICK_DEADLINE_SECONDS,
+        registry: LiveMessageRegistry | None = None,
+        global_edits_per_second: float = LIVE_MESSAGE_GLOBAL_EDITS_PER_SECOND,
+        channel_edits_per_second: float = LIVE_MESSAGE_CHANNEL_EDITS_PER_SECOND,
+        channel_edit_burst: float = LIVE_MESSAGE_CHANNEL_EDIT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.registry = registry
+        # A full slot's worth of global budget may be spent at the start of a tick; the semaphore spreads it out.
+        self.global_edit_bucket = TokenBucket(
+            global_edits_per_second, global_edits_per_second * LIVE_MESSAGE_REFRESH_SLOT_SECONDS, clock=clock
+        )
+        self.channel_edit_buckets = TokenBucketRegistry(channel_edits_per_second, channel_edit_burst, clock=clock)
+        self._deferred_since: dict[int, datetime] = {}
+        self.deferred_total = 0
+        self.max_budget_lag_seconds = 0.0
+        self.concurrency = concurrency
+        self.deadline_seconds = deadline_seconds
+        self._carryover: dict[int, LiveMessage] = {}
+        self.tick_count = 0
+        self.overrun_count = 0
+        self.max_tick_seconds = 0.0
+
+    def _select_due(self, live_messages: Iterable[LiveMessage], now: datetime) -> list[LiveMessage]:
+        """Stop expired messages and return the ones to refresh this tick, carried-over messages first."""
+        now_naive = now.replace(tzinfo=None)
+        carryover, self._carryover = self._carryover, {}
+        carried_over = []
+        due = []
+        for live_message in live_messages:
+            if live_message.expires_at is not None and live_message.expires_at <= now_naive:
+                stop_live_message(live_message, "expired")
+            elif live_message.id in carryover:
+                carried_over.append(live_message)
+            elif should_refresh_live_message_this_tick(live_message, now):
+                due.append(live_message)
+        if self.registry is not None:
+            seen_ids = {live_message.id for live_message in carried_over}
+            for live_message_id, live_message in carryover.items():
+                if live_message_id not in seen_ids and live_message_id in self.registry:
+                    carried_over.append(live_message)
+        return carried_over + due
+
+    def _apply_edit_budget(self, due: list[LiveMessage], now: datetime) -> tuple[list[LiveMessage], list[LiveMessage], float]:
+        """Split due messages into those within the edit budget and those deferred to the next tick."""
+        deferred_since, self._deferred_since = self._deferred_since, {}
+        allowed = []
+        deferred = []
+        budget_lag_seconds = 0.0
+        for live_message in due:
+            channel_bucket = self.channel_edit_buckets.get(live_message.channel_id)
+            if channel_bucket.tokens >= 1 and self.global_edit_bucket.try_acquire():
+                channel_bucket.try_acquire()
+                allowed.append(live_message)
+                if live_message.id in deferred_since:
+                    budget_lag_seconds = max(budget_lag_seconds, (now - deferred_since[live_message.id]).total_seconds())
+            else:
+                deferred.append(live_message)
+                self._carryover[live_message.id] = live_message
+                self._deferred_since[live_message.id] = deferred_since.get(live_message.id, now)
+        self.deferred_total += len(deferred)
+        self.max_budget_lag_seconds = max(self.max_budget_lag_seconds, budget_lag_seconds)
+        return allowed, deferred, budget_lag_seconds
+
+    async def run_registry_tick(self, now: datetime) -> dict:
+        return await self.run_tick(self.registry.due_this_tick(now), now)
+
+    async def run_tick(self, live_messages: Iterable[LiveMessage], now: datetime) -> dict:
+        write_batch = LiveMessageWriteBatch()
+        token = _live_message_write_batch.set(write_batch)
+        try:
+            return await self._run_tick(live_messages, now, write_batch)
+        finally:
+            _live_message_write_batch.reset(token)
+            # Cancelled or crashed ticks still persist whatever they already recorded.
+            if write_batch:
+                await run_db(write_batch.flush)
+
+    async def _run_tick(self, live_messages: Iterable[LiveMessage], now: datetime, write_batch: LiveMessageWriteBatch) -> dict:
+        start_time = time.perf_counter()
+        due, deferred, budget_lag_seconds = self._apply_edit_budget(self._select_due(live_messages, now), now)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _refresh(live_message: LiveMessage) -> bool:
+            async with semaphore:
+                return await refresh_live_message_safely(self.client, live_message, now)
+
+        done = set()
+        pending = set()
+        if due:
+            tasks = {asyncio.create_task(_refresh(live_message)): live_message for live_message in due}
+            done, pending = await asyncio.wait(tasks, timeout=self.deadline_seconds)
+            for task in pending:
+                task.cancel()
+                live_message = tasks[task]
+                self._carryover[live_message.id] = live_message
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        write_stats = await run_db(write_batch.flush)
+        refreshed_count = sum(1 for task in done if task.result())
+        tick_seconds = time.perf_counter() - start_time
+        overran = bool(pending)
+        self.tick_count += 1
+        self.overrun_count += int(overran)
+        self.max_tick_seconds = max(self.max_tick_seconds, tick_seconds)
+        stats = {
+            "event": "LIVE_MESSAGES_TICK_COMPLETED",
+            "due_count": len(due),
+            "refreshed_count": refreshed_count,
+            "failed_count": len(done) - refreshed_count,
+            "carried_over_count": len(pending),
+            "tick_seconds": tick_seconds,
+            "deadline_seconds": self.deadline_seconds,
+            "concurrency": self.concurrency,
+            "overran": overran,
+            "overrun_count": self.overrun_count,
+            "tick_count": self.tick_count,
+            "deferred_count": len(deferred),
+            "deferred_total": self.deferred_total,
+            "budget_lag_seconds": budget_lag_seconds,
+            "max_budget_lag_seconds": self.max_budget_lag_seconds,
+            "written_refresh_count": write_stats["refreshed_count"],
+            "written_stop_count": write_stats["stopped_count"],
+            "write_fallback": write_stats["fallback"],
+            "write_failed_count": write_stats["failed_count"],
+        }
+        log_event("LIVE_MESSAGES_TICK_COMPLETED", stats, level="warning" if overran else "debug")
+        return stats
@@ -1,18 +1,31 @@
+import atexit
 import contextvars
 import inspect
 import json
 import logging
+import queue
+import random
 import sys
+import threading
 import time
 import uuid
+import zlib
+from collections import Counter
 from functools import wraps
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Any, Awaitable, Callable
 
 import discord
 from flask import jsonify, request
 
 from .config import config
+from .metrics import (
+    COMMAND_ERRORS_TOTAL,
+    COMMAND_LATENCY_SECONDS,
+    HTTP_REQUEST_ERRORS_TOTAL,
+    HTTP_REQUEST_LATENCY_SECONDS,
+    metrics,
+)
 
 
 # --- JsonFormatter for structured logging ---
@@ -30,26 +43,126 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(log_record, ensure_ascii=False)
 
 
+class _PreformattedFormatter(logging.Formatter):
+    """Sink formatter for records the log listener has already serialized."""
+
+    def format(self, record):
+        return record.msg
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to the log listener thread without formatting them on the caller's thread.
+    The queue is bounded: when it is full the record is dropped and counted rather than blocking the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class FormatOnceQueueListener(QueueListener):
+    """Serializes each queued record once and fans the same JSON line out to every sink handler."""
+
+    def __init__(self, log_queue: queue.Queue, formatter: logging.Formatter, queue_handler: BoundedQueueHandler, *handlers):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.formatter = formatter
+        self.queue_handler = queue_handler
+        self.reported_dropped = 0
+        self.running = False
+
+    def start(self):
+        super().start()
+        self.running = True
+
+    def stop(self):
+        super().stop()
+        self.running = False
+
+    def prepare(self, record):
+        try:
+            record.msg = self.formatter.format(record)
+        except Exception:
+            # An unformattable record must not kill the listener thread, or every later record is lost.
+            record.msg = self._fallback_format(record)
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        return record
+
+    def _fallback_format(self, record) -> str:
+        try:
+            log_record = record.msg.copy() if isinstance(record.msg, dict) else {"message": record.getMessage()}
+        except Exception:
+            log_record = {"message": repr(record.msg)}
+        log_record["log_level"] = record.levelname
+        log_record["time"] = self.formatter.formatTime(record, self.formatter.datefmt)
+        log_record["format_error"] = True
+        return json.dumps(log_record, ensure_ascii=False, default=str)
+
+    def handle(self, record):
+        super().handle(record)
+        dropped = self.queue_handler.dropped
+        if dropped > self.reported_dropped:
+            # Reported from the listener thread, since the queue that would carry it is the one that was full.
+            drop_record = logging.makeLogRecord(
+                {
+                    "name": record.name,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": {"event": "LOG_RECORDS_DROPPED", "dropped": dropped - self.reported_dropped, "dropped_total": dropped},
+                }
+            )
+            self.reported_dropped = dropped
+            super().handle(drop_record)
+
+
 # --- Logger setup (file + console, JSON if possible) ---
 logger = logging.getLogger("discord_bot")
 logger.setLevel(getattr(logging, config.log_level, logging.INFO))
 logger.propagate = False  # Prevent propagation to root logger
 formatter = JsonFormatter()
 
-# Use RotatingFileHandler for log rotation (5MB per file, 3 backups)
-file_handler = RotatingFileHandler("bot.log", maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
-file_handler.setFormatter(formatter)
-if not any(isinstance(h, RotatingFileHandler) for h in logger.handlers):
-    logger.addHandler(file_handler)
-
-# Only add a StreamHandler for the console if one does not already exist (excluding FileHandler)
-if not any(isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler) for h in logger.handlers):
+# log_event only enqueues; a listener thread formats each record once and writes it to the file and the console.
+log_queue: queue.Queue = queue.Queue(maxsize=config.log_queue_size)
+queue_handler = BoundedQueueHandler(log_queue)
+log_listener = None
+if not any(isinstance(h, QueueHandler) for h in logger.handlers):
+    # Use RotatingFileHandler for log rotation (5MB per file, 3 backups)
+    file_handler = RotatingFileHandler("bot.log", maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
+    file_handler.setFormatter(_PreformattedFormatter())
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(_PreformattedFormatter())
+    log_listener = FormatOnceQueueListener(log_queue, formatter, queue_handler, file_handler, console_handler)
+    logger.addHandler(queue_handler)
+    log_listener.start()
+    # Registered after logging's own shutdown hook, so it runs first and drains the queue into still-open handlers.
+    atexit.register(log_listener.stop)
+
+
+def get_log_queue_stats() -> dict:
+    return {"queue_size": log_queue.qsize(), "maxsize": log_queue.maxsize, "dropped": queue_handler.dropped}
+
+
+def flush_log_queue():
+    """Block until every record queued so far has been written to the sinks."""
+    if log_listener is not None and log_listener.running:
+        log_queue.join()
+
 
 # --- Context variable for ray id ---
 ray_id_var = contextvars.ContextVar("ray_id", default=None)
+# The slash or message command being handled, e.g. "/clock add" or "!currency", for attributing slow loop steps.
+command_var = contextvars.ContextVar("command", default=None)
 
 
 def get_ray_id():
@@ -69,22 +182,215 @@ async def with_ray_id(func, *args, **kwargs):
         ray_id_var.reset(token)
 
 
+_LOG_LEVELS = {"INFO": logging.INFO, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+# Never sampled, whatever LOG_SAMPLE_RATES says; warnings and errors are never sampled either.
+UNSAMPLED_EVENTS = frozenset({"AUDIT_LOG"})
+
+
+class LogSampler:
+    """
+    Keeps a configured fraction of high-volume INFO/DEBUG events, matched on the event type passed to log_event
+    or on the ``event`` key of a dict context. The decision hashes the ray_id, so all sampled events of one
+    request are kept or dropped together. Exact kept/dropped counts per event let totals be reconstructed.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        self.rates = {event: rate for event, rate in rates.items() if event not in UNSAMPLED_EVENTS}
+        self._lock = threading.Lock()
+        self.kept: Counter[str] = Counter()
+        self.dropped: Counter[str] = Counter()
+
+    def get_rate(self, event_type: str, context) -> tuple[str, float] | None:
+        rate = self.rates.get(event_type)
+        if rate is not None:
+            return event_type, rate
+        context_event = context.get("event") if isinstance(context, dict) else None
+        if context_event in self.rates and context_event not in UNSAMPLED_EVENTS:
+            return context_event, self.rates[context_event]
+        return None
+
+    def keep(self, sample_key: str, rate: float) -> bool:
+        ray_id = ray_id_var.get()
+        fraction = zlib.crc32(ray_id.encode()) / 2**32 if ray_id is not None else random.random()
+        kept = fraction < rate
+        with self._lock:
+            (self.kept if kept else self.dropped)[sample_key] += 1
+        return kept
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                event: {"rate": rate, "kept": self.kept[event], "dropped": self.dropped[event]}
+                for event, rate in self.rates.items()
+                if self.kept[event] or self.dropped[event]
+            }
+
+
+log_sampler = LogSampler(config.log_sample_rates)
+
+
+def get_log_sampling_stats() -> dict:
+    return log_sampler.stats()
+
+
+metrics.register_callback("log_queue_size", "gauge", log_queue.qsize)
+metrics.register_callback("log_records_dropped_total", "counter", lambda: queue_handler.dropped)
+metrics.register_callback(
+    "log_events_sampled_out_total",
+    "counter",
+    lambda: {(("event", event),): stats["dropped"] for event, stats in log_sampler.stats().items()},
+)
+
+
 def log_event(event_type, context={}, level="INFO"):
     """
     Log an event with a given type and context dict, using structured logging.
     Automatically adds a UTC ISO8601 timestamp.
+    ``context`` may also be a zero-argument callable returning the dict; it is only called if the level is enabled,
+    so hot paths can log DEBUG events without building the context when LOG_LEVEL is higher.
+    INFO and DEBUG events listed in LOG_SAMPLE_RATES are sampled; kept ones carry their ``sample_rate``.
     """
     level = level.upper()
+    levelno = _LOG_LEVELS.get(level, logging.DEBUG)
+    if not logger.isEnabledFor(levelno):
+        return
+    sampled = log_sampler.get_rate(event_type, context) if log_sampler.rates and levelno < logging.WARNING else None
+    if sampled is not None and not log_sampler.keep(*sampled):
+        return
+    if callable(context):
+        context = context()
     log_data = {"event": event_type, **context}
     log_data["log_level"] = level  # Add log_level key at top level
-    if level == "INFO":
-        logger.info(log_data)
-    elif level == "WARNING":
-        logger.warning(log_data)
-    elif level == "ERROR":
-        logger.error(log_data)
-    else:
-        logger.debug(log_data)
+    if sampled is not None:
+        log_data["sample_rate"] = sampled[1]
+    logger.log(levelno, log_data)
+
+
+# phase name -> [call count, total seconds] for the request being handled; None outside a traced request.
+span_timings_var = contextvars.ContextVar("span_timings", default=None)
+# Spans recorded from DB executor threads write into the same dict as the event loop.
+_span_lock = threading.Lock()
+
+
+class span:
+    """
+    Time one phase of the current request, as ``with span("db"):``, ``async with span("discord"):`` or ``@span("render")``.
+    Outside a request started with ``start_span_trace`` it costs one contextvar lookup and records nothing.
+    Spans may nest (rendering inside a DB executor call, for instance), so phase times can overlap.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._timings = None
+        self._started_at = 0.0
+
+    def __enter__(self):
+        self._timings = span_timings_var.get()
+        if self._timings is not None:
+            self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._timings is not None:
+            elapsed = time.perf_counter() - self._started_at
+            with _span_lock:
+                entry = self._timings.setdefault(self.name, [0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+    def __call__(self, func):
+        name = self.name
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+SLOWEST_SQL_LOG_LENGTH = 300
+
+
+class QueryStats:
+    """SQL statements run for one request (or one test), filled in by the query hook on orm_db."""
+
+    def __init__(self, *, keep_statements: bool = False):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_sql: str | None = None
+        self.statements: list[str] | None = [] if keep_statements else None
+
+    def record(self, sql: str, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            if seconds >= self.slowest_seconds:
+                self.slowest_seconds = seconds
+                self.slowest_sql = sql
+            if self.statements is not None:
+                self.statements.append(sql)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "ms": round(self.seconds * 1000, 3),
+                "slowest_ms": round(self.slowest_seconds * 1000, 3),
+                "slowest_sql": self.slowest_sql[:SLOWEST_SQL_LOG_LENGTH] if self.slowest_sql else None,
+            }
+
+
+query_stats_var = contextvars.ContextVar("query_stats", default=None)
+
+
+def start_span_trace() -> tuple[contextvars.Token, contextvars.Token]:
+    """Begin collecting spans and SQL statement stats for the current request; pass the tokens to ``finish_span_trace``."""
+    return span_timings_var.set({}), query_stats_var.set(QueryStats())
+
+
+def finish_span_trace(tokens: tuple[contextvars.Token, contextvars.Token], *, command: str | None, total_seconds: float):
+    """
+    Emit one SPAN_SUMMARY event with the time spent in each phase of the request and its SQL statement count,
+    then stop collecting. Requests that ran more statements than QUERY_BUDGET_PER_REQUEST also log a warning.
+    """
+    span_token, query_token = tokens
+    timings = span_timings_var.get()
+    query_stats = query_stats_var.get()
+    span_timings_var.reset(span_token)
+    query_stats_var.reset(query_token)
+    if not timings and not query_stats.count:
+        return
+    with _span_lock:
+        spans = {name: {"count": count, "ms": round(seconds * 1000, 3)} for name, (count, seconds) in timings.items()}
+    queries = query_stats.summary()
+    log_event(
+        "SPAN_SUMMARY",
+        {"ray_id": get_ray_id(), "command": command, "total_ms": round(total_seconds * 1000, 3), "spans": spans, "queries": queries},
+    )
+    if queries["count"] > config.query_budget_per_request:
+        log_event(
+            "QUERY_BUDGET_EXCEEDED",
+            {"ray_id": get_ray_id(), "command": command, "budget": config.query_budget_per_request, **queries},
+            level="warning",
+        )
 
 
 def log_and_send_message_command(message, content=None, *, files=None, exec_time=None, **kwargs):
@@ -123,10 +429,14 @@ def log_and_send_message_command(message, content=None, *, files=None, exec_time
             },
             level="warning",
         )
-    if files:
-        return message.channel.send(content, files=files, **kwargs)
-    else:
-        return message.channel.send(content, **kwargs)
+
+    async def _send_message():
+        async with span("discord"):
+            if files:
+                return await message.channel.send(content, files=files, **kwargs)
+            return await message.channel.send(content, **kwargs)
+
+    return _send_message()
 
 
 def log_and_send_message_interaction(
@@ -158,6 +468,7 @@ def log_and_send_message_interaction(
     }
     log_event("OUTGOING_INTERACTION", log_context)
 
+    @span("discord")
     async def _send_response():
         if not interaction.response.is_done():
             await interaction.response.send_message(content, files=files, **kwargs)
@@ -234,10 +545,17 @@ def log_interaction(func: Callable[..., Awaitable[None]]) -> Callable[..., Await
                 "INCOMING_INTERACTION",
                 {"ray_id": ray_id, "event": "INCOMING_SLASH_COMMAND", "interaction_id": None, "function": func.__name__},
             )
+        command_label = f"/{interaction.command.qualified_name}" if interaction and interaction.command else func.__name__
+        command_token = command_var.set(command_label)
+        span_token = start_span_trace()
         try:
             await func(*args, **kwargs)
+        except Exception:
+            metrics.inc(COMMAND_ERRORS_TOTAL, {"command": command_label})
+            raise
         finally:
             exec_time = time.perf_counter() - start_time
+            metrics.observe(COMMAND_LATENCY_SECONDS, exec_time, {"command": command_label})
             log_event(
                 "EXECUTION_TIME",
                 {
@@ -263,6 +581,8 @@ def log_interaction(func: Callable[..., Awaitable[None]]) -> Callable[..., Await
                     },
                     level="warning",
                 )
+            finish_span_trace(span_token, command=command_label, total_seconds=exec_time)
+            command_var.reset(command_token)
             ray_id_var.reset(token)
 
     wrapper.__signature__ = inspect.signature(func)
@@ -311,10 +631,20 @@ def log_request(f):
         }
         log_event("INCOMING_WEB_REQUEST", log_context)
         start_time = time.perf_counter()
+        route_labels = {"method": request.method, "route": request.url_rule.rule if request.url_rule else request.path}
+        span_token = start_span_trace()
+        failed = True
         try:
-            return f(*args, **kwargs)
+            response = f(*args, **kwargs)
+            # Views return (response, status_code) from log_and_send_json_response.
+            failed = isinstance(response, tuple) and len(response) > 1 and isinstance(response[1], int) and response[1] >= 500
+            return response
         finally:
             exec_time = time.perf_counter() - start_time
+            metrics.observe(HTTP_REQUEST_LATENCY_SECONDS, exec_time, route_labels)
+            finish_span_trace(span_token, command=f"{request.method} {route_labels['route']}", total_seconds=exec_time)
+            if failed:
+                metrics.inc(HTTP_REQUEST_ERRORS_TOTAL, route_labels)
             log_event(
                 "EXECUTION_TIME",
                 {
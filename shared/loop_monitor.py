@@ -0,0 +1,133 @@
+import asyncio
+import time
+from collections import deque
+
+from .config import config
+from .log import command_var, log_event, ray_id_var
+from .metrics import LatencyHistogram, metrics
+
+EVENT_LOOP_LAG_SECONDS = "event_loop_lag_seconds"
+EVENT_LOOP_SLOW_CALLBACKS_TOTAL = "event_loop_slow_callbacks_total"
+SLOW_CALLBACK_RECENT_LIMIT = 20
+
+metrics.describe(EVENT_LOOP_LAG_SECONDS, "How late the event loop woke a fixed-interval sleep.")
+metrics.describe(EVENT_LOOP_SLOW_CALLBACKS_TOTAL, "Event loop steps that ran longer than the slow-callback threshold.")
+
+
+class LoopLagMonitor:
+    """
+    Sleeps for a fixed interval on the event loop and records how late it wakes up. Anything that blocks the loop
+    (a synchronous DB call, an image save, a blocking HTTP request) shows up as lag on the next probe.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.histogram = LatencyHistogram()
+        self.window_max_seconds = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="loop-lag-monitor")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started_at = loop.time()
+            await asyncio.sleep(self.interval_seconds)
+            self.record(loop.time() - started_at - self.interval_seconds)
+
+    def record(self, lag_seconds: float):
+        lag_seconds = max(lag_seconds, 0.0)
+        self.histogram.record(lag_seconds)
+        self.window_max_seconds = max(self.window_max_seconds, lag_seconds)
+        metrics.observe(EVENT_LOOP_LAG_SECONDS, lag_seconds)
+
+    def stats(self, *, reset_window: bool = False) -> dict:
+        """Lifetime lag percentiles plus the worst lag since the window was last reset (by the health check)."""
+        stats = {
+            "samples": self.histogram.count,
+            "p50_seconds": self.histogram.percentile(0.5),
+            "p99_seconds": self.histogram.percentile(0.99),
+            "max_seconds": self.histogram.max,
+            "window_max_seconds": self.window_max_seconds,
+        }
+        if reset_window:
+            self.window_max_seconds = 0.0
+        return stats
+
+
+def _describe_callback(handle: asyncio.Handle) -> str:
+    callback = getattr(handle, "_callback", None)
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro()
+        return f"{task.get_name()} ({getattr(coro, '__qualname__', type(coro).__name__)})"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+class SlowCallbackDetector:
+    """
+    Times every event loop step by wrapping ``asyncio.Handle._run`` and reports the ones over the threshold with
+    the ray_id and command from the step's context, so a stall can be traced to the interaction that caused it.
+    Unlike asyncio debug mode this only costs two clock reads per step.
+    """
+
+    def __init__(self, threshold_seconds: float, *, recent_limit: int = SLOW_CALLBACK_RECENT_LIMIT):
+        self.threshold_seconds = threshold_seconds
+        self.slow_count = 0
+        self.recent: deque[dict] = deque(maxlen=recent_limit)
+        self._original_run = None
+
+    @property
+    def installed(self) -> bool:
+        return self._original_run is not None
+
+    def install(self):
+        if self.installed:
+            return
+        original_run = self._original_run = asyncio.Handle._run
+        detector = self
+
+        def _timed_run(handle):
+            started_at = time.perf_counter()
+            try:
+                return original_run(handle)
+            finally:
+                duration = time.perf_counter() - started_at
+                if duration >= detector.threshold_seconds:
+                    detector.record(handle, duration)
+
+        asyncio.Handle._run = _timed_run
+
+    def uninstall(self):
+        if self.installed:
+            asyncio.Handle._run = self._original_run
+            self._original_run = None
+
+    def record(self, handle: asyncio.Handle, duration_seconds: float):
+        context = handle.get_context()
+        ray_id = context.get(ray_id_var) if context is not None else None
+        command = context.get(command_var) if context is not None else None
+        slow_callback = {
+            "duration_seconds": duration_seconds,
+            "ray_id": ray_id,
+            "command": command,
+            "callback": _describe_callback(handle),
+        }
+        self.slow_count += 1
+        self.recent.append(slow_callback)
+        metrics.inc(EVENT_LOOP_SLOW_CALLBACKS_TOTAL, {"command": command or "none"})
+        log_event("EVENT_LOOP_SLOW_CALLBACK", {**slow_callback, "threshold_seconds": self.threshold_seconds}, level="warning")
+
+    def stats(self) -> dict:
+        return {"threshold_seconds": self.threshold_seconds, "slow_count": self.slow_count, "recent": list(self.recent)}
+
+
+loop_lag_monitor = LoopLagMonitor(config.loop_lag_probe_interval_ms / 1000)
+slow_callback_detector = SlowCallbackDetector(config.slow_callback_threshold_ms / 1000)
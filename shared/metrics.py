@@ -0,0 +1,206 @@
+import math
+import threading
+from collections.abc import Callable
+
+# Latencies are bucketed HDR-style: exact below 2 * LATENCY_HISTOGRAM_SUB_BUCKETS microseconds, then
+# LATENCY_HISTOGRAM_SUB_BUCKETS linear buckets per power of two, so any recorded value is within ~6% of the truth.
+LATENCY_HISTOGRAM_UNIT_SECONDS = 1e-6
+LATENCY_HISTOGRAM_SUB_BUCKET_BITS = 4
+LATENCY_HISTOGRAM_SUB_BUCKETS = 1 << LATENCY_HISTOGRAM_SUB_BUCKET_BITS
+SUMMARY_QUANTILES = (0.5, 0.95, 0.99)
+
+COMMAND_LATENCY_SECONDS = "command_latency_seconds"
+COMMAND_ERRORS_TOTAL = "command_errors_total"
+HTTP_REQUEST_LATENCY_SECONDS = "http_request_latency_seconds"
+HTTP_REQUEST_ERRORS_TOTAL = "http_request_errors_total"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram with a fixed relative error; tracks the exact count, sum and max alongside."""
+
+    def __init__(self):
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _bucket_index(units: int) -> int:
+        if units < 2 * LATENCY_HISTOGRAM_SUB_BUCKETS:
+            return units
+        shift = units.bit_length() - 1 - LATENCY_HISTOGRAM_SUB_BUCKET_BITS
+        return shift * LATENCY_HISTOGRAM_SUB_BUCKETS + (units >> shift)
+
+    @staticmethod
+    def _bucket_highest_units(index: int) -> int:
+        if index < 2 * LATENCY_HISTOGRAM_SUB_BUCKETS:
+            return index
+        shift = index // LATENCY_HISTOGRAM_SUB_BUCKETS - 1
+        mantissa = index - shift * LATENCY_HISTOGRAM_SUB_BUCKETS
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        seconds = max(seconds, 0.0)
+        index = self._bucket_index(int(seconds / LATENCY_HISTOGRAM_UNIT_SECONDS))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, quantile: float) -> float:
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(self._bucket_highest_units(index) * LATENCY_HISTOGRAM_UNIT_SECONDS, self.max)
+        return self.max
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = (*labels, *extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(str(value))}"' for key, value in pairs) + "}"
+
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and latency histograms, rendered in the Prometheus text format.
+    Callback metrics are read at collection time, for values other modules already track (cache stats, queue sizes).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: dict[str, str] = {}
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._gauges: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, LatencyHistogram]] = {}
+        self._callbacks: dict[str, tuple[str, list[Callable[[], dict[Labels, float] | float]]]] = {}
+
+    @staticmethod
+    def _labels(labels: dict | None) -> Labels:
+        return tuple(sorted(labels.items())) if labels else ()
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, labels: dict | None = None, amount: float = 1):
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, labels: dict | None = None):
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._labels(labels)] = value
+
+    def observe(self, name: str, seconds: float, labels: dict | None = None):
+        key = self._labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def register_callback(self, name: str, metric_type: str, callback: Callable[[], dict[Labels, float] | float]):
+        """Add a ``counter`` or ``gauge`` read from ``callback()`` at collection time; it returns a number or {labels: number}."""
+        with self._lock:
+            _, callbacks = self._callbacks.setdefault(name, (metric_type, []))
+            callbacks.append(callback)
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._callbacks.clear()
+
+    def get_counter(self, name: str, labels: dict | None = None) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(self._labels(labels), 0)
+
+    def latency_percentiles(self, name: str, quantiles: tuple[float, ...] = SUMMARY_QUANTILES) -> list[tuple[dict, int, list[float]]]:
+        """(labels, count, [value per quantile]) for every series of a histogram, busiest first."""
+        with self._lock:
+            rows = [
+                (dict(labels), histogram.count, [histogram.percentile(quantile) for quantile in quantiles])
+                for labels, histogram in self._histograms.get(name, {}).items()
+            ]
+        return sorted(rows, key=lambda row: -row[1])
+
+    def _collect_callbacks(self) -> list[tuple[str, str, dict[Labels, float]]]:
+        with self._lock:
+            callbacks = [(name, metric_type, list(funcs)) for name, (metric_type, funcs) in self._callbacks.items()]
+        collected = []
+        for name, metric_type, funcs in callbacks:
+            samples: dict[Labels, float] = {}
+            for func in funcs:
+                try:
+                    value = func()
+                except Exception:
+                    continue
+                samples.update(value if isinstance(value, dict) else {(): value})
+            collected.append((name, metric_type, samples))
+        return collected
+
+    def render_prometheus(self) -> str:
+        callback_metrics = self._collect_callbacks()
+        lines = []
+
+        def _header(name: str, metric_type: str):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                _header(name, "counter")
+                lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in sorted(series.items()))
+            for name, series in sorted(self._gauges.items()):
+                _header(name, "gauge")
+                lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in sorted(series.items()))
+            for name, series in sorted(self._histograms.items()):
+                _header(name, "summary")
+                for labels, histogram in sorted(series.items()):
+                    for quantile in SUMMARY_QUANTILES:
+                        lines.append(f"{name}{_format_labels(labels, (('quantile', quantile),))} {histogram.percentile(quantile)}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for name, metric_type, samples in sorted(callback_metrics):
+            _header(name, metric_type)
+            lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in sorted(samples.items()))
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+metrics.describe(COMMAND_LATENCY_SECONDS, "Slash and message command latency.")
+metrics.describe(COMMAND_ERRORS_TOTAL, "Commands that raised or replied with an error.")
+metrics.describe(HTTP_REQUEST_LATENCY_SECONDS, "Web API request latency per route.")
+metrics.describe(HTTP_REQUEST_ERRORS_TOTAL, "Web API requests that raised or returned a 5xx.")
+
+
+def format_latency_table(name: str = COMMAND_LATENCY_SECONDS, *, label: str = "command", max_length: int = 1900) -> str:
+    """Code-block table of count and p50/p95/p99 (ms) per series, busiest first, cut to fit a Discord message."""
+    rows = metrics.latency_percentiles(name)
+    if not rows:
+        return "No latency samples recorded yet."
+    width = max(len(label), *(len(str(labels.get(label, ""))) for labels, _, _ in rows))
+    lines = [f"{label:<{width}} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"]
+    length = len(lines[0]) + 8
+    for labels, count, (p50, p95, p99) in rows:
+        line = f"{str(labels.get(label, '')):<{width}} {count:>7} {p50 * 1000:>8.1f} {p95 * 1000:>8.1f} {p99 * 1000:>8.1f}"
+        if length + len(line) + 1 > max_length:
+            break
+        lines.append(line)
+        length += len(line) + 1
+    return "```\n" + "\n".join(lines) + "\n```"
@@ -4,8 +4,9 @@ import datetime
 from peewee import *
 
 from .config import config
+from .db.instrumented import InstrumentedSqliteDatabase
 
-orm_db = SqliteDatabase(config.db_orm_path)
+orm_db = InstrumentedSqliteDatabase(config.db_orm_path)
 
 
 class BaseModel(Model):
@@ -56,6 +57,26 @@ class Reminder(BaseModel):
     is_private = BooleanField(default=False)
     remind_at = TimestampField()
     created_at = DateTimeField(default=datetime.datetime.now)
+    attempt_count = IntegerField(default=0)
+    next_attempt_at = TimestampField(null=True, default=None)
+
+
+class ReminderDeadLetter(BaseModel):
+    reminder_id = IntegerField()
+    user_id = IntegerField()
+    guild_id = IntegerField(null=True)
+    channel_id = IntegerField()
+    message = TextField()
+    is_private = BooleanField(default=False)
+    remind_at = TimestampField()
+    attempt_count = IntegerField()
+    last_error_type = CharField(null=True)
+    last_error = TextField(null=True)
+    created_at = DateTimeField()
+    dead_lettered_at = DateTimeField(default=datetime.datetime.now)
+
+    class Meta:
+        table_name = "reminder_dead_letter"
 
 
 class WorldClock(BaseModel):
@@ -77,6 +98,7 @@ class LiveMessage(BaseModel):
     last_refreshed_at = DateTimeField(null=True)
     stopped_at = DateTimeField(null=True)
     stop_reason = CharField(null=True)
+    refresh_slot = IntegerField(null=True)
     created_at = DateTimeField(default=datetime.datetime.now)
 
 
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+
+class TokenBucket:
+    """Classic token bucket: ``capacity`` tokens of burst, refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float, *, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        self._refill()
+        if self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        return True
+
+    def refund(self, tokens: float = 1.0):
+        """Give back tokens taken for a request that was never sent."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def time_until_available(self, tokens: float = 1.0) -> float:
+        self._refill()
+        if self._tokens >= tokens:
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until ``tokens`` are available and take them. Returns the number of seconds spent waiting."""
+        waited = 0.0
+        while not self.try_acquire(tokens):
+            delay = self.time_until_available(tokens)
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+
+class TokenBucketRegistry:
+    """Lazily created token buckets keyed by rate-limit bucket (channel, DM recipient, ...), LRU-bounded."""
+
+    def __init__(self, rate: float, capacity: float, *, max_buckets: int = 10_000, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_buckets = max_buckets
+        self._clock = clock
+        self._buckets: OrderedDict[Hashable, TokenBucket] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def get(self, key: Hashable) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.capacity, clock=self._clock)
+            self._buckets[key] = bucket
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def try_acquire(self, key: Hashable, tokens: float = 1.0) -> bool:
+        return self.get(key).try_acquire(tokens)
+
+    async def acquire(self, key: Hashable, tokens: float = 1.0) -> float:
+        return await self.get(key).acquire(tokens)
+
+    def refund(self, key: Hashable, tokens: float = 1.0):
+        self.get(key).refund(tokens)
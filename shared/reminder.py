@@ -1,9 +1,498 @@
-from datetime import datetime
+import asyncio
+import heapq
+import traceback
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timedelta
 
 import discord
 
-from .log import get_ray_id, log_event, ray_id_var
-from .models import Reminder
+from .autocomplete import AUTOCOMPLETE_KIND_REMINDER, autocomplete_cache
+from .config import config
+from .db.executor import run_db
+from .log import get_ray_id, log_event, ray_id_var, with_ray_id
+from .models import Reminder, ReminderDeadLetter, orm_db
+from .rate_limit import TokenBucket, TokenBucketRegistry
+
+# Failed deliveries back off exponentially from the old 10 second polling cadence, capped at an hour.
+REMINDER_RETRY_BASE_SECONDS = 10
+REMINDER_RETRY_MAX_SECONDS = 3600
+# Upper bound on a single scheduler sleep so wall-clock adjustments are picked up without touching the DB.
+REMINDER_SCHEDULER_MAX_SLEEP_SECONDS = 60
+# Discord allows 5 messages per 5 seconds per channel; the global budget leaves headroom for interactive traffic.
+REMINDER_BUCKET_RATE_PER_SECOND = 1.0
+REMINDER_BUCKET_CAPACITY = 5
+REMINDER_GLOBAL_RATE_PER_SECOND = 40.0
+REMINDER_GLOBAL_CAPACITY = 40
+DISCORD_MESSAGE_CHARACTER_LIMIT = 2000
+COALESCED_REMINDER_HEADER = "⏰ Reminders:"
+
+
+class ReminderScheduler:
+    """
+    In-memory min-heap of pending reminders keyed on their due time.
+    Edits and removals leave stale heap entries behind; ``_due_at`` is the source of truth and
+    stale entries are discarded lazily when they reach the top of the heap.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, int]] = []
+        self._due_at: dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._due_at)
+
+    def __contains__(self, reminder_id: int) -> bool:
+        return reminder_id in self._due_at
+
+    def load(self, due_times: Iterable[tuple[int, datetime]] | None = None) -> int:
+        """
+        Replace the scheduler contents with ``due_times`` ((reminder_id, due_at) pairs), or with every reminder
+        currently stored in the DB. The bot selects them on the DB executor and passes them in.
+        """
+        if due_times is None:
+            due_times = select_reminder_due_times()
+        self._due_at = dict(due_times)
+        self._heap = [(due_at, reminder_id) for reminder_id, due_at in self._due_at.items()]
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+        return len(self._due_at)
+
+    def schedule(self, reminder_id: int, due_at: datetime):
+        next_due_at = self.next_due_at()
+        self._due_at[reminder_id] = due_at
+        heapq.heappush(self._heap, (due_at, reminder_id))
+        if next_due_at is None or due_at < next_due_at:
+            self._wakeup.set()
+
+    def unschedule(self, reminder_id: int):
+        self._due_at.pop(reminder_id, None)
+
+    def next_due_at(self) -> datetime | None:
+        while self._heap:
+            due_at, reminder_id = self._heap[0]
+            if self._due_at.get(reminder_id) == due_at:
+                return due_at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: datetime) -> list[int]:
+        """Remove and return the ids of every reminder due at or before ``now``, earliest first."""
+        due_ids = []
+        while (next_due_at := self.next_due_at()) is not None and next_due_at <= now:
+            _, reminder_id = heapq.heappop(self._heap)
+            del self._due_at[reminder_id]
+            due_ids.append(reminder_id)
+        return due_ids
+
+    async def wait_until_due(self, *, max_sleep_seconds: float = REMINDER_SCHEDULER_MAX_SLEEP_SECONDS):
+        """Sleep until the earliest reminder is due, waking early if an earlier one is scheduled."""
+        while True:
+            self._wakeup.clear()
+            next_due_at = self.next_due_at()
+            now = datetime.now()
+            if next_due_at is not None and next_due_at <= now:
+                return
+            timeout = max_sleep_seconds
+            if next_due_at is not None:
+                timeout = min(timeout, (next_due_at - now).total_seconds())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+reminder_scheduler = ReminderScheduler()
+
+
+def select_reminder_due_times() -> list[tuple[int, datetime]]:
+    query = Reminder.select(Reminder.id, Reminder.remind_at, Reminder.next_attempt_at).tuples()
+    return [(reminder_id, next_attempt_at or remind_at) for reminder_id, remind_at, next_attempt_at in query]
+
+
+def get_reminder_due_at(reminder: Reminder) -> datetime:
+    return reminder.next_attempt_at or reminder.remind_at
+
+
+def reload_due_reminders(reminder_ids: list[int], now: datetime) -> list[Reminder]:
+    """Current rows of popped reminders, in the given order, without those deleted or rescheduled past ``now`` since."""
+    reminders = {reminder.id: reminder for reminder in Reminder.select().where(Reminder.id.in_(reminder_ids))}
+    return [
+        reminders[reminder_id]
+        for reminder_id in reminder_ids
+        if reminder_id in reminders and get_reminder_due_at(reminders[reminder_id]) <= now
+    ]
+
+
+def _reminder_versions(reminders: list[Reminder]) -> list[tuple]:
+    return [(reminder.id, reminder.message, get_reminder_due_at(reminder)) for reminder in reminders]
+
+
+def get_reminder_messages(user_id: int) -> list[str]:
+    """Messages of the user's pending reminders, soonest first, as offered by the reminder autocomplete."""
+    return [
+        reminder.message for reminder in Reminder.select(Reminder.message).where(Reminder.user_id == user_id).order_by(Reminder.remind_at)
+    ]
+
+
+def invalidate_reminder_autocomplete(*user_ids: int):
+    for user_id in set(user_ids):
+        autocomplete_cache.invalidate(AUTOCOMPLETE_KIND_REMINDER, user_id)
+
+
+def get_reminder_retry_delay_seconds(attempt_count: int) -> float:
+    return min(REMINDER_RETRY_MAX_SECONDS, REMINDER_RETRY_BASE_SECONDS * 2 ** (attempt_count - 1))
+
+
+def move_reminder_to_dead_letter(reminder: Reminder, attempt_count: int, error_type: str | None, error: str | None) -> ReminderDeadLetter:
+    with orm_db.atomic():
+        dead_letter = ReminderDeadLetter.create(
+            reminder_id=reminder.id,
+            user_id=reminder.user_id,
+            guild_id=reminder.guild_id,
+            channel_id=reminder.channel_id,
+            message=reminder.message,
+            is_private=reminder.is_private,
+            remind_at=reminder.remind_at,
+            attempt_count=attempt_count,
+            last_error_type=error_type,
+            last_error=error,
+            created_at=reminder.created_at,
+        )
+        Reminder.delete().where(Reminder.id == reminder.id).execute()
+    invalidate_reminder_autocomplete(reminder.user_id)
+    log_event(
+        "REMINDER_DEAD_LETTERED",
+        {
+            "ray_id": get_ray_id(),
+            "event": "REMINDER_DEAD_LETTERED",
+            "reminder_id": reminder.id,
+            "dead_letter_id": dead_letter.id,
+            "user_id": reminder.user_id,
+            "guild_id": reminder.guild_id,
+            "channel_id": reminder.channel_id,
+            "attempt_count": attempt_count,
+            "error_type": error_type,
+            "error": error,
+        },
+        level="warning",
+    )
+    return dead_letter
+
+
+def record_reminder_delivery_failure(
+    reminder: Reminder,
+    error_type: str | None,
+    error: str | None,
+    *,
+    now: datetime | None = None,
+    max_attempts: int | None = None,
+) -> datetime | None:
+    """
+    Count a failed delivery attempt and back the reminder off exponentially.
+    Returns the next attempt time, or None once the reminder has been moved to the dead letter table.
+    """
+    now = now or datetime.now()
+    max_attempts = max_attempts or config.reminder_max_attempts
+    attempt_count = reminder.attempt_count + 1
+    if attempt_count >= max_attempts:
+        move_reminder_to_dead_letter(reminder, attempt_count, error_type, error)
+        return None
+
+    next_attempt_at = now + timedelta(seconds=get_reminder_retry_delay_seconds(attempt_count))
+    Reminder.update(attempt_count=attempt_count, next_attempt_at=next_attempt_at).where(Reminder.id == reminder.id).execute()
+    reminder.attempt_count = attempt_count
+    reminder.next_attempt_at = next_attempt_at
+    log_event(
+        "REMINDER_RETRY_SCHEDULED",
+        {
+            "ray_id": get_ray_id(),
+            "event": "REMINDER_RETRY_SCHEDULED",
+            "reminder_id": reminder.id,
+            "attempt_count": attempt_count,
+            "next_attempt_at": str(next_attempt_at),
+            "error_type": error_type,
+        },
+        level="info",
+    )
+    return next_attempt_at
+
+
+async def schedule_reminder_retry(
+    reminder: Reminder, error_type: str | None, error: str | None, *, scheduler: ReminderScheduler | None = None
+):
+    """
+    Record a failed delivery on the DB executor and put the reminder back on the scheduler for its next attempt.
+    If recording the failure itself fails, the reminder is still rescheduled with the next backoff delay, so that
+    it is never left off the scheduler until the bot restarts.
+    """
+    if scheduler is None:
+        scheduler = reminder_scheduler
+    try:
+        next_attempt_at = await run_db(record_reminder_delivery_failure, reminder, error_type, error)
+    except Exception as e:
+        next_attempt_at = datetime.now() + timedelta(seconds=get_reminder_retry_delay_seconds(reminder.attempt_count + 1))
+        log_event(
+            "REMINDER_RETRY_RECORD_ERROR",
+            {
+                "ray_id": get_ray_id(),
+                "event": "REMINDER_RETRY_RECORD_ERROR",
+                "reminder_id": reminder.id,
+                "next_attempt_at": str(next_attempt_at),
+                "error_type": type(e).__name__,
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+            },
+            level="error",
+        )
+    if next_attempt_at is not None:
+        scheduler.schedule(reminder.id, next_attempt_at)
+
+
+def format_coalesced_reminder_line(reminder: Reminder, *, is_dm: bool) -> str:
+    if is_dm:
+        return f"- {reminder.message}"
+    return f"- <@{reminder.user_id}>: {reminder.message}"
+
+
+def build_coalesced_reminder_messages(
+    reminders: list[Reminder], *, is_dm: bool, limit: int = DISCORD_MESSAGE_CHARACTER_LIMIT
+) -> list[tuple[str, list[Reminder]]]:
+    """Pack reminders for one channel or DM recipient into as few messages as fit under Discord's length limit."""
+    messages = []
+    lines: list[str] = []
+    chunk: list[Reminder] = []
+    length = len(COALESCED_REMINDER_HEADER)
+    for reminder in reminders:
+        line = format_coalesced_reminder_line(reminder, is_dm=is_dm)
+        if chunk and length + 1 + len(line) > limit:
+            messages.append(("\n".join([COALESCED_REMINDER_HEADER, *lines]), chunk))
+            lines, chunk, length = [], [], len(COALESCED_REMINDER_HEADER)
+        lines.append(line)
+        chunk.append(reminder)
+        length += 1 + len(line)
+    if chunk:
+        messages.append(("\n".join([COALESCED_REMINDER_HEADER, *lines]), chunk))
+    return messages
+
+
+def delete_delivered_reminders(reminders: list[Reminder]) -> int:
+    with orm_db.atomic():
+        deleted = Reminder.delete().where(Reminder.id.in_([reminder.id for reminder in reminders])).execute()
+    invalidate_reminder_autocomplete(*(reminder.user_id for reminder in reminders))
+    return deleted
+
+
+def get_reminder_delivery_bucket(reminder: Reminder) -> tuple[str, int]:
+    """Rate-limit bucket a reminder is sent through: the target channel, or the recipient's DM."""
+    if reminder.is_private:
+        return ("dm", reminder.user_id)
+    return ("channel", reminder.channel_id)
+
+
+class ReminderDeliveryPipeline:
+    """
+    Bounded pool of asyncio workers delivering due reminders.
+    Reminders are grouped by delivery bucket; each group is sent in order through its own token bucket,
+    while different channels and DMs are delivered concurrently.
+    When ``deliver_coalesced`` is given, reminders sharing a bucket are combined into as few messages as possible.
+    ``deliver_coalesced`` returns None when the shared target cannot be resolved; those reminders are then sent
+    one at a time, each waiting for its own bucket and global tokens.
+    When ``reload`` is given, each send's reminders are re-read just before sending. Reminders deleted or
+    rescheduled since they were popped are skipped, and edited ones are sent with their current content.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[Reminder], Awaitable[bool]],
+        *,
+        width: int,
+        deliver_coalesced: Callable[[list[Reminder], str], Awaitable[bool | None]] | None = None,
+        reload: Callable[[list[Reminder]], Awaitable[list[Reminder]]] | None = None,
+        bucket_rate: float = REMINDER_BUCKET_RATE_PER_SECOND,
+        bucket_capacity: float = REMINDER_BUCKET_CAPACITY,
+        global_rate: float = REMINDER_GLOBAL_RATE_PER_SECOND,
+        global_capacity: float = REMINDER_GLOBAL_CAPACITY,
+    ):
+        self._deliver = deliver
+        self._deliver_coalesced = deliver_coalesced
+        self._reload = reload
+        self.width = width
+        self._buckets = TokenBucketRegistry(bucket_rate, bucket_capacity)
+        self._global_bucket = TokenBucket(global_rate, global_capacity)
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self.queue_depth = 0
+        self.delivered_count = 0
+        self.failed_count = 0
+        self.skipped_count = 0
+        self.max_lag_seconds = 0.0
+
+    def start(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.width)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def join(self):
+        """Wait until every submitted reminder has been attempted."""
+        await self._queue.join()
+
+    def submit(self, reminders: list[Reminder]) -> int:
+        groups: dict[tuple[str, int], list[Reminder]] = {}
+        for reminder in reminders:
+            groups.setdefault(get_reminder_delivery_bucket(reminder), []).append(reminder)
+        for bucket, group in groups.items():
+            self._queue.put_nowait((bucket, group))
+            self.queue_depth += len(group)
+        log_event(
+            "REMINDER_DELIVERY_QUEUED",
+            {
+                "event": "REMINDER_DELIVERY_QUEUED",
+                "reminder_count": len(reminders),
+                "group_count": len(groups),
+                "queue_depth": self.queue_depth,
+            },
+            level="debug",
+        )
+        return len(groups)
+
+    def stats(self) -> dict:
+        return {
+            "width": self.width,
+            "coalesce": self._deliver_coalesced is not None,
+            "queue_depth": self.queue_depth,
+            "delivered_count": self.delivered_count,
+            "failed_count": self.failed_count,
+            "skipped_count": self.skipped_count,
+            "max_lag_seconds": self.max_lag_seconds,
+        }
+
+    async def _worker(self):
+        while True:
+            bucket, group = await self._queue.get()
+            try:
+                await self._deliver_group(bucket, group)
+            except Exception as e:
+                # One bad group must not take its worker down with it.
+                log_event(
+                    "REMINDER_DELIVERY_GROUP_ERROR",
+                    {
+                        "ray_id": get_ray_id(),
+                        "event": "REMINDER_DELIVERY_GROUP_ERROR",
+                        "bucket": f"{bucket[0]}:{bucket[1]}",
+                        "reminder_ids": [reminder.id for reminder in group],
+                        "error_type": type(e).__name__,
+                        "error": str(e),
+                        "traceback": traceback.format_exc(),
+                    },
+                    level="error",
+                )
+            finally:
+                self._queue.task_done()
+
+    def _plan_sends(self, group: list[Reminder]) -> list[tuple[list[Reminder], str | None]]:
+        if self._deliver_coalesced is None:
+            return [([reminder], None) for reminder in group]
+        return [
+            (reminders, content if len(reminders) > 1 else None)
+            for content, reminders in build_coalesced_reminder_messages(group, is_dm=group[0].is_private)
+        ]
+
+    async def _send(self, reminders: list[Reminder], content: str | None) -> bool | None:
+        try:
+            if content is None:
+                return await with_ray_id(self._deliver, reminders[0])
+            return await with_ray_id(self._deliver_coalesced, reminders, content)
+        except Exception as e:
+            log_event(
+                "REMINDER_DELIVERY_ERROR",
+                {
+                    "ray_id": get_ray_id(),
+                    "event": "REMINDER_DELIVERY_ERROR",
+                    "reminder_ids": [reminder.id for reminder in reminders],
+                    "error_type": type(e).__name__,
+                    "error": str(e),
+                },
+                level="error",
+            )
+            return False
+
+    def _refund_tokens(self, bucket: tuple[str, int]):
+        self._buckets.refund(bucket)
+        self._global_bucket.refund()
+
+    def _skip(self, reminders: list[Reminder]):
+        if not reminders:
+            return
+        self.skipped_count += len(reminders)
+        self.queue_depth -= len(reminders)
+        log_event(
+            "REMINDER_DELIVERY_SKIPPED",
+            {"ray_id": get_ray_id(), "event": "REMINDER_DELIVERY_SKIPPED", "reminder_ids": [reminder.id for reminder in reminders]},
+            level="info",
+        )
+
+    async def _deliver_group(self, bucket: tuple[str, int], group: list[Reminder]):
+        lags = []
+        delivered_count = 0
+        message_count = 0
+        # Each send carries whether its reminders were just re-read, so rows rebuilt from a reload are not re-read again.
+        sends = deque((reminders, content, False) for reminders, content in self._plan_sends(group))
+        while sends:
+            reminders, content, reloaded = sends.popleft()
+            await self._buckets.acquire(bucket)
+            await self._global_bucket.acquire()
+            if self._reload is not None and not reloaded:
+                current = await self._reload(reminders)
+                if _reminder_versions(current) != _reminder_versions(reminders):
+                    # Nothing was sent for the stale plan, so its tokens go back for the re-planned sends.
+                    self._refund_tokens(bucket)
+                    current_ids = {reminder.id for reminder in current}
+                    self._skip([reminder for reminder in reminders if reminder.id not in current_ids])
+                    if not current:
+                        continue
+                    sends.extendleft(reversed([(planned, planned_content, True) for planned, planned_content in self._plan_sends(current)]))
+                    continue
+                reminders = current
+            now = datetime.now()
+            delivered = await self._send(reminders, content)
+            if delivered is None:
+                self._refund_tokens(bucket)
+                sends.extendleft(reversed([([reminder], None, True) for reminder in reminders]))
+                continue
+            message_count += 1
+            self.queue_depth -= len(reminders)
+            for reminder in reminders:
+                lag_seconds = max(0.0, (now - get_reminder_due_at(reminder)).total_seconds())
+                lags.append(lag_seconds)
+                self.max_lag_seconds = max(self.max_lag_seconds, lag_seconds)
+            if delivered:
+                delivered_count += len(reminders)
+                self.delivered_count += len(reminders)
+            else:
+                self.failed_count += len(reminders)
+        log_event(
+            "REMINDER_DELIVERY_GROUP_DONE",
+            {
+                "event": "REMINDER_DELIVERY_GROUP_DONE",
+                "bucket": f"{bucket[0]}:{bucket[1]}",
+                "reminder_count": len(group),
+                "message_count": message_count,
+                "delivered_count": delivered_count,
+                "max_lag_seconds": max(lags, default=0.0),
+                "avg_lag_seconds": sum(lags) / len(lags) if lags else 0.0,
+                "queue_depth": self.queue_depth,
+            },
+            level="info",
+        )
 
 
 class EditReminderModal(discord.ui.Modal, title="Edit Reminder"):
@@ -28,7 +517,7 @@ class EditReminderModal(discord.ui.Modal, title="Edit Reminder"):
             new_message = self.message_input.value
             new_remind_at = datetime.strptime(self.remind_at_input.value, "%Y-%m-%d %H:%M:%S")
 
-            reminder_instance = Reminder.get_by_id(self.reminder_id)
+            reminder_instance = await run_db(Reminder.get_by_id, self.reminder_id)
             # AUDIT LOG: Log before/after edit
             log_event(
                 "AUDIT_LOG",
@@ -45,7 +534,12 @@ class EditReminderModal(discord.ui.Modal, title="Edit Reminder"):
             )
             reminder_instance.message = new_message
             reminder_instance.remind_at = new_remind_at
-            reminder_instance.save()
+            # A new delivery time starts the retry budget over.
+            reminder_instance.attempt_count = 0
+            reminder_instance.next_attempt_at = None
+            await run_db(reminder_instance.save)
+            invalidate_reminder_autocomplete(reminder_instance.user_id)
+            reminder_scheduler.schedule(reminder_instance.id, new_remind_at)
 
             await interaction.response.send_message("Reminder updated successfully!", ephemeral=True)
         finally:
@@ -3,8 +3,11 @@ from zoneinfo import ZoneInfo
 
 import discord
 
+from .autocomplete import AUTOCOMPLETE_KIND_CLOCK, autocomplete_cache
+from .cache import TTLCache
+from .db.executor import run_db
 from .errors import InvalidInputError
-from .log import get_ray_id, log_event, ray_id_var
+from .log import get_ray_id, log_event, ray_id_var, span
 from .models import WorldClock
 from .timezone import get_valid_timezone
 
@@ -21,6 +24,12 @@ WORLD_CLOCK_LIVE_MESSAGE_DURATIONS: tuple[tuple[str, timedelta | None], ...] = (
     ("1 week", timedelta(weeks=1)),
     (WORLD_CLOCK_LIVE_MESSAGE_INDEFINITE, None),
 )
+WORLD_CLOCK_RENDER_CACHE_MAXSIZE = 4096
+# Entries are keyed by minute, so anything older than the current minute is never read again.
+WORLD_CLOCK_RENDER_CACHE_TTL_SECONDS = 120
+
+# (guild_id, user_id, minute) -> clocks sorted for display, each paired with its local time for that minute.
+world_clock_render_cache = TTLCache(WORLD_CLOCK_RENDER_CACHE_MAXSIZE, WORLD_CLOCK_RENDER_CACHE_TTL_SECONDS)
 
 
 def _validate_scope(guild_id: int | None, user_id: int | None):
@@ -37,6 +46,16 @@ def _scope_filter(guild_id: int | None, user_id: int | None):
     return (WorldClock.guild_id == guild_id) & WorldClock.user_id.is_null()
 
 
+def _scope_key(guild_id: int | None, user_id: int | None) -> tuple[int | None, int | None]:
+    return (guild_id, None) if guild_id is not None else (None, user_id)
+
+
+def invalidate_world_clock_render_cache(guild_id: int | None, user_id: int | None):
+    scope_key = _scope_key(guild_id, user_id)
+    world_clock_render_cache.invalidate_where(lambda key: key[:2] == scope_key)
+    autocomplete_cache.invalidate(AUTOCOMPLETE_KIND_CLOCK, None, scope_key)
+
+
 def get_timezone(guild_id: int | None, user_id: int | None, timezone_str: str) -> WorldClock:
     try:
         return WorldClock.get(_scope_filter(guild_id, user_id), WorldClock.timezone_str == timezone_str)
@@ -48,24 +67,44 @@ def add_timezone(guild_id: int | None, user_id: int | None, timezone_str: str, l
     if WorldClock.select().where(_scope_filter(guild_id, user_id), WorldClock.timezone_str == timezone_str).exists():
         return f"Timezone already exists: {timezone_str}"
     WorldClock.create(guild_id=guild_id, user_id=user_id if guild_id is None else None, timezone_str=timezone_str, label=label)
+    invalidate_world_clock_render_cache(guild_id, user_id)
     return f"Timezone added: {timezone_str}{' with label ' + label if label else ''}"
 
 
 def remove_timezone(guild_id: int | None, user_id: int | None, timezone_str: str) -> str:
     query = WorldClock.delete().where(_scope_filter(guild_id, user_id), WorldClock.timezone_str == timezone_str)
     if query.execute():
+        invalidate_world_clock_render_cache(guild_id, user_id)
         return f"Timezone {timezone_str} removed"
     return "Timezone not found."
 
 
 def update_timezone(guild_id: int | None, user_id: int | None, timezone_str: str, label=None):
     WorldClock.update(label=label).where(_scope_filter(guild_id, user_id), WorldClock.timezone_str == timezone_str).execute()
+    invalidate_world_clock_render_cache(guild_id, user_id)
 
 
 def list_timezones(guild_id: int | None, user_id: int | None = None) -> list[WorldClock]:
     return WorldClock.select().where(_scope_filter(guild_id, user_id)).order_by(WorldClock.created_at.asc())
 
 
+def list_scope_timezone_strs(guild_id: int | None, user_id: int | None) -> list[str]:
+    return [tz.timezone_str for tz in list_timezones(guild_id, user_id)]
+
+
+def get_scope_timezone_strs(guild_id: int | None, user_id: int | None) -> tuple[str, ...]:
+    return autocomplete_cache.get_or_build(
+        AUTOCOMPLETE_KIND_CLOCK, None, _scope_key(guild_id, user_id), lambda: list_scope_timezone_strs(guild_id, user_id)
+    )
+
+
+async def fetch_scope_timezone_strs(guild_id: int | None, user_id: int | None) -> tuple[str, ...]:
+    """Like get_scope_timezone_strs, but a cache miss queries the DB on the DB executor."""
+    return await autocomplete_cache.get_or_fetch(
+        AUTOCOMPLETE_KIND_CLOCK, None, _scope_key(guild_id, user_id), lambda: run_db(list_scope_timezone_strs, guild_id, user_id)
+    )
+
+
 def _get_reference_now(now: datetime | None = None) -> datetime:
     reference_now = now or datetime.now(timezone.utc)
     if reference_now.tzinfo is None:
@@ -118,6 +157,23 @@ def sort_world_clocks_by_display_time(tzs: list[WorldClock], now: datetime | Non
     )
 
 
+def get_rendered_world_clocks(guild_id: int | None, user_id: int | None, now: datetime | None = None) -> list[tuple[WorldClock, datetime]]:
+    """
+    Return the scope's clocks in display order with their local times, computed at most once per scope per minute.
+    Every display is minute-resolution, so all live messages and list commands for a scope share one render.
+    """
+    reference_now = _get_reference_now(now)
+    cache_key = (*_scope_key(guild_id, user_id), reference_now.replace(second=0, microsecond=0))
+    rendered = world_clock_render_cache.get(cache_key)
+    if rendered is None:
+        # A write that invalidates the scope while this render reads the clocks must not be undone by storing it.
+        generation = world_clock_render_cache.generation()
+        tzs = list_timezones(guild_id, user_id)
+        rendered = [(tz, get_world_clock_local_time(tz, reference_now)) for tz in sort_world_clocks_by_display_time(tzs, reference_now)]
+        world_clock_render_cache.set(cache_key, rendered, generation=generation)
+    return rendered
+
+
 def format_time(dt: datetime) -> str:
     # will format to Saturday February 15 12:22 AM
     return dt.strftime("%A %B %d %I:%M %p")
@@ -132,19 +188,20 @@ def format_tzs_response_str(tzs: list[WorldClock], now: datetime | None = None)
     return result
 
 
+def _format_world_clock_display_line(tz: WorldClock, local_time: datetime) -> str:
+    formatted_time = format_time(local_time)
+    if tz.label:
+        return f"**{tz.label}** | {tz.timezone_str} | {formatted_time}"
+    return f"**{tz.timezone_str}** | {formatted_time}"
+
+
 def _get_world_clock_display_lines(tzs: list[WorldClock], now: datetime | None = None) -> list[str]:
-    lines = []
-    for tz in sort_world_clocks_by_display_time(tzs, now=now):
-        local_time = get_world_clock_local_time(tz, now)
-        formatted_time = format_time(local_time)
-        if tz.label:
-            line = f"**{tz.label}** | {tz.timezone_str} | {formatted_time}"
-        else:
-            line = f"**{tz.timezone_str}** | {formatted_time}"
-        lines.append(line)
-    return lines
+    return [
+        _format_world_clock_display_line(tz, get_world_clock_local_time(tz, now)) for tz in sort_world_clocks_by_display_time(tzs, now=now)
+    ]
 
 
+@span("render")
 def build_world_clock_embed(
     guild_id: int | None,
     user_id: int | None,
@@ -154,11 +211,11 @@ def build_world_clock_embed(
     live_status_text: str | None = None,
 ) -> discord.Embed:
     reference_now = _get_reference_now(now)
-    tzs = list_timezones(guild_id, user_id)
+    rendered = get_rendered_world_clocks(guild_id, user_id, reference_now)
     embed = discord.Embed(title="World Clock", color=discord.Color.blue())
 
-    if tzs:
-        embed.description = "\n".join(_get_world_clock_display_lines(tzs, now=reference_now))
+    if rendered:
+        embed.description = "\n".join(_format_world_clock_display_line(tz, local_time) for tz, local_time in rendered)
     else:
         embed.description = "There are no clocks in your world clock"
 
@@ -204,9 +261,9 @@ def handle_world_clock_command(args: list[str], guild_id: int | None, user_id: i
                     result = remove_timezone(guild_id, user_id, tz)
 
             case "list":
-                tzs = list_timezones(guild_id, user_id)
-                if tzs:
-                    result = format_tzs_response_str(tzs)
+                rendered = get_rendered_world_clocks(guild_id, user_id)
+                if rendered:
+                    result = "".join(_format_world_clock_text_line(tz, local_time) + "\n" for tz, local_time in rendered)
                 else:
                     result = "No timezones added to world clock"
             case _:
@@ -251,10 +308,14 @@ class EditTimezoneLabelModal(discord.ui.Modal, title="Edit Timezone Label"):
             ray_id_var.reset(token)
 
 
-def format(wc: WorldClock, now: datetime | None = None) -> str:
+def _format_world_clock_text_line(wc: WorldClock, local_time: datetime) -> str:
     label = wc.label + " | " if wc.label else ""
     zone = wc.timezone_str
-    return f"{label}{zone}: **{format_time(get_world_clock_local_time(wc, now))}**"
+    return f"{label}{zone}: **{format_time(local_time)}**"
+
+
+def format(wc: WorldClock, now: datetime | None = None) -> str:
+    return _format_world_clock_text_line(wc, get_world_clock_local_time(wc, now))
 
 
 WorldClock.format = format
@@ -1,21 +1,108 @@
+import re
+from collections.abc import Collection, Iterable
+
 from pytz import all_timezones
 
 from .errors import InvalidInputError
 
 all_timezones_lower = list(map(str.lower, all_timezones))
 
+# Enough prefix matches per trie node to still fill an autocomplete page after excluding a scope's existing clocks.
+TIMEZONE_TRIE_MATCHES_PER_NODE = 50
+TIMEZONE_SEARCH_LIMIT = 25
+
+
+class _PrefixTrie:
+    """Character trie whose nodes keep the first few values inserted beneath them, so a prefix lookup is O(len(prefix))."""
+
+    def __init__(self, matches_per_node: int):
+        self.matches_per_node = matches_per_node
+        self._root: dict = {}
+
+    def insert(self, key: str, value: str):
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+            matches = node.setdefault("", [])
+            if len(matches) < self.matches_per_node and value not in matches:
+                matches.append(value)
+
+    def get(self, prefix: str) -> list[str]:
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get("", [])
+
+
+class TimezoneIndex:
+    """
+    Precomputed lookups over the IANA zone names: exact and case-insensitive resolution via dicts,
+    autocomplete via a prefix trie on full names, and city matching via a trie on every name segment and
+    word (so "tokyo" finds Asia/Tokyo and "york" finds America/New_York). Substring matching is the last resort.
+    """
+
+    def __init__(self, zones: Iterable[str], *, matches_per_node: int = TIMEZONE_TRIE_MATCHES_PER_NODE):
+        self.zones = list(zones)
+        self._exact = set(self.zones)
+        self._by_lower = {}
+        for zone in self.zones:
+            self._by_lower.setdefault(zone.lower(), zone)
+        self._lower_zones = [(zone.lower(), zone) for zone in self.zones]
+        self._name_trie = _PrefixTrie(matches_per_node)
+        self._segment_trie = _PrefixTrie(matches_per_node)
+        for zone in self.zones:
+            zone_lower = zone.lower()
+            self._name_trie.insert(zone_lower, zone)
+            for segment in zone_lower.split("/"):
+                self._segment_trie.insert(segment, zone)
+                for token in re.split(r"[_\-]", segment):
+                    if token != segment:
+                        self._segment_trie.insert(token, zone)
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def lookup(self, zone: str) -> str | None:
+        """Resolve a zone name exactly, then case-insensitively. Returns the canonical name or None."""
+        if zone in self._exact:
+            return zone
+        return self._by_lower.get(zone.lower())
+
+    def search(self, query: str, *, limit: int = TIMEZONE_SEARCH_LIMIT, exclude: Collection[str] = ()) -> list[str]:
+        """Return up to ``limit`` zones for an autocomplete query: full-name prefixes, then segment/city prefixes, then substrings."""
+        normalized = query.strip().lower().replace(" ", "_")
+        results: list[str] = []
+        seen = set(exclude)
+
+        def _extend(candidates: Iterable[str]) -> bool:
+            for zone in candidates:
+                if zone not in seen:
+                    seen.add(zone)
+                    results.append(zone)
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        if not normalized:
+            _extend(self.zones)
+            return results
+        if _extend(self._name_trie.get(normalized)) or _extend(self._segment_trie.get(normalized)):
+            return results
+        _extend(zone for zone_lower, zone in self._lower_zones if normalized in zone_lower)
+        return results
+
+
+timezone_index = TimezoneIndex(all_timezones)
+
 
 def return_all_timezones():
     return all_timezones + all_timezones_lower
 
 
 def get_valid_timezone(zone: str) -> str:
-    normalized_zone = zone.strip()
-    if normalized_zone in all_timezones:
-        return normalized_zone
-
-    normalized_zone_lower = normalized_zone.lower()
-    if normalized_zone_lower in all_timezones_lower:
-        return all_timezones[all_timezones_lower.index(normalized_zone_lower)]
-
-    raise InvalidInputError("Timezone not found")
+    valid_zone = timezone_index.lookup(zone.strip())
+    if valid_zone is None:
+        raise InvalidInputError("Timezone not found")
+    return valid_zone
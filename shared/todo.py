@@ -4,6 +4,7 @@ import datetime
 from collections.abc import Sequence
 
 import discord
+from peewee import Case
 
 from .errors import InvalidInputError
 from .log import get_ray_id, log_event, ray_id_var
@@ -132,31 +133,18 @@ def move_task(user_id: int, old_position: int, new_position: int, guild_id: int
     if old_position < 1 or old_position > task_count or new_position < 1 or new_position > task_count:
         return "Task not found."
 
-    item_to_move = task
-    with orm_db.atomic():
-        if old_position < new_position:
-            (
-                TodoItem.update({TodoItem.order_index: TodoItem.order_index - 1})
-                .where(
-                    _active_scope(user_id, guild_id),
-                    TodoItem.order_index > old_position,
-                    TodoItem.order_index <= new_position,
-                )
-                .execute()
-            )
-        else:
-            (
-                TodoItem.update({TodoItem.order_index: TodoItem.order_index + 1})
-                .where(
-                    _active_scope(user_id, guild_id),
-                    TodoItem.order_index >= new_position,
-                    TodoItem.order_index < old_position,
-                )
-                .execute()
-            )
-
-        item_to_move.order_index = new_position
-        item_to_move.save()
+    if old_position < new_position:
+        shifted = (TodoItem.order_index > old_position) & (TodoItem.order_index <= new_position)
+        shifted_index = TodoItem.order_index - 1
+    else:
+        shifted = (TodoItem.order_index >= new_position) & (TodoItem.order_index < old_position)
+        shifted_index = TodoItem.order_index + 1
+    # Shift the tasks in between and place the moved task in one UPDATE, which is atomic on its own.
+    (
+        TodoItem.update({TodoItem.order_index: Case(None, [(TodoItem.id == task.id, new_position)], shifted_index)})
+        .where(_active_scope(user_id, guild_id), shifted | (TodoItem.id == task.id))
+        .execute()
+    )
 
     return f"Task moved to position {new_position}."
 
@@ -1,9 +1,11 @@
+import contextlib
 import os
 import sys
 
 import pytest
 
 from shared.db.db import create_dbs
+from shared.log import QueryStats, query_stats_var
 from shared.models import orm_db
 
 # Ensure the environment is set to TEST
@@ -23,3 +25,35 @@ def setup_test_db():
     print("Tearing down test database...")
     orm_db.close()
     print("Test database teardown complete.")
+
+
+@pytest.fixture
+def query_ceiling():
+    """Assert that a block runs at most ``max_queries`` SQL statements, listing them when it runs more."""
+
+    @contextlib.contextmanager
+    def _ceiling(max_queries: int):
+        stats = QueryStats(keep_statements=True)
+        token = query_stats_var.set(stats)
+        try:
+            yield stats
+        finally:
+            query_stats_var.reset(token)
+        assert stats.count <= max_queries, f"{stats.count} queries (ceiling {max_queries}):\n" + "\n".join(stats.statements)
+
+    return _ceiling
+
+
+class FakeClock:
+    """Monotonic clock stand-in whose time only moves when a test sets ``now``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
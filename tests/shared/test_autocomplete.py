@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import pytest
+from db_test_utils import wipe_table
+
+from shared import autocomplete
+from shared.autocomplete import (
+    AUTOCOMPLETE_KIND_REMINDER,
+    AutocompleteCache,
+    autocomplete_cache,
+)
+from shared.models import Reminder
+from shared.reminder import (
+    delete_delivered_reminders,
+    get_reminder_messages,
+    invalidate_reminder_autocomplete,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_autocomplete_cache():
+    wipe_table(Reminder)
+    autocomplete_cache.clear()
+
+
+def test_get_or_build_only_builds_on_miss():
+    cache = AutocompleteCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return ["a", "b"]
+
+    assert cache.get_or_build("kind", 1, None, build) == ("a", "b")
+    assert cache.get_or_build("kind", 1, None, build) == ("a", "b")
+    assert cache.get_or_build("kind", 2, None, build) == ("a", "b")
+
+    assert len(builds) == 2
+    assert cache.stats()["kinds"]["kind"] == {"hits": 1, "misses": 2, "invalidations": 0, "hit_rate": 1 / 3}
+
+
+def test_invalidate_drops_only_matching_entry():
+    cache = AutocompleteCache()
+    cache.set("kind", 1, None, ["a"])
+    cache.set("kind", 2, None, ["b"])
+    cache.set("other", 1, None, ["c"])
+
+    cache.invalidate("kind", 1)
+
+    assert cache.get("kind", 1) is None
+    assert cache.get("kind", 2) == ("b",)
+    assert cache.get("other", 1) == ("c",)
+
+
+def test_invalidate_user_drops_every_scope():
+    cache = AutocompleteCache()
+    cache.set("kind", 1, "x", ["a"])
+    cache.set("kind", 1, "y", ["b"])
+    cache.set("kind", 2, "x", ["c"])
+
+    assert cache.invalidate_user("kind", 1) == 2
+    assert cache.get("kind", 2, "x") == ("c",)
+
+
+def test_hit_rates_are_logged_periodically(monkeypatch):
+    logged = []
+    monkeypatch.setattr(autocomplete, "log_event", lambda event, data, level: logged.append((event, data)))
+    cache = AutocompleteCache(log_every=3)
+    cache.set("kind", 1, None, ["a"])
+
+    for _ in range(4):
+        cache.get("kind", 1)
+
+    assert [event for event, _ in logged] == ["AUTOCOMPLETE_CACHE_STATS"]
+    assert logged[0][1]["kinds"]["kind"]["hits"] == 3
+
+
+def test_reminder_writes_invalidate_autocomplete():
+    first = Reminder.create(user_id=100, guild_id=200, channel_id=300, message="later", remind_at=datetime(2030, 1, 2))
+    Reminder.create(user_id=100, guild_id=200, channel_id=300, message="sooner", remind_at=datetime(2030, 1, 1))
+    autocomplete_cache.set(AUTOCOMPLETE_KIND_REMINDER, 100, None, get_reminder_messages(100))
+    assert autocomplete_cache.get(AUTOCOMPLETE_KIND_REMINDER, 100) == ("sooner", "later")
+
+    delete_delivered_reminders([first])
+    assert autocomplete_cache.get(AUTOCOMPLETE_KIND_REMINDER, 100) is None
+
+    autocomplete_cache.set(AUTOCOMPLETE_KIND_REMINDER, 100, None, get_reminder_messages(100))
+    invalidate_reminder_autocomplete(100)
+    assert autocomplete_cache.get(AUTOCOMPLETE_KIND_REMINDER, 100) is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_does_not_store_candidates_invalidated_during_the_fetch():
+    cache = AutocompleteCache()
+
+    async def fetch_racing_a_write():
+        cache.invalidate(AUTOCOMPLETE_KIND_REMINDER, 1)
+        return ["stale"]
+
+    assert await cache.get_or_fetch(AUTOCOMPLETE_KIND_REMINDER, 1, None, fetch_racing_a_write) == ("stale",)
+    assert cache.get(AUTOCOMPLETE_KIND_REMINDER, 1) is None
+
+    async def fetch():
+        return ["fresh"]
+
+    assert await cache.get_or_fetch(AUTOCOMPLETE_KIND_REMINDER, 1, None, fetch) == ("fresh",)
+    assert cache.get(AUTOCOMPLETE_KIND_REMINDER, 1) == ("fresh",)
+
+
+def test_invalidate_user_discards_builds_for_any_scope_in_flight():
+    cache = AutocompleteCache()
+
+    def build_racing_a_write():
+        cache.invalidate_user("kind", 1)
+        return ["stale"]
+
+    assert cache.get_or_build("kind", 1, "scope", build_racing_a_write) == ("stale",)
+    assert cache.get("kind", 1, "scope") is None
+    # Other users' fetches are unaffected
+    generation = cache.generation("kind", 2, "scope")
+    cache.invalidate_user("kind", 1)
+    cache.set("kind", 2, "scope", ["other"], generation=generation)
+    assert cache.get("kind", 2, "scope") == ("other",)
+
+
+def test_invalidation_record_is_bounded_and_forgets_conservatively():
+    cache = AutocompleteCache(maxsize=2)
+    generation = cache.generation("kind", 1)
+    cache.invalidate("kind", 1)
+    for user_id in range(2, 10):
+        cache.invalidate("kind", user_id)
+
+    assert len(cache._invalidated_at) == 2
+    # User 1's invalidation was forgotten, so a fetch that started before it still cannot be stored
+    cache.set("kind", 1, None, ["stale"], generation=generation)
+    assert cache.get("kind", 1) is None
+    # Fetches that started after every forgotten invalidation are stored
+    cache.set("kind", 1, None, ["fresh"], generation=cache.generation("kind", 1))
+    assert cache.get("kind", 1) == ("fresh",)
@@ -0,0 +1,81 @@
+import threading
+
+from shared.cache import TTLCache
+
+
+def test_get_counts_hits_and_misses():
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_entries_expire_after_ttl(fake_clock):
+    cache = TTLCache(maxsize=10, ttl_seconds=60, clock=fake_clock)
+    cache.set("a", 1)
+
+    fake_clock.now = 59
+    assert cache.get("a") == 1
+    fake_clock.now = 60
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_invalidate_where_drops_matching_keys():
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set((1, "x"), 1)
+    cache.set((1, "y"), 2)
+    cache.set((2, "x"), 3)
+
+    assert cache.invalidate_where(lambda key: key[0] == 1) == 2
+    assert cache.get((2, "x")) == 3
+    assert len(cache) == 1
+
+
+def test_invalidate_where_blocks_writes_from_other_threads():
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    writers = []
+
+    def predicate(key):
+        # A DB executor thread storing an entry while the event loop is still iterating
+        if not writers:
+            writer = threading.Thread(target=cache.set, args=("c", 3))
+            writers.append(writer)
+            writer.start()
+            writer.join(timeout=0.05)
+        return key == "a"
+
+    assert cache.invalidate_where(predicate) == 1
+    writers[0].join()
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_set_with_a_stale_generation_is_skipped():
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    generation = cache.generation()
+    cache.invalidate("a")
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") is None
+
+    cache.set("a", "fresh", generation=cache.generation())
+    assert cache.get("a") == "fresh"
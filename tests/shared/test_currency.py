@@ -1,8 +1,11 @@
+import asyncio
 import datetime
 import json
 from unittest.mock import MagicMock, patch
 
 import pytest
+import pytest_asyncio
+from aiohttp import web
 
 from shared import currency
 from shared.models import CurrencyRate
@@ -32,6 +35,8 @@ def add_currency_rate_to_db(base_currency=currency.BASE_CURRENCY, rates=RATES, l
 def setup_function():
     # Clear CurrencyRate table before each test
     CurrencyRate.delete().execute()
+    currency._refresh_task = None
+    currency.parsed_rates_cache.clear()
 
 
 @pytest.fixture(autouse=True)
@@ -122,3 +127,178 @@ def test_convert_mxn_to_jpy(mock_fetch):
     result = currency.convert_currency("MXN", "JPY", 10)
     assert pytest.approx(result, 0.01) == 91.18
     mock_fetch.assert_not_called()
+
+
+@pytest_asyncio.fixture
+async def stub_rates_server(monkeypatch):
+    """Local stand-in for the exchange rate API; tests tweak ``state`` to change its behaviour."""
+    state = {"requests": 0, "delay": 0.0, "data": {"result": "success", "rates": RATES}}
+
+    async def latest(request):
+        state["requests"] += 1
+        await asyncio.sleep(state["delay"])
+        return web.json_response(state["data"])
+
+    app = web.Application()
+    app.router.add_get("/v6/latest/{base}", latest)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    monkeypatch.setattr(currency, "API_URL", f"http://127.0.0.1:{port}/v6/latest/")
+    yield state
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_fetch_and_store_rates_async_stores_rates(stub_rates_server):
+    rates = await currency.fetch_and_store_rates_async()
+
+    assert rates == RATES
+    assert CurrencyRate.select().first().rates == RATES
+
+
+@pytest.mark.asyncio
+async def test_fetch_and_store_rates_async_rejects_error_result(stub_rates_server):
+    stub_rates_server["data"] = {"result": "error", "error-type": "bad-request"}
+
+    with pytest.raises(Exception, match="Failed to fetch exchange rates"):
+        await currency.fetch_and_store_rates_async()
+
+
+@pytest.mark.asyncio
+async def test_fetch_and_store_rates_async_times_out(stub_rates_server):
+    stub_rates_server["delay"] = 1.0
+
+    with pytest.raises(asyncio.TimeoutError):
+        await currency.fetch_and_store_rates_async(timeout_seconds=0.05)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cache_misses_share_one_fetch(stub_rates_server):
+    stub_rates_server["delay"] = 0.05
+
+    results = await asyncio.gather(*(currency.convert_currency_async("USD", "EUR", 10) for _ in range(5)))
+
+    assert results == [9.0] * 5
+    assert stub_rates_server["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_rates_are_served_while_refreshing_in_background(stub_rates_server):
+    stale_rates = {**RATES, "EUR": 0.5}
+    add_currency_rate_to_db(rates=stale_rates, last_updated=(FAKE_NOW - datetime.timedelta(hours=25)).replace(tzinfo=None))
+    stub_rates_server["delay"] = 0.05
+
+    assert await currency.convert_currency_async("USD", "EUR", 10) == 5.0
+    assert stub_rates_server["requests"] == 0
+
+    await currency._refresh_task
+    assert stub_rates_server["requests"] == 1
+    assert await currency.convert_currency_async("USD", "EUR", 10) == 9.0
+
+
+@pytest.mark.asyncio
+async def test_refresh_rates_if_due_async_refreshes_ahead_of_expiry(stub_rates_server):
+    add_currency_rate_to_db(last_updated=(FAKE_NOW - datetime.timedelta(hours=1)).replace(tzinfo=None))
+    assert not await currency.refresh_rates_if_due_async()
+
+    CurrencyRate.delete().execute()
+    add_currency_rate_to_db(last_updated=(FAKE_NOW - datetime.timedelta(hours=currency.REFRESH_HOURS - 0.5)).replace(tzinfo=None))
+    # Out-of-band DB writes are only noticed at the next version check.
+    currency.parsed_rates_cache.clear()
+    assert await currency.refresh_rates_if_due_async()
+    assert stub_rates_server["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_handle_currency_command_async_formats_conversion():
+    add_currency_rate_to_db()
+
+    assert await currency.handle_currency_command_async(["usd", "mxn", "10"]) == "10 USD = 170 MXN"
+    assert await currency.handle_currency_command_async(["usd"]) == currency.handle_currency_command(["usd"])
+
+
+@patch("shared.currency.fetch_and_store_rates")
+def test_parsed_rates_cache_hit_skips_db_and_json(mock_fetch):
+    add_currency_rate_to_db()
+    assert currency.convert_currency("USD", "EUR", 10) == 9.0
+
+    with (
+        patch.object(CurrencyRate, "select", side_effect=AssertionError("DB queried")),
+        patch("shared.currency.json.loads", side_effect=AssertionError("JSON parsed")),
+    ):
+        assert currency.convert_currency("USD", "MXN", 10) == 170.0
+    mock_fetch.assert_not_called()
+
+
+def test_parsed_rates_cache_reparses_only_when_row_version_changes(fake_clock):
+    cache = currency.ParsedRatesCache(version_check_seconds=60, clock=fake_clock)
+    add_currency_rate_to_db()
+
+    assert cache.load().rates == RATES
+    fake_clock.now = 61.0
+    assert cache.load().rates == RATES
+    assert cache.stats() == {"hits": 0, "version_checks": 2, "reloads": 1}
+
+    CurrencyRate.delete().execute()
+    add_currency_rate_to_db(rates={**RATES, "EUR": 0.8}, last_updated=FAKE_NOW.replace(tzinfo=None))
+    assert cache.load().rates["EUR"] == 0.9
+    fake_clock.now = 122.0
+    assert cache.load().rates["EUR"] == 0.8
+    assert cache.stats()["reloads"] == 2
+
+
+@patch("shared.currency.requests.get")
+def test_fetch_and_store_rates_updates_parsed_rates_cache(mock_get):
+    add_currency_rate_to_db(rates={**RATES, "EUR": 0.5})
+    assert currency.get_rates()["EUR"] == 0.5
+    mock_get.return_value = mock_response({"result": "success", "rates": RATES})
+
+    currency.fetch_and_store_rates()
+
+    assert currency.parsed_rates_cache.get_unchecked().rates == RATES
+
+
+def test_convert_currency_batch_one_amount_to_many_targets():
+    add_currency_rate_to_db()
+
+    conversions = currency.convert_currency_batch("USD", ["EUR", "MXN", "JPY"], [10])
+
+    assert [(c.to_currency, c.result) for c in conversions] == [("EUR", 9.0), ("MXN", 170.0), ("JPY", 1550.0)]
+    assert currency.format_conversions(conversions) == "10 USD = 9 EUR\n10 USD = 170 MXN\n10 USD = 1550 JPY"
+
+
+def test_convert_currency_batch_many_amounts_between_a_pair():
+    add_currency_rate_to_db()
+
+    conversions = currency.convert_currency_batch("MXN", ["USD"], [17, 34])
+
+    assert [(c.amount, c.result) for c in conversions] == [(17, 1.0), (34, 2.0)]
+
+
+def test_convert_currency_batch_loads_rates_once():
+    add_currency_rate_to_db()
+
+    with patch("shared.currency.get_rates", wraps=currency.get_rates) as mock_get_rates:
+        currency.convert_currency_batch("USD", ["EUR", "MXN"], [1, 2, 3])
+
+    mock_get_rates.assert_called_once()
+
+
+def test_convert_currency_batch_rejects_unsupported_and_oversized_batches():
+    add_currency_rate_to_db()
+
+    with pytest.raises(Exception, match="Currency not supported"):
+        currency.convert_currency_batch("USD", ["EUR", "GBP"], [10])
+    with pytest.raises(Exception, match="Too many conversions"):
+        currency.convert_currency_batch("USD", ["EUR"], [1.0] * (currency.MAX_BATCH_CONVERSIONS + 1))
+
+
+def test_handle_currency_command_supports_multiple_targets_and_amounts():
+    add_currency_rate_to_db()
+
+    assert currency.handle_currency_command(["usd", "eur,mxn", "10"]) == "10 USD = 9 EUR\n10 USD = 170 MXN"
+    assert currency.handle_currency_command(["usd", "eur", "10,20"]) == "10 USD = 9 EUR\n20 USD = 18 EUR"
+    assert currency.handle_currency_command(["usd", "eur,xyz", "10"]).startswith("Unknown currency")
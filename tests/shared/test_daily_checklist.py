@@ -71,6 +71,37 @@ def test_move_item():
     assert items[2].item == "Task 1"
 
 
+def test_move_item_up():
+    daily_checklist.add_item(USER_ID, "Task 1")
+    daily_checklist.add_item(USER_ID, "Task 2")
+    daily_checklist.add_item(USER_ID, "Task 3")
+    success, msg = daily_checklist.move_item(USER_ID, 3, 1)
+    assert success
+    items = daily_checklist.list_items(USER_ID)
+    assert [item.item for item in items] == ["Task 3", "Task 1", "Task 2"]
+    assert [item.sort_order for item in items] == [1, 2, 3]
+
+
+def test_move_item_query_ceiling(query_ceiling):
+    for i in range(5):
+        daily_checklist.add_item(USER_ID, f"Task {i + 1}")
+    with query_ceiling(2):
+        success, msg = daily_checklist.move_item(USER_ID, 1, 5)
+    assert success
+
+
+def test_get_checklist_for_date_query_ceiling(query_ceiling):
+    for i in range(10):
+        daily_checklist.add_item(USER_ID, f"Task {i + 1}")
+    daily_checklist.check_item(USER_ID, 2)
+    daily_checklist.check_item(USER_ID, 7)
+    current_day = daily_checklist.get_current_day()
+    # One query for the items and one for their checks, however many items there are
+    with query_ceiling(2):
+        items = daily_checklist.get_checklist_for_date(USER_ID, current_day)
+    assert [checked for _, checked in items] == [i in (1, 6) for i in range(10)]
+
+
 def test_multiple_users_isolation():
     # User 1 adds two tasks
     user1 = 10
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+from db_test_utils import wipe_table
+
+from shared.db.executor import DBExecutor
+from shared.log import ray_id_var
+from shared.models import TodoItem
+
+
+@pytest.fixture(autouse=True)
+def clear_todo_table():
+    wipe_table(TodoItem)
+
+
+@pytest.fixture
+def executor():
+    executor = DBExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_db_executor_runs_queries_off_the_event_loop_thread(executor):
+    loop_thread = threading.get_ident()
+
+    def create_and_count():
+        TodoItem.create(user_id=1, task="write tests", order_index=1)
+        return threading.get_ident(), TodoItem.select().count()
+
+    worker_thread, count = await executor.run(create_and_count)
+
+    assert worker_thread != loop_thread
+    assert count == 1
+    assert TodoItem.select().count() == 1
+
+
+@pytest.mark.asyncio
+async def test_db_executor_carries_ray_id_into_worker(executor):
+    token = ray_id_var.set("ray-123")
+    try:
+        assert await executor.run(ray_id_var.get) == "ray-123"
+    finally:
+        ray_id_var.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_db_executor_records_metrics_and_errors(executor):
+    def fail():
+        raise ValueError("boom")
+
+    await executor.run(lambda: None)
+    with pytest.raises(ValueError):
+        await executor.run(fail)
+
+    stats = executor.stats()
+    assert stats["call_count"] == 2
+    assert stats["error_count"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["max_queue_wait_seconds"] >= 0
+    assert stats["max_query_seconds"] >= 0
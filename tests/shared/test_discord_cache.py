@@ -0,0 +1,81 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from shared import discord_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_discord_caches():
+    discord_cache.user_cache.clear()
+    discord_cache.dm_channel_cache.clear()
+    discord_cache.channel_cache.clear()
+
+
+def make_client(user=None, channel=None):
+    client = MagicMock()
+    client.get_user.return_value = None
+    client.get_channel.return_value = None
+    client.fetch_user = AsyncMock(return_value=user)
+    client.fetch_channel = AsyncMock(return_value=channel)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_user_is_fetched_once_per_ttl():
+    user = MagicMock()
+    client = make_client(user=user)
+
+    assert await discord_cache.get_or_fetch_user(client, 1) is user
+    assert await discord_cache.get_or_fetch_user(client, 1) is user
+
+    client.fetch_user.assert_awaited_once_with(1)
+    assert discord_cache.user_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_gateway_cache_is_preferred_over_rest():
+    user = MagicMock()
+    client = make_client()
+    client.get_user.return_value = user
+
+    assert await discord_cache.get_or_fetch_user(client, 1) is user
+    client.fetch_user.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_dm_channel_is_created_once_and_reused():
+    dm_channel = MagicMock()
+    user = MagicMock()
+    user.dm_channel = None
+    user.create_dm = AsyncMock(return_value=dm_channel)
+    client = make_client(user=user)
+
+    assert await discord_cache.get_or_create_dm_channel(client, 1) is dm_channel
+    assert await discord_cache.get_or_create_dm_channel(client, 1) is dm_channel
+
+    user.create_dm.assert_awaited_once()
+    client.fetch_user.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_forget_user_forces_refetch():
+    user = MagicMock()
+    client = make_client(user=user)
+    await discord_cache.get_or_fetch_user(client, 1)
+
+    discord_cache.forget_user(1)
+    await discord_cache.get_or_fetch_user(client, 1)
+
+    assert client.fetch_user.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_channel_fetch_is_cached():
+    channel = MagicMock()
+    client = make_client(channel=channel)
+
+    assert await discord_cache.get_or_fetch_channel(client, 5) is channel
+    assert await discord_cache.get_or_fetch_channel(client, 5) is channel
+
+    client.fetch_channel.assert_awaited_once_with(5)
@@ -1,10 +1,13 @@
+import asyncio
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
+import discord
 import pytest
 from db_test_utils import wipe_table
 
 from shared import live_messages, time_funcs
+from shared.autocomplete import autocomplete_cache
 from shared.models import LiveMessage, WorldClock
 
 
@@ -12,6 +15,8 @@ from shared.models import LiveMessage, WorldClock
 def clear_live_message_table():
     wipe_table(LiveMessage)
     wipe_table(WorldClock)
+    time_funcs.world_clock_render_cache.clear()
+    autocomplete_cache.clear()
 
 
 def test_live_message_persists_guild_scope_and_expiry():
@@ -144,8 +149,9 @@ async def test_supersede_live_message_updates_embed_and_reason(monkeypatch):
         expires_at=datetime(2030, 1, 1, 0, 0, 0),
     )
     mock_message = AsyncMock()
-    mock_channel = AsyncMock()
-    mock_channel.fetch_message.return_value = mock_message
+    mock_channel = MagicMock()
+    mock_channel.get_partial_message.return_value = mock_message
+    mock_channel.fetch_message = AsyncMock()
 
     async def fake_get_live_message_channel(client, channel_id):
         assert channel_id == 654321
@@ -157,6 +163,8 @@ async def test_supersede_live_message_updates_embed_and_reason(monkeypatch):
 
     loaded = LiveMessage.get_by_id(live_message.id)
 
+    mock_channel.get_partial_message.assert_called_once_with(123456)
+    mock_channel.fetch_message.assert_not_awaited()
     mock_message.edit.assert_called_once()
     edited_embed = mock_message.edit.await_args.kwargs["embed"]
     assert edited_embed.fields[0].value == time_funcs.WORLD_CLOCK_SUPERSEDED_STATUS
@@ -164,6 +172,34 @@ async def test_supersede_live_message_updates_embed_and_reason(monkeypatch):
     assert loaded.stopped_at is not None
 
 
+@pytest.mark.asyncio
+async def test_supersede_conflicting_live_messages_flushes_stops_once_on_db_executor(monkeypatch):
+    conflicts = [create_world_clock_live_message(i) for i in range(1, 4)]
+    newest = create_world_clock_live_message(4)
+    flushed = []
+    original_flush = live_messages.LiveMessageWriteBatch.flush
+
+    def flush(write_batch):
+        flushed.append(sorted(write_batch.stopped))
+        return original_flush(write_batch)
+
+    async def fake_supersede_edit(client, live_message, now):
+        # Nothing may be written while the Discord edits are still in progress
+        assert LiveMessage.get_by_id(live_message.id).stopped_at is None
+
+    monkeypatch.setattr(live_messages.LiveMessageWriteBatch, "flush", flush)
+    monkeypatch.setattr(live_messages, "_mark_world_clock_live_message_superseded", fake_supersede_edit)
+
+    superseded = await live_messages.supersede_conflicting_live_messages(
+        AsyncMock(), newest, datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc)
+    )
+
+    assert [m.id for m in superseded] == [m.id for m in conflicts]
+    assert flushed == [[m.id for m in conflicts]]
+    stored = {m.id: m.stop_reason for m in LiveMessage.select()}
+    assert stored == {**{m.id: live_messages.SUPERSEDED_BY_NEW_MESSAGE_REASON for m in conflicts}, newest.id: None}
+
+
 def test_should_refresh_live_message_this_tick_uses_staggered_slots():
     live_message = LiveMessage.create(
         message_type=time_funcs.LIVE_MESSAGE_TYPE_WORLD_CLOCK,
@@ -183,3 +219,373 @@ def test_should_refresh_live_message_this_tick_uses_staggered_slots():
 
     assert live_messages.should_refresh_live_message_this_tick(live_message, matching_now)
     assert not live_messages.should_refresh_live_message_this_tick(live_message, non_matching_now)
+
+
+def create_world_clock_live_message(message_id: int, *, expires_at: datetime | None = datetime(2030, 1, 1, 0, 0, 0)) -> LiveMessage:
+    return LiveMessage.create(
+        message_type=time_funcs.LIVE_MESSAGE_TYPE_WORLD_CLOCK,
+        message_id=message_id,
+        channel_id=3000 + message_id,
+        guild_id=555,
+        user_id=111,
+        expires_at=expires_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_engine_refreshes_due_messages_concurrently(monkeypatch):
+    in_flight = 0
+    max_in_flight = 0
+    refreshed = []
+
+    async def fake_refresh(client, live_message, now):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        refreshed.append(live_message.id)
+        in_flight -= 1
+
+    monkeypatch.setattr(live_messages, "refresh_live_message", fake_refresh)
+    monkeypatch.setattr(live_messages, "should_refresh_live_message_this_tick", lambda live_message, now: True)
+    messages = [create_world_clock_live_message(i) for i in range(6)]
+    engine = live_messages.LiveMessageRefreshEngine(AsyncMock(), concurrency=3)
+
+    stats = await engine.run_tick(messages, datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc))
+
+    assert sorted(refreshed) == sorted(message.id for message in messages)
+    assert max_in_flight == 3
+    assert stats["refreshed_count"] == 6
+    assert not stats["overran"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_engine_counts_failed_refreshes_separately(monkeypatch):
+    async def fake_refresh(client, live_message, now):
+        if live_message.message_id == 1:
+            raise discord.NotFound(MagicMock(status=404), "Unknown Message")
+        if live_message.message_id == 2:
+            raise discord.HTTPException(MagicMock(status=500), "Internal Server Error")
+
+    monkeypatch.setattr(live_messages, "refresh_live_message", fake_refresh)
+    monkeypatch.setattr(live_messages, "should_refresh_live_message_this_tick", lambda live_message, now: True)
+    messages = [create_world_clock_live_message(i) for i in range(1, 5)]
+    engine = live_messages.LiveMessageRefreshEngine(AsyncMock(), concurrency=4)
+
+    stats = await engine.run_tick(messages, datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc))
+
+    assert stats["refreshed_count"] == 2
+    assert stats["failed_count"] == 2
+    assert stats["written_stop_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_engine_carries_over_messages_past_deadline(monkeypatch):
+    slow_message = create_world_clock_live_message(1)
+    fast_message = create_world_clock_live_message(2)
+    refreshed = []
+
+    async def fake_refresh(client, live_message, now):
+        if live_message.id == slow_message.id and not refreshed:
+            await asyncio.sleep(1)
+        refreshed.append(live_message.id)
+
+    monkeypatch.setattr(live_messages, "refresh_live_message", fake_refresh)
+    monkeypatch.setattr(live_messages, "should_refresh_live_message_this_tick", lambda live_message, now: live_message.id == 2)
+    engine = live_messages.LiveMessageRefreshEngine(AsyncMock(), concurrency=2, deadline_seconds=0.05)
+    now = datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc)
+
+    engine._carryover[slow_message.id] = slow_message
+    stats = await engine.run_tick([slow_message, fast_message], now)
+    assert stats["overran"]
+    assert stats["carried_over_count"] == 1
+    assert refreshed == [fast_message.id]
+
+    monkeypatch.setattr(live_messages, "should_refresh_live_message_this_tick", lambda live_message, now: False)
+    stats = await engine.run_tick([slow_message, fast_message], now)
+    assert refreshed == [fast_message.id, slow_message.id]
+    assert engine.overrun_count == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_engine_stops_expired_messages(monkeypatch):
+    expired = create_world_clock_live_message(1, expires_at=datetime(2020, 1, 1, 0, 0, 0))
+    refresh = AsyncMock()
+    monkeypatch.setattr(live_messages, "refresh_live_message", refresh)
+    engine = live_messages.LiveMessageRefreshEngine(AsyncMock(), concurrency=2)
+
+    await engine.run_tick([expired], datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc))
+
+    refresh.assert_not_awaited()
+    assert LiveMessage.get_by_id(expired.id).stop_reason == "expired"
+
+
+@pytest.mark.asyncio
+async def test_refresh_live_message_safely_stops_on_not_found(monkeypatch):
+    live_message = create_world_clock_live_message(1)
+
+    async def fake_refresh(client, live_message, now):
+        raise discord.NotFound(MagicMock(status=404), "Unknown Message")
+
+    monkeypatch.setattr(live_messages, "refresh_live_message", fake_refresh)
+
+    await live_messages.refresh_live_message_safely(AsyncMock(), live_message, datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc))
+
+    assert LiveMessage.get_by_id(live_message.id).stop_reason == "message_or_channel_not_found"
+
+
+@pytest.mark.asyncio
+async def test_unknown_channel_stops_live_message_without_refetching(monkeypatch):
+    live_message = create_world_clock_live_message(1)
+    stale_partial = AsyncMock()
+    stale_partial.edit.side_effect = discord.NotFound(MagicMock(status=404), {"code": 10003, "message": "Unknown Channel"})
+    stale_channel = MagicMock()
+    stale_channel.get_partial_message.return_value = stale_partial
+    client = MagicMock()
+    client.fetch_channel = AsyncMock()
+    forgotten = []
+
+    async def fake_get_live_message_channel(client, channel_id):
+        return stale_channel
+
+    async def edit(client, live_message, now):
+        await live_messages._edit_live_message(client, live_message, content="hi")
+
+    monkeypatch.setattr(live_messages, "_get_live_message_channel", fake_get_live_message_channel)
+    monkeypatch.setattr(live_messages, "forget_channel", forgotten.append)
+    monkeypatch.setattr(live_messages, "refresh_live_message", edit)
+
+    await live_messages.refresh_live_message_safely(client, live_message, datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc))
+
+    client.fetch_channel.assert_not_awaited()
+    assert forgotten == [live_message.channel_id]
+    assert LiveMessage.get_by_id(live_message.id).stop_reason == "message_or_channel_not_found"
+
+
+@pytest.mark.asyncio
+async def test_edit_live_message_propagates_unknown_message(monkeypatch):
+    live_message = create_world_clock_live_message(1)
+    partial = AsyncMock()
+    partial.edit.side_effect = discord.NotFound(MagicMock(status=404), {"code": 10008, "message": "Unknown Message"})
+    channel = MagicMock()
+    channel.get_partial_message.return_value = partial
+    channel.fetch_message = AsyncMock()
+
+    async def fake_get_live_message_channel(client, channel_id):
+        return channel
+
+    monkeypatch.setattr(live_messages, "_get_live_message_channel", fake_get_live_message_channel)
+
+    with pytest.raises(discord.NotFound):
+        await live_messages._edit_live_message(AsyncMock(), live_message, content="hi")
+    channel.fetch_message.assert_not_awaited()
+
+
+def test_live_message_registry_loads_active_messages_by_slot():
+    active = [create_world_clock_live_message(i) for i in range(1, 8)]
+    stopped = create_world_clock_live_message(99)
+    live_messages.stop_live_message(stopped, "test")
+    registry = live_messages.LiveMessageRegistry()
+
+    assert registry.load() == len(active)
+    assert stopped.id not in registry
+    slot_count = registry.slot_count
+    for slot in range(slot_count):
+        now = datetime.fromtimestamp(slot * live_messages.LIVE_MESSAGE_REFRESH_SLOT_SECONDS, tz=timezone.utc)
+        assert [m.id for m in registry.due_this_tick(now)] == sorted(m.id for m in active if m.id % slot_count == slot)
+
+
+def test_live_message_registry_includes_expired_messages_from_any_slot():
+    registry = live_messages.LiveMessageRegistry()
+    expired = create_world_clock_live_message(1, expires_at=datetime(2020, 1, 1, 0, 0, 0))
+    registry.add(expired)
+    other_slot = (expired.id + 1) % registry.slot_count
+    base_epoch_seconds = int(datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc).timestamp())
+    now = datetime.fromtimestamp(base_epoch_seconds + other_slot * live_messages.LIVE_MESSAGE_REFRESH_SLOT_SECONDS, tz=timezone.utc)
+
+    assert registry.due_this_tick(now) == [expired]
+
+
+def test_stop_live_message_removes_from_registry():
+    live_message = create_world_clock_live_message(1)
+    live_messages.live_message_registry.add(live_message)
+
+    live_messages.stop_live_message(live_message, "test")
+
+    assert live_message.id not in live_messages.live_message_registry
+
+
+@pytest.mark.asyncio
+async def test_refresh_engine_keeps_registry_carryover_outside_current_slot(monkeypatch):
+    registry = live_messages.LiveMessageRegistry()
+    carried = create_world_clock_live_message(1)
+    dropped = create_world_clock_live_message(2)
+    registry.add(carried)
+    refresh = AsyncMock()
+    monkeypatch.setattr(live_messages, "refresh_live_message", refresh)
+    monkeypatch.setattr(live_messages, "should_refresh_live_message_this_tick", lambda live_message, now: False)
+    engine = live_messages.LiveMessageRefreshEngine(AsyncMock(), concurrency=2, registry=registry)
+    engine._carryover = {carried.id: carried, dropped.id: dropped}
+
+    stats = await engine.run_tick([], datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc))
+
+    assert stats["refreshed_count"] == 1
+    refresh.assert_awaited_once()
+    assert refresh.await_args.args[1] is carried
+
+
+def test_live_message_write_batch_flushes_refreshes_and_stops_in_bulk():
+    refreshed = [create_world_clock_live_message(i) for i in range(1, 4)]
+    stopped = create_world_clock_live_message(10)
+    batch = live_messages.LiveMessageWriteBatch()
+    refreshed_at = datetime(2024, 2, 15, 12, 0, 0)
+    stopped_at = datetime(2024, 2, 15, 12, 0, 5)
+    for live_message in refreshed:
+        batch.record_refresh(live_message.id, refreshed_at)
+    batch.record_stop(stopped.id, stopped_at, "expired")
+
+    stats = batch.flush()
+
+    assert stats == {"refreshed_count": 3, "stopped_count": 1, "fallback": False, "failed_count": 0}
+    assert len(batch) == 0
+    for live_message in refreshed:
+        assert LiveMessage.get_by_id(live_message.id).last_refreshed_at == refreshed_at
+    stored_stop = LiveMessage.get_by_id(stopped.id)
+    assert stored_stop.stopped_at == stopped_at
+    assert stored_stop.stop_reason == "expired"
+
+
+def test_live_message_write_batch_falls_back_to_per_row_updates(monkeypatch):
+    live_message = create_world_clock_live_message(1)
+    batch = live_messages.LiveMessageWriteBatch()
+    batch.record_stop(live_message.id, datetime(2024, 2, 15, 12, 0, 0), "forbidden")
+
+    def broken_bulk_flush():
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(batch, "_flush_bulk", broken_bulk_flush)
+
+    stats = batch.flush()
+
+    assert stats["fallback"]
+    assert stats["failed_count"] == 0
+    assert LiveMessage.get_by_id(live_message.id).stop_reason == "forbidden"
+
+
+@pytest.mark.asyncio
+async def test_refresh_engine_defers_writes_until_end_of_tick(monkeypatch):
+    live_message = create_world_clock_live_message(1)
+    monkeypatch.setattr(live_messages, "should_refresh_live_message_this_tick", lambda live_message, now: True)
+    monkeypatch.setattr(time_funcs, "build_world_clock_embed", lambda *args, **kwargs: discord.Embed())
+
+    async def fake_edit(client, live_message, **fields):
+        assert LiveMessage.get_by_id(live_message.id).last_refreshed_at is None
+
+    monkeypatch.setattr(live_messages, "_edit_live_message", fake_edit)
+    engine = live_messages.LiveMessageRefreshEngine(AsyncMock(), concurrency=2)
+    now = datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc)
+
+    stats = await engine.run_tick([live_message], now)
+
+    assert stats["written_refresh_count"] == 1
+    assert LiveMessage.get_by_id(live_message.id).last_refreshed_at == now.replace(tzinfo=None)
+
+
+@pytest.mark.asyncio
+async def test_refresh_engine_defers_messages_over_channel_edit_budget(monkeypatch, fake_clock):
+    messages = [create_world_clock_live_message(i) for i in range(1, 4)]
+    for live_message in messages:
+        live_message.channel_id = 3000
+    refreshed = []
+
+    async def fake_refresh(client, live_message, now):
+        refreshed.append(live_message.id)
+
+    monkeypatch.setattr(live_messages, "refresh_live_message", fake_refresh)
+    monkeypatch.setattr(live_messages, "should_refresh_live_message_this_tick", lambda live_message, now: True)
+    engine = live_messages.LiveMessageRefreshEngine(
+        AsyncMock(), concurrency=3, channel_edits_per_second=0.2, channel_edit_burst=2, clock=fake_clock
+    )
+    now = datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc)
+
+    stats = await engine.run_tick(messages, now)
+    assert refreshed == [messages[0].id, messages[1].id]
+    assert stats["deferred_count"] == 1
+    assert stats["budget_lag_seconds"] == 0
+
+    fake_clock.now = 10.0
+    monkeypatch.setattr(live_messages, "should_refresh_live_message_this_tick", lambda live_message, now: False)
+    stats = await engine.run_tick(messages, now.replace(second=10))
+    assert refreshed[2:] == [messages[2].id]
+    assert stats["deferred_count"] == 0
+    assert stats["budget_lag_seconds"] == 10
+    assert engine.max_budget_lag_seconds == 10
+
+
+@pytest.mark.asyncio
+async def test_refresh_engine_respects_global_edit_budget(monkeypatch):
+    messages = [create_world_clock_live_message(i) for i in range(1, 6)]
+    refresh = AsyncMock()
+    monkeypatch.setattr(live_messages, "refresh_live_message", refresh)
+    monkeypatch.setattr(live_messages, "should_refresh_live_message_this_tick", lambda live_message, now: True)
+    engine = live_messages.LiveMessageRefreshEngine(AsyncMock(), concurrency=5, global_edits_per_second=0.3, clock=lambda: 0.0)
+
+    stats = await engine.run_tick(messages, datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc))
+
+    assert refresh.await_count == 3
+    assert stats["deferred_count"] == 2
+    assert stats["deferred_total"] == 2
+
+
+def test_live_message_refresh_slot_overrides_id_slot():
+    live_message = create_world_clock_live_message(1)
+    slot_count = live_messages.get_live_message_slot_count()
+    live_message.refresh_slot = (live_message.id + 1) % slot_count
+
+    assert live_messages.get_live_message_refresh_slot(live_message, slot_count) == live_message.refresh_slot
+    live_message.refresh_slot = slot_count
+    assert live_messages.get_live_message_refresh_slot(live_message, slot_count) == live_message.id % slot_count
+
+
+def test_live_message_registry_assigns_least_loaded_slot():
+    registry = live_messages.LiveMessageRegistry(slot_count=3)
+    for i in range(1, 8):
+        live_message = create_world_clock_live_message(i)
+        live_message.refresh_slot = registry.least_loaded_slot()
+        registry.add(live_message)
+
+    assert sorted(registry.stats()["slot_sizes"]) == [2, 2, 3]
+
+
+def test_live_message_registry_rebalance_evens_slots_and_persists():
+    registry = live_messages.LiveMessageRegistry(slot_count=3)
+    messages = [create_world_clock_live_message(i) for i in range(1, 10)]
+    for live_message in messages:
+        live_message.refresh_slot = 0
+        live_message.save()
+        registry.add(live_message)
+
+    moved_count = registry.rebalance(tolerance=0)
+
+    assert moved_count == 6
+    assert registry.stats()["slot_sizes"] == [3, 3, 3]
+    stored_slots = [stored.refresh_slot for stored in LiveMessage.select().order_by(LiveMessage.id)]
+    assert sorted(stored_slots) == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+    assert registry.rebalance(tolerance=0) == 0
+
+
+def test_live_message_registry_rebalance_slots_leaves_persistence_to_the_caller():
+    registry = live_messages.LiveMessageRegistry(slot_count=2)
+    messages = [create_world_clock_live_message(i) for i in range(1, 5)]
+    for live_message in messages:
+        live_message.refresh_slot = 0
+        live_message.save()
+        registry.add(live_message)
+
+    moved = registry.rebalance_slots(tolerance=0)
+
+    assert len(moved) == 2
+    assert registry.stats()["slot_sizes"] == [2, 2]
+    assert [stored.refresh_slot for stored in LiveMessage.select()] == [0, 0, 0, 0]
+    live_messages.save_live_message_refresh_slots(moved)
+    assert sorted(stored.refresh_slot for stored in LiveMessage.select()) == [0, 0, 1, 1]
@@ -0,0 +1,274 @@
+import asyncio
+import io
+import json
+import logging
+import queue
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+
+from shared import log
+from shared.config import config
+from shared.db.executor import run_db
+from shared.log import (
+    BoundedQueueHandler,
+    FormatOnceQueueListener,
+    JsonFormatter,
+    LogSampler,
+    QueryStats,
+    finish_span_trace,
+    query_stats_var,
+    ray_id_var,
+    span,
+    span_timings_var,
+    start_span_trace,
+)
+from shared.models import orm_db
+
+
+class CountingJsonFormatter(JsonFormatter):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def format(self, record):
+        self.calls += 1
+        return super().format(record)
+
+
+@pytest.fixture
+def pipeline():
+    log_queue = queue.Queue(maxsize=2)
+    queue_handler = BoundedQueueHandler(log_queue)
+    formatter = CountingJsonFormatter()
+    streams = [io.StringIO(), io.StringIO()]
+    sinks = []
+    for stream in streams:
+        sink = logging.StreamHandler(stream)
+        sink.setFormatter(logging.Formatter("%(message)s"))
+        sinks.append(sink)
+    listener = FormatOnceQueueListener(log_queue, formatter, queue_handler, *sinks)
+    test_logger = logging.getLogger("test_log_pipeline")
+    test_logger.propagate = False
+    test_logger.addHandler(queue_handler)
+    yield test_logger, queue_handler, listener, formatter, streams
+    test_logger.removeHandler(queue_handler)
+    if listener.running:
+        listener.stop()
+
+
+def read_lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_records_are_formatted_once_and_fanned_out(pipeline):
+    test_logger, _, listener, formatter, streams = pipeline
+    listener.start()
+
+    test_logger.warning({"event": "A", "value": 1})
+    listener.stop()
+
+    assert formatter.calls == 1
+    for stream in streams:
+        assert read_lines(stream) == [{"event": "A", "value": 1, "log_level": "WARNING", "time": read_lines(streams[0])[0]["time"]}]
+
+
+def test_full_queue_drops_and_reports_records(pipeline):
+    test_logger, queue_handler, listener, _, streams = pipeline
+
+    for index in range(5):
+        test_logger.warning({"event": "A", "index": index})
+    assert queue_handler.dropped == 3
+
+    listener.start()
+    listener.stop()
+
+    lines = read_lines(streams[0])
+    assert [line["event"] for line in lines] == ["A", "LOG_RECORDS_DROPPED", "A"]
+    assert lines[1]["dropped"] == 3
+    assert lines[1]["log_level"] == "WARNING"
+
+
+def test_unserializable_record_does_not_stop_the_listener(pipeline):
+    test_logger, _, listener, _, streams = pipeline
+    listener.start()
+
+    test_logger.warning({"event": "A", "when": datetime(2024, 1, 2, 3, 4, 5)})
+    test_logger.warning({"event": "B"})
+    deadline = time.monotonic() + 2
+    while listener.queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert listener.queue.unfinished_tasks == 0
+    listener.stop()
+
+    lines = read_lines(streams[0])
+    assert [line["event"] for line in lines] == ["A", "B"]
+    assert lines[0]["when"] == "2024-01-02 03:04:05"
+    assert lines[0]["format_error"] is True
+    assert "format_error" not in lines[1]
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def info_logger(monkeypatch):
+    test_logger = logging.getLogger("test_log_event_levels")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    handler = ListHandler()
+    test_logger.addHandler(handler)
+    monkeypatch.setattr(log, "logger", test_logger)
+    yield handler
+    test_logger.removeHandler(handler)
+
+
+def test_lazy_context_is_not_built_below_log_level(info_logger):
+    def build_context():
+        pytest.fail("context built for a disabled level")
+
+    log.log_event("DEBUG_EVENT", build_context, level="debug")
+
+    assert info_logger.records == []
+
+
+def test_lazy_context_is_built_when_level_enabled(info_logger):
+    log.log_event("INFO_EVENT", lambda: {"value": 1})
+    log.log_event("WARNING_EVENT", {"value": 2}, level="warning")
+
+    assert [record.msg for record in info_logger.records] == [
+        {"event": "INFO_EVENT", "value": 1, "log_level": "INFO"},
+        {"event": "WARNING_EVENT", "value": 2, "log_level": "WARNING"},
+    ]
+    assert [record.levelno for record in info_logger.records] == [logging.INFO, logging.WARNING]
+
+
+def test_sampling_keeps_rate_fraction_and_counts_drops(info_logger, monkeypatch):
+    monkeypatch.setattr(log, "log_sampler", LogSampler({"EXECUTION_TIME": 0.25}))
+
+    for _ in range(400):
+        token = ray_id_var.set(str(uuid.uuid4()))
+        log.log_event("EXECUTION_TIME", {"exec_time": 0.01})
+        ray_id_var.reset(token)
+
+    stats = log.get_log_sampling_stats()["EXECUTION_TIME"]
+    assert stats["kept"] + stats["dropped"] == 400
+    assert stats["kept"] == len(info_logger.records)
+    assert 50 < stats["kept"] < 150
+    assert all(record.msg["sample_rate"] == 0.25 for record in info_logger.records)
+
+
+def test_sampling_keeps_a_requests_events_together(info_logger, monkeypatch):
+    monkeypatch.setattr(log, "log_sampler", LogSampler({"INCOMING_INTERACTION": 0.5, "EXECUTION_TIME": 0.5}))
+
+    for _ in range(50):
+        token = ray_id_var.set(str(uuid.uuid4()))
+        log.log_event("INCOMING_INTERACTION", {})
+        log.log_event("EXECUTION_TIME", {})
+        ray_id_var.reset(token)
+
+    events = [record.msg["event"] for record in info_logger.records]
+    assert events == ["INCOMING_INTERACTION", "EXECUTION_TIME"] * (len(events) // 2)
+
+
+def test_sampling_matches_context_event_and_never_drops_warnings_or_audit_logs(info_logger, monkeypatch):
+    monkeypatch.setattr(log, "log_sampler", LogSampler({"SLASH_COMMAND_EXECUTION_TIME": 0.0, "AUDIT_LOG": 0.0}))
+
+    log.log_event("EXECUTION_TIME", {"event": "SLASH_COMMAND_EXECUTION_TIME"})
+    log.log_event("EXECUTION_TIME", {"event": "WEB_REQUEST_EXECUTION_TIME"})
+    log.log_event("EXECUTION_TIME", {"event": "SLASH_COMMAND_EXECUTION_TIME"}, level="warning")
+    log.log_event("AUDIT_LOG", {"event": "AUDIT_LOG"})
+
+    assert [(record.msg["event"], record.levelno) for record in info_logger.records] == [
+        ("WEB_REQUEST_EXECUTION_TIME", logging.INFO),
+        ("SLASH_COMMAND_EXECUTION_TIME", logging.WARNING),
+        ("AUDIT_LOG", logging.INFO),
+    ]
+    assert log.get_log_sampling_stats() == {"SLASH_COMMAND_EXECUTION_TIME": {"rate": 0.0, "kept": 0, "dropped": 1}}
+
+
+def test_config_parses_log_sample_rates(monkeypatch):
+    monkeypatch.setenv("LOG_SAMPLE_RATES", "EXECUTION_TIME=0.1, INCOMING_WEB_REQUEST=0.05,BAD=2,NO_RATE")
+
+    assert config._load_log_sample_rates() == {"EXECUTION_TIME": 0.1, "INCOMING_WEB_REQUEST": 0.05}
+
+
+@span("render")
+def render():
+    return "rendered"
+
+
+@span("discord")
+async def send():
+    await asyncio.sleep(0)
+    return "sent"
+
+
+@pytest.mark.asyncio
+async def test_spans_are_summarised_once_per_request(info_logger):
+    token = start_span_trace()
+    with span("db"):
+        pass
+    assert render() == "rendered"
+    assert await send() == "sent"
+    async with span("discord"):
+        pass
+    assert await run_db(render) == "rendered"
+    finish_span_trace(token, command="/clock list", total_seconds=0.5)
+
+    assert span_timings_var.get() is None
+    [summary] = [record.msg for record in info_logger.records]
+    assert summary["event"] == "SPAN_SUMMARY"
+    assert summary["command"] == "/clock list"
+    assert summary["total_ms"] == 500.0
+    assert {name: stats["count"] for name, stats in summary["spans"].items()} == {"db": 2, "render": 2, "discord": 2}
+
+
+def test_spans_outside_a_trace_record_nothing(info_logger):
+    with span("db"):
+        pass
+    assert render() == "rendered"
+
+    token = start_span_trace()
+    finish_span_trace(token, command="/ping", total_seconds=0.01)
+
+    assert info_logger.records == []
+
+
+@pytest.mark.asyncio
+async def test_queries_are_counted_per_trace_and_flagged_over_budget(info_logger, monkeypatch):
+    monkeypatch.setattr(config, "query_budget_per_request", 2)
+    token = start_span_trace()
+    for _ in range(2):
+        orm_db.execute_sql("SELECT 1")
+    # Statements run on the DB executor count towards the request that awaited them
+    await run_db(orm_db.execute_sql, "SELECT 1")
+    finish_span_trace(token, command="/todo list", total_seconds=0.1)
+
+    assert query_stats_var.get() is None
+    summary, warning = [record.msg for record in info_logger.records]
+    assert summary["event"] == "SPAN_SUMMARY"
+    assert summary["queries"]["count"] == 3
+    assert summary["queries"]["slowest_sql"] == "SELECT 1"
+    assert warning["event"] == "QUERY_BUDGET_EXCEEDED"
+    assert warning["budget"] == 2
+
+
+def test_query_stats_keeps_statements_only_when_asked():
+    stats = QueryStats()
+    stats.record("SELECT 1", 0.002)
+    stats.record("SELECT 2", 0.001)
+    assert stats.statements is None
+    assert stats.summary() == {"count": 2, "ms": 3.0, "slowest_ms": 2.0, "slowest_sql": "SELECT 1"}
+
+    stats = QueryStats(keep_statements=True)
+    stats.record("SELECT 1", 0.0)
+    assert stats.statements == ["SELECT 1"]
@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import pytest
+
+from shared.log import command_var, ray_id_var
+from shared.loop_monitor import LoopLagMonitor, SlowCallbackDetector
+
+
+@pytest.mark.asyncio
+async def test_lag_monitor_records_blocking_work():
+    monitor = LoopLagMonitor(0.01)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    time.sleep(0.1)  # Block the loop the way a synchronous DB call would.
+    await asyncio.sleep(0.05)
+    monitor.stop()
+
+    stats = monitor.stats(reset_window=True)
+    assert stats["samples"] >= 3
+    assert stats["max_seconds"] >= 0.08
+    assert stats["window_max_seconds"] == stats["max_seconds"]
+    assert monitor.stats()["window_max_seconds"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_slow_callback_detector_records_ray_id_and_command():
+    detector = SlowCallbackDetector(0.05)
+
+    async def slow_command():
+        ray_id_var.set("ray-1")
+        command_var.set("/clock list")
+        await asyncio.sleep(0)
+        time.sleep(0.06)
+
+    async def fast_command():
+        await asyncio.sleep(0)
+
+    detector.install()
+    try:
+        await asyncio.gather(asyncio.create_task(slow_command(), name="slow"), fast_command())
+    finally:
+        detector.uninstall()
+
+    assert detector.slow_count == 1
+    slow_callback = detector.stats()["recent"][0]
+    assert slow_callback["ray_id"] == "ray-1"
+    assert slow_callback["command"] == "/clock list"
+    assert slow_callback["duration_seconds"] >= 0.05
+    assert "slow" in slow_callback["callback"]
+
+
+def test_install_is_idempotent_and_uninstall_restores_handle_run():
+    original_run = asyncio.Handle._run
+    detector = SlowCallbackDetector(0.05)
+
+    detector.install()
+    patched_run = asyncio.Handle._run
+    detector.install()
+    assert asyncio.Handle._run is patched_run
+    detector.uninstall()
+
+    assert asyncio.Handle._run is original_run
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from shared.metrics import (
+    LatencyHistogram,
+    MetricsRegistry,
+    format_latency_table,
+    metrics,
+)
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_histogram_percentiles_stay_within_bucket_error():
+    histogram = LatencyHistogram()
+    rng = random.Random(1)
+    samples = sorted(rng.lognormvariate(-4, 1) for _ in range(10_000))
+    for sample in samples:
+        histogram.record(sample)
+
+    for quantile in (0.5, 0.95, 0.99):
+        exact = samples[int(quantile * len(samples)) - 1]
+        assert histogram.percentile(quantile) == pytest.approx(exact, rel=0.07)
+    assert histogram.count == len(samples)
+    assert histogram.sum == pytest.approx(sum(samples))
+    assert histogram.percentile(1.0) == max(samples)
+
+
+def test_histogram_is_exact_for_small_values():
+    histogram = LatencyHistogram()
+    for micros in (1, 2, 3, 30):
+        histogram.record(micros / 1_000_000)
+
+    assert histogram.percentile(0.5) == pytest.approx(2e-6)
+    assert histogram.percentile(0.99) == pytest.approx(30e-6)
+
+
+def test_render_prometheus_exposes_counters_summaries_and_callbacks(registry):
+    registry.describe("command_latency_seconds", "Command latency.")
+    registry.inc("command_errors_total", {"command": "/clock add"})
+    registry.inc("command_errors_total", {"command": "/clock add"})
+    registry.observe("command_latency_seconds", 0.25, {"command": '/say "hi"'})
+    registry.register_callback("reminders_pending", "gauge", lambda: 3)
+    registry.register_callback("cache_hits_total", "counter", lambda: {(("cache", "a"),): 5})
+    registry.register_callback("cache_hits_total", "counter", lambda: 1 / 0)
+
+    text = registry.render_prometheus()
+
+    assert '# TYPE command_errors_total counter\ncommand_errors_total{command="/clock add"} 2\n' in text
+    assert "# HELP command_latency_seconds Command latency.\n# TYPE command_latency_seconds summary\n" in text
+    assert 'command_latency_seconds{command="/say \\"hi\\"",quantile="0.99"} 0.25' in text
+    assert 'command_latency_seconds_count{command="/say \\"hi\\""} 1' in text
+    assert "# TYPE reminders_pending gauge\nreminders_pending 3\n" in text
+    assert 'cache_hits_total{cache="a"} 5' in text
+
+
+def test_latency_table_lists_busiest_commands_first(monkeypatch, registry):
+    monkeypatch.setattr("shared.metrics.metrics", registry)
+    for _ in range(3):
+        registry.observe("command_latency_seconds", 0.010, {"command": "/clock list"})
+    registry.observe("command_latency_seconds", 0.200, {"command": "!currency"})
+
+    table = format_latency_table()
+
+    lines = table.strip("`\n").splitlines()
+    assert lines[0].split() == ["command", "count", "p50", "ms", "p95", "ms", "p99", "ms"]
+    assert lines[1].split()[:2] == ["/clock", "list"] and lines[1].split()[2] == "3"
+    assert lines[2].split()[:2] == ["!currency", "1"]
+
+
+def test_latency_table_is_cut_to_fit_a_message(monkeypatch, registry):
+    monkeypatch.setattr("shared.metrics.metrics", registry)
+    for index in range(200):
+        registry.observe("command_latency_seconds", 0.01, {"command": f"/command_{index}"})
+
+    assert len(format_latency_table(max_length=500)) <= 500
+
+
+def test_module_registry_has_log_queue_callbacks():
+    assert "# TYPE log_records_dropped_total counter" in metrics.render_prometheus()
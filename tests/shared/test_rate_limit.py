@@ -0,0 +1,58 @@
+import pytest
+
+from shared.rate_limit import TokenBucket, TokenBucketRegistry
+
+
+def test_token_bucket_allows_burst_then_refills(fake_clock):
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=fake_clock)
+
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.time_until_available() == pytest.approx(1.0)
+
+    fake_clock.now = 1.0
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_token_bucket_never_exceeds_capacity(fake_clock):
+    bucket = TokenBucket(rate=5.0, capacity=3, clock=fake_clock)
+    fake_clock.now = 100.0
+
+    assert bucket.tokens == 3
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_acquire_waits_for_refill():
+    bucket = TokenBucket(rate=100.0, capacity=1)
+    assert await bucket.acquire() == 0.0
+
+    waited = await bucket.acquire()
+
+    assert waited > 0
+
+
+def test_registry_keeps_buckets_independent_and_bounded(fake_clock):
+    registry = TokenBucketRegistry(rate=1.0, capacity=1, max_buckets=2, clock=fake_clock)
+
+    assert registry.try_acquire("a")
+    assert not registry.try_acquire("a")
+    assert registry.try_acquire("b")
+    assert registry.try_acquire("c")
+
+    assert len(registry) == 2
+    # "a" was evicted as least recently used, so it starts with a full bucket again.
+    assert registry.try_acquire("a")
+
+
+def test_token_bucket_refund_returns_tokens_up_to_capacity(fake_clock):
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=fake_clock)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+
+    bucket.refund()
+    assert bucket.try_acquire()
+
+    bucket.refund(5)
+    assert bucket.tokens == 2
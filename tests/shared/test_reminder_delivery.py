@@ -0,0 +1,367 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from db_test_utils import wipe_table
+
+from shared.models import Reminder
+from shared.reminder import (
+    ReminderDeliveryPipeline,
+    build_coalesced_reminder_messages,
+    delete_delivered_reminders,
+    get_reminder_delivery_bucket,
+    reload_due_reminders,
+)
+
+
+def make_reminder(reminder_id: int, channel_id: int = 300, *, is_private: bool = False, user_id: int = 100) -> Reminder:
+    return Reminder(
+        id=reminder_id,
+        user_id=user_id,
+        guild_id=None if is_private else 200,
+        channel_id=channel_id,
+        message=f"Reminder {reminder_id}",
+        is_private=is_private,
+        remind_at=datetime.now() - timedelta(seconds=1),
+    )
+
+
+def test_delivery_bucket_uses_channel_or_dm_recipient():
+    assert get_reminder_delivery_bucket(make_reminder(1, channel_id=300)) == ("channel", 300)
+    assert get_reminder_delivery_bucket(make_reminder(2, channel_id=300, is_private=True, user_id=7)) == ("dm", 7)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_delivers_channels_concurrently_and_in_order_per_channel():
+    delivered = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def deliver(reminder):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        delivered.append(reminder.id)
+        in_flight -= 1
+        return True
+
+    pipeline = ReminderDeliveryPipeline(deliver, width=4, bucket_capacity=10)
+    pipeline.start()
+    try:
+        reminders = [make_reminder(i, channel_id=300 + i % 3) for i in range(9)]
+        assert pipeline.submit(reminders) == 3
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+    finally:
+        await pipeline.stop()
+
+    assert sorted(delivered) == list(range(9))
+    assert max_in_flight == 3
+    assert [i for i in delivered if i % 3 == 0] == [0, 3, 6]
+    stats = pipeline.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["delivered_count"] == 9
+    assert stats["max_lag_seconds"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_width_bounds_concurrency():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def deliver(reminder):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return True
+
+    pipeline = ReminderDeliveryPipeline(deliver, width=2)
+    pipeline.start()
+    try:
+        pipeline.submit([make_reminder(i, channel_id=i) for i in range(6)])
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+    finally:
+        await pipeline.stop()
+
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_rate_limits_each_bucket():
+    sent_at = []
+
+    async def deliver(reminder):
+        sent_at.append(asyncio.get_running_loop().time())
+        return True
+
+    pipeline = ReminderDeliveryPipeline(deliver, width=2, bucket_rate=20.0, bucket_capacity=1)
+    pipeline.start()
+    try:
+        pipeline.submit([make_reminder(i, channel_id=300) for i in range(3)])
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+    finally:
+        await pipeline.stop()
+
+    assert sent_at[2] - sent_at[0] >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_pipeline_counts_failures_and_survives_errors():
+    async def deliver(reminder):
+        if reminder.id == 1:
+            raise RuntimeError("boom")
+        return reminder.id != 2
+
+    pipeline = ReminderDeliveryPipeline(deliver, width=1)
+    pipeline.start()
+    try:
+        pipeline.submit([make_reminder(i, channel_id=i) for i in range(1, 4)])
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+    finally:
+        await pipeline.stop()
+
+    assert pipeline.stats()["delivered_count"] == 1
+    assert pipeline.stats()["failed_count"] == 2
+
+
+def test_coalesced_messages_preserve_mentions():
+    reminders = [make_reminder(1, user_id=11), make_reminder(2, user_id=22)]
+
+    messages = build_coalesced_reminder_messages(reminders, is_dm=False)
+
+    assert len(messages) == 1
+    content, chunk = messages[0]
+    assert content == "⏰ Reminders:\n- <@11>: Reminder 1\n- <@22>: Reminder 2"
+    assert chunk == reminders
+
+
+def test_coalesced_messages_split_at_character_limit():
+    reminders = [make_reminder(i) for i in range(50)]
+
+    messages = build_coalesced_reminder_messages(reminders, is_dm=True, limit=100)
+
+    assert all(len(content) <= 100 for content, _ in messages)
+    assert [r.id for _, chunk in messages for r in chunk] == list(range(50))
+    assert len(messages) > 1
+
+
+def test_delete_delivered_reminders_removes_rows_together():
+    wipe_table(Reminder)
+    reminders = [
+        Reminder.create(user_id=100, guild_id=200, channel_id=300, message=f"r{i}", remind_at=datetime(2030, 1, 1)) for i in range(3)
+    ]
+
+    assert delete_delivered_reminders(reminders[:2]) == 2
+    assert [r.id for r in Reminder.select()] == [reminders[2].id]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_coalesces_reminders_per_bucket():
+    single = []
+    coalesced = []
+
+    async def deliver(reminder):
+        single.append(reminder.id)
+        return True
+
+    async def deliver_coalesced(reminders, content):
+        coalesced.append(([r.id for r in reminders], content))
+        return True
+
+    pipeline = ReminderDeliveryPipeline(deliver, width=2, deliver_coalesced=deliver_coalesced)
+    pipeline.start()
+    try:
+        pipeline.submit([make_reminder(1, channel_id=300), make_reminder(2, channel_id=300), make_reminder(3, channel_id=400)])
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+    finally:
+        await pipeline.stop()
+
+    assert single == [3]
+    assert [ids for ids, _ in coalesced] == [[1, 2]]
+    assert pipeline.stats()["delivered_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sends_uncoalescable_reminders_one_by_one_under_the_rate_limits():
+    single = []
+
+    async def deliver(reminder):
+        single.append(reminder.id)
+        return True
+
+    async def deliver_coalesced(reminders, content):
+        return None
+
+    pipeline = ReminderDeliveryPipeline(
+        deliver,
+        width=1,
+        deliver_coalesced=deliver_coalesced,
+        bucket_rate=0.001,
+        bucket_capacity=10,
+        global_rate=0.001,
+        global_capacity=10,
+    )
+    pipeline.start()
+    try:
+        pipeline.submit([make_reminder(i, channel_id=300) for i in range(1, 4)])
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+    finally:
+        await pipeline.stop()
+
+    assert single == [1, 2, 3]
+    # The coalesced attempt sent nothing, so its token was refunded; one token per reminder
+    assert int(pipeline._buckets.get(("channel", 300)).tokens) == 7
+    assert int(pipeline._global_bucket.tokens) == 7
+    assert pipeline.stats()["delivered_count"] == 3
+    assert pipeline.stats()["queue_depth"] == 0
+
+
+def test_reload_due_reminders_drops_deleted_and_rescheduled_reminders():
+    wipe_table(Reminder)
+    now = datetime.now()
+    reminders = [
+        Reminder.create(user_id=100, channel_id=300, message=f"Reminder {i}", remind_at=now - timedelta(seconds=1)) for i in range(4)
+    ]
+    reminders[0].delete_instance()
+    Reminder.update(remind_at=now + timedelta(hours=1)).where(Reminder.id == reminders[1].id).execute()
+    Reminder.update(message="Edited").where(Reminder.id == reminders[3].id).execute()
+
+    current = reload_due_reminders([r.id for r in reversed(reminders)], now)
+
+    assert [(r.id, r.message) for r in current] == [(reminders[3].id, "Edited"), (reminders[2].id, "Reminder 2")]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sends_current_content_and_skips_reminders_gone_since_popped():
+    single = []
+    coalesced = []
+    popped = [
+        make_reminder(1, channel_id=300),
+        make_reminder(2, channel_id=300),
+        make_reminder(4, channel_id=300),
+        make_reminder(3, is_private=True),
+    ]
+    edited = Reminder(**{**popped[0].__data__, "message": "Edited"})
+    reloads = []
+
+    async def reload(reminders):
+        # Reminder 2 was deleted and reminder 1 edited after they were popped; reminder 3 (its own DM) was deleted.
+        reloads.append([r.id for r in reminders])
+        current = {1: edited, 4: popped[2]}
+        return [current[r.id] for r in reminders if r.id in current]
+
+    async def deliver(reminder):
+        single.append(reminder.id)
+        return True
+
+    async def deliver_coalesced(reminders, content):
+        coalesced.append(content)
+        return True
+
+    pipeline = ReminderDeliveryPipeline(deliver, width=1, deliver_coalesced=deliver_coalesced, reload=reload)
+    pipeline.start()
+    try:
+        pipeline.submit(
+            [
+                make_reminder(1, channel_id=300),
+                make_reminder(2, channel_id=300),
+                make_reminder(4, channel_id=300),
+                make_reminder(3, is_private=True),
+            ]
+        )
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+    finally:
+        await pipeline.stop()
+
+    assert single == []
+    # The coalesced message rebuilt from the reloaded rows is sent without reading them again
+    assert sorted(reloads) == [[1, 2, 4], [3]]
+    assert len(coalesced) == 1
+    assert "Edited" in coalesced[0] and "Reminder 2" not in coalesced[0]
+    stats = pipeline.stats()
+    assert (stats["delivered_count"], stats["failed_count"], stats["skipped_count"], stats["queue_depth"]) == (2, 0, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_coalesced_send_whose_reminders_are_all_gone():
+    coalesced = []
+
+    async def reload(reminders):
+        return [] if reminders[0].id in (1, 2) else reminders
+
+    async def deliver(reminder):
+        return True
+
+    async def deliver_coalesced(reminders, content):
+        coalesced.append([r.id for r in reminders])
+        return True
+
+    pipeline = ReminderDeliveryPipeline(deliver, width=1, deliver_coalesced=deliver_coalesced, reload=reload)
+    pipeline.start()
+    try:
+        pipeline.submit([make_reminder(1, channel_id=300), make_reminder(2, channel_id=300)])
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+        # The worker is still alive for later reminders
+        pipeline.submit([make_reminder(3, channel_id=300), make_reminder(4, channel_id=300)])
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+    finally:
+        await pipeline.stop()
+
+    assert coalesced == [[3, 4]]
+    stats = pipeline.stats()
+    assert (stats["delivered_count"], stats["skipped_count"], stats["queue_depth"]) == (2, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_worker_survives_a_failing_group():
+    delivered = []
+
+    async def reload(reminders):
+        if reminders[0].id == 1:
+            raise RuntimeError("db down")
+        return reminders
+
+    async def deliver(reminder):
+        delivered.append(reminder.id)
+        return True
+
+    pipeline = ReminderDeliveryPipeline(deliver, width=1, reload=reload)
+    pipeline.start()
+    try:
+        pipeline.submit([make_reminder(1, channel_id=300)])
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+        pipeline.submit([make_reminder(2, channel_id=300)])
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+    finally:
+        await pipeline.stop()
+
+    assert delivered == [2]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_refunds_tokens_taken_for_a_send_that_changed_on_reload():
+    popped = [make_reminder(1, channel_id=300), make_reminder(2, channel_id=300)]
+    edited = Reminder(**{**popped[0].__data__, "message": "Edited"})
+
+    async def reload(reminders):
+        return [edited if r.id == 1 else r for r in reminders]
+
+    async def deliver(reminder):
+        return True
+
+    pipeline = ReminderDeliveryPipeline(
+        deliver, width=1, reload=reload, bucket_rate=0.001, bucket_capacity=10, global_rate=0.001, global_capacity=10
+    )
+    pipeline.start()
+    try:
+        pipeline.submit(popped)
+        await asyncio.wait_for(pipeline.join(), timeout=2)
+    finally:
+        await pipeline.stop()
+
+    # Two messages sent, two tokens spent, although reminder 1 was planned twice
+    assert int(pipeline._buckets.get(("channel", 300)).tokens) == 8
+    assert int(pipeline._global_bucket.tokens) == 8
+    assert pipeline.stats()["delivered_count"] == 2
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+from db_test_utils import wipe_table
+
+from shared.models import Reminder, ReminderDeadLetter
+from shared.reminder import (
+    REMINDER_RETRY_BASE_SECONDS,
+    REMINDER_RETRY_MAX_SECONDS,
+    ReminderScheduler,
+    get_reminder_retry_delay_seconds,
+    record_reminder_delivery_failure,
+    schedule_reminder_retry,
+)
+
+NOW = datetime(2030, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def clear_reminder_tables():
+    wipe_table(Reminder)
+    wipe_table(ReminderDeadLetter)
+
+
+def create_reminder() -> Reminder:
+    return Reminder.create(user_id=100, guild_id=200, channel_id=300, message="Stand up", remind_at=NOW - timedelta(minutes=1))
+
+
+def test_retry_delay_backs_off_exponentially_and_caps():
+    assert get_reminder_retry_delay_seconds(1) == REMINDER_RETRY_BASE_SECONDS
+    assert get_reminder_retry_delay_seconds(2) == REMINDER_RETRY_BASE_SECONDS * 2
+    assert get_reminder_retry_delay_seconds(3) == REMINDER_RETRY_BASE_SECONDS * 4
+    assert get_reminder_retry_delay_seconds(30) == REMINDER_RETRY_MAX_SECONDS
+
+
+def test_failure_records_attempt_and_next_attempt_at():
+    reminder = create_reminder()
+
+    next_attempt_at = record_reminder_delivery_failure(reminder, "Forbidden", "DMs disabled", now=NOW, max_attempts=3)
+
+    assert next_attempt_at == NOW + timedelta(seconds=REMINDER_RETRY_BASE_SECONDS)
+    loaded = Reminder.get_by_id(reminder.id)
+    assert loaded.attempt_count == 1
+    assert loaded.next_attempt_at == next_attempt_at
+
+
+def test_failure_moves_reminder_to_dead_letter_after_max_attempts():
+    reminder = create_reminder()
+
+    assert record_reminder_delivery_failure(reminder, "NotFound", "gone", now=NOW, max_attempts=2) is not None
+    assert record_reminder_delivery_failure(reminder, "NotFound", "gone", now=NOW, max_attempts=2) is None
+
+    assert Reminder.get_or_none(Reminder.id == reminder.id) is None
+    dead_letter = ReminderDeadLetter.get(ReminderDeadLetter.reminder_id == reminder.id)
+    assert dead_letter.attempt_count == 2
+    assert dead_letter.message == "Stand up"
+    assert dead_letter.channel_id == 300
+    assert dead_letter.last_error_type == "NotFound"
+
+
+def test_scheduler_load_uses_next_attempt_at_for_backed_off_reminders():
+    reminder = create_reminder()
+    next_attempt_at = record_reminder_delivery_failure(reminder, "HTTPException", "503", now=NOW, max_attempts=5)
+    scheduler = ReminderScheduler()
+    scheduler.load()
+
+    assert scheduler.pop_due(NOW) == []
+    assert scheduler.pop_due(next_attempt_at) == [reminder.id]
+
+
+@pytest.mark.asyncio
+async def test_schedule_retry_reschedules_even_when_recording_the_failure_fails(monkeypatch):
+    reminder = create_reminder()
+    scheduler = ReminderScheduler()
+
+    def fail(*args):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr("shared.reminder.record_reminder_delivery_failure", fail)
+    before = datetime.now()
+    await schedule_reminder_retry(reminder, "HTTPException", "503", scheduler=scheduler)
+
+    assert reminder.id in scheduler
+    assert scheduler.next_due_at() >= before + timedelta(seconds=REMINDER_RETRY_BASE_SECONDS)
+
+
+@pytest.mark.asyncio
+async def test_schedule_retry_uses_the_recorded_next_attempt():
+    reminder = create_reminder()
+    scheduler = ReminderScheduler()
+
+    await schedule_reminder_retry(reminder, "HTTPException", "503", scheduler=scheduler)
+
+    assert scheduler.next_due_at() == reminder.next_attempt_at
+    assert Reminder.get_by_id(reminder.id).attempt_count == 1
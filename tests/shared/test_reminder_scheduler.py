@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from db_test_utils import wipe_table
+
+from shared.models import Reminder
+from shared.reminder import ReminderScheduler
+
+NOW = datetime(2030, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def clear_reminder_table():
+    wipe_table(Reminder)
+
+
+def create_reminder(remind_at: datetime, message: str = "Reminder") -> Reminder:
+    return Reminder.create(user_id=100, guild_id=200, channel_id=300, message=message, remind_at=remind_at)
+
+
+def test_load_reads_pending_reminders_from_db():
+    first = create_reminder(NOW + timedelta(minutes=5))
+    second = create_reminder(NOW - timedelta(minutes=5))
+    scheduler = ReminderScheduler()
+
+    assert scheduler.load() == 2
+    assert len(scheduler) == 2
+    assert scheduler.next_due_at() == second.remind_at
+    assert scheduler.pop_due(NOW) == [second.id]
+    assert first.id in scheduler
+
+
+def test_pop_due_returns_due_reminders_in_order():
+    scheduler = ReminderScheduler()
+    scheduler.schedule(1, NOW + timedelta(seconds=2))
+    scheduler.schedule(2, NOW - timedelta(seconds=1))
+    scheduler.schedule(3, NOW + timedelta(hours=1))
+
+    assert scheduler.pop_due(NOW + timedelta(seconds=2)) == [2, 1]
+    assert scheduler.pop_due(NOW + timedelta(seconds=2)) == []
+    assert len(scheduler) == 1
+
+
+def test_reschedule_replaces_previous_due_time():
+    scheduler = ReminderScheduler()
+    scheduler.schedule(1, NOW)
+    scheduler.schedule(1, NOW + timedelta(hours=1))
+
+    assert scheduler.pop_due(NOW) == []
+    assert scheduler.next_due_at() == NOW + timedelta(hours=1)
+    assert scheduler.pop_due(NOW + timedelta(hours=1)) == [1]
+
+
+def test_unschedule_drops_reminder():
+    scheduler = ReminderScheduler()
+    scheduler.schedule(1, NOW)
+    scheduler.unschedule(1)
+
+    assert scheduler.next_due_at() is None
+    assert scheduler.pop_due(NOW) == []
+
+
+@pytest.mark.asyncio
+async def test_wait_until_due_wakes_for_earlier_reminder():
+    scheduler = ReminderScheduler()
+    scheduler.schedule(1, datetime.now() + timedelta(hours=1))
+    waiter = asyncio.create_task(scheduler.wait_until_due())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    scheduler.schedule(2, datetime.now() + timedelta(milliseconds=50))
+    await asyncio.wait_for(waiter, timeout=1)
+
+    assert scheduler.pop_due(datetime.now()) == [2]
@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 
 import pytest
 
+from shared.autocomplete import autocomplete_cache
 from shared.time_funcs import (
     InvalidInputError,
     WorldClock,
@@ -11,6 +12,8 @@ from shared.time_funcs import (
     format_tzs_response_str,
     get_live_message_expiry,
     get_live_message_expiry_for_duration,
+    get_rendered_world_clocks,
+    get_scope_timezone_strs,
     get_valid_timezone,
     get_world_clock_duration_labels,
     get_world_clock_local_time,
@@ -18,6 +21,7 @@ from shared.time_funcs import (
     remove_timezone,
     sort_world_clocks_by_display_time,
     update_timezone,
+    world_clock_render_cache,
 )
 
 
@@ -25,6 +29,8 @@ from shared.time_funcs import (
 def setup_function():
     # Clear WorldClock table before each test
     WorldClock.delete().execute()
+    world_clock_render_cache.clear()
+    autocomplete_cache.clear()
 
 
 GUILD_ID = 1
@@ -307,3 +313,76 @@ def test_get_world_clock_local_time_uses_reference_time():
 
     assert local_time.tzinfo is not None
     assert format_time(local_time) == "Thursday February 15 12:00 PM"
+
+
+def test_build_world_clock_embed_renders_scope_once_per_minute(monkeypatch):
+    add_timezone(GUILD_ID, None, "America/Denver")
+    add_timezone(GUILD_ID, None, "Asia/Tokyo")
+    calls = []
+    original_list_timezones = list_timezones
+
+    def counting_list_timezones(guild_id, user_id=None):
+        calls.append((guild_id, user_id))
+        return original_list_timezones(guild_id, user_id)
+
+    monkeypatch.setattr("shared.time_funcs.list_timezones", counting_list_timezones)
+    first = build_world_clock_embed(GUILD_ID, None, now=datetime(2024, 2, 15, 12, 0, 5, tzinfo=timezone.utc))
+    second = build_world_clock_embed(GUILD_ID, None, now=datetime(2024, 2, 15, 12, 0, 55, tzinfo=timezone.utc))
+    build_world_clock_embed(GUILD_ID, None, now=datetime(2024, 2, 15, 12, 1, 0, tzinfo=timezone.utc))
+
+    assert first.description == second.description
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda: add_timezone(GUILD_ID, None, "Europe/London"),
+        lambda: remove_timezone(GUILD_ID, None, "America/Denver"),
+        lambda: update_timezone(GUILD_ID, None, "America/Denver", "Office"),
+    ],
+)
+def test_world_clock_render_cache_invalidated_by_writes(mutate):
+    reference_now = datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc)
+    add_timezone(GUILD_ID, None, "America/Denver")
+    add_timezone(None, USER_ID, "Asia/Tokyo")
+    before = build_world_clock_embed(GUILD_ID, None, now=reference_now).description
+    build_world_clock_embed(None, USER_ID, now=reference_now)
+
+    mutate()
+
+    assert build_world_clock_embed(GUILD_ID, None, now=reference_now).description != before
+    # The DM scope's render survives the guild write.
+    assert len(world_clock_render_cache) == 2
+
+
+def test_render_racing_a_write_is_not_cached(monkeypatch):
+    reference_now = datetime(2024, 2, 15, 12, 0, tzinfo=timezone.utc)
+    add_timezone(GUILD_ID, None, "America/Denver")
+    original_list_timezones = list_timezones
+
+    def list_timezones_racing_a_write(guild_id, user_id=None):
+        tzs = list(original_list_timezones(guild_id, user_id))
+        add_timezone(GUILD_ID, None, "Asia/Tokyo")
+        return tzs
+
+    monkeypatch.setattr("shared.time_funcs.list_timezones", list_timezones_racing_a_write)
+    assert len(get_rendered_world_clocks(GUILD_ID, None, now=reference_now)) == 1
+    monkeypatch.setattr("shared.time_funcs.list_timezones", original_list_timezones)
+
+    assert len(world_clock_render_cache) == 0
+    assert len(get_rendered_world_clocks(GUILD_ID, None, now=reference_now)) == 2
+
+
+def test_get_scope_timezone_strs_is_cached_until_scope_changes(monkeypatch):
+    add_timezone(GUILD_ID, None, "America/Denver")
+    assert get_scope_timezone_strs(GUILD_ID, None) == ("America/Denver",)
+
+    monkeypatch.setattr("shared.time_funcs.list_timezones", lambda *args: pytest.fail("list_timezones called on a cache hit"))
+    assert get_scope_timezone_strs(GUILD_ID, None) == ("America/Denver",)
+    monkeypatch.undo()
+
+    add_timezone(GUILD_ID, None, "Asia/Tokyo")
+    assert get_scope_timezone_strs(GUILD_ID, None) == ("America/Denver", "Asia/Tokyo")
+    remove_timezone(GUILD_ID, None, "America/Denver")
+    assert get_scope_timezone_strs(GUILD_ID, None) == ("Asia/Tokyo",)
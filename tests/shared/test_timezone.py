@@ -0,0 +1,57 @@
+import time
+
+import pytest
+from pytz import all_timezones
+
+from shared.errors import InvalidInputError
+from shared.timezone import TimezoneIndex, get_valid_timezone, timezone_index
+
+
+def test_get_valid_timezone_resolves_exact_and_case_insensitive_names():
+    assert get_valid_timezone("Asia/Tokyo") == "Asia/Tokyo"
+    assert get_valid_timezone("  asia/TOKYO ") == "Asia/Tokyo"
+    with pytest.raises(InvalidInputError):
+        get_valid_timezone("Mars/Olympus_Mons")
+
+
+def test_search_prefers_full_name_prefixes():
+    results = timezone_index.search("america/new")
+
+    assert results[0] == "America/New_York"
+    assert all(zone.lower().startswith("america/new") for zone in results)
+
+
+def test_search_matches_city_names_and_words():
+    assert timezone_index.search("tokyo")[0] == "Asia/Tokyo"
+    assert "America/New_York" in timezone_index.search("new york")
+    assert "America/New_York" in timezone_index.search("york")
+    assert "America/Argentina/Buenos_Aires" in timezone_index.search("buenos")
+
+
+def test_search_falls_back_to_substring_matches():
+    assert "America/Los_Angeles" in timezone_index.search("angel")
+    assert "America/Los_Angeles" in timezone_index.search("s_ange")
+
+
+def test_search_excludes_existing_and_respects_limit():
+    results = timezone_index.search("", limit=5, exclude={all_timezones[0]})
+
+    assert results == list(all_timezones[1:6])
+    assert len(timezone_index.search("a", limit=25)) == 25
+
+
+def test_search_still_fills_page_when_trie_matches_are_excluded():
+    index = TimezoneIndex(["Europe/A", "Europe/B", "Europe/C", "Europe/D"], matches_per_node=2)
+
+    assert index.search("europe/", limit=2, exclude={"Europe/A", "Europe/B"}) == ["Europe/C", "Europe/D"]
+
+
+def test_search_is_fast_enough_for_autocomplete():
+    queries = ["", "a", "am", "america/", "tokyo", "new york", "angel", "zzz"]
+    start_time = time.perf_counter()
+    for _ in range(100):
+        for query in queries:
+            timezone_index.search(query)
+    per_query_seconds = (time.perf_counter() - start_time) / (100 * len(queries))
+
+    assert per_query_seconds < 0.001
@@ -91,6 +91,18 @@ def test_move_task_up():
     assert [task.order_index for task in tasks] == [1, 2, 3]
 
 
+def test_move_task_query_ceiling(query_ceiling):
+    for i in range(5):
+        todo.add_task(USER_ID, f"Task {i + 1}", guild_id=GUILD_ID_1)
+
+    with query_ceiling(2):
+        todo.move_task(USER_ID, 2, 4, GUILD_ID_1)
+
+    tasks = todo.list_tasks(USER_ID, GUILD_ID_1)
+    assert [task.task for task in tasks] == ["Task 1", "Task 3", "Task 4", "Task 2", "Task 5"]
+    assert [task.order_index for task in tasks] == [1, 2, 3, 4, 5]
+
+
 def test_move_task_same_position():
     todo.add_task(USER_ID, "Task 1", guild_id=GUILD_ID_1)
 
@@ -0,0 +1,63 @@
+import pytest
+from flask import Flask
+
+from shared import currency
+from web.backend.routes.currency import currency_bp
+
+RATES = {"USD": 1.0, "EUR": 0.9, "MXN": 17.0, "JPY": 155.0}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(currency, "get_rates", lambda: RATES)
+    app = Flask(__name__)
+    app.register_blueprint(currency_bp)
+    return app.test_client()
+
+
+def test_convert_batch_normalizes_currency_codes(client):
+    response = client.get("/api/currency/convert_batch", query_string={"from_currency": "usd", "to_currency": "eur, mxn", "amount": "10"})
+
+    assert response.status_code == 200
+    assert [(row["from_currency"], row["to_currency"], row["result"]) for row in response.json["results"]] == [
+        ("USD", "EUR", 9.0),
+        ("USD", "MXN", 170.0),
+    ]
+    assert response.json["result"] == "10 USD = 9 EUR\n10 USD = 170 MXN"
+
+
+def test_convert_batch_allows_up_to_the_conversion_cap(client):
+    amounts = ",".join(str(amount) for amount in range(1, currency.MAX_BATCH_CONVERSIONS // 2 + 1))
+
+    response = client.get("/api/currency/convert_batch", query_string={"from_currency": "USD", "to_currency": "EUR,JPY", "amount": amounts})
+
+    assert response.status_code == 200
+    assert len(response.json["results"]) == currency.MAX_BATCH_CONVERSIONS
+
+
+def test_convert_batch_rejects_more_than_the_conversion_cap(client, monkeypatch):
+    monkeypatch.setattr(currency, "get_rates", lambda: pytest.fail("rates loaded for an oversized batch"))
+    amounts = ",".join(str(amount) for amount in range(1, currency.MAX_BATCH_CONVERSIONS + 2))
+
+    response = client.get("/api/currency/convert_batch", query_string={"from_currency": "USD", "to_currency": "EUR", "amount": amounts})
+
+    assert response.status_code == 400
+    assert response.json["error"] == f"Too many conversions; the limit is {currency.MAX_BATCH_CONVERSIONS}."
+
+
+@pytest.mark.parametrize(
+    "query_string, error",
+    [
+        ({"from_currency": "USD", "to_currency": "EUR"}, "Missing required parameters"),
+        ({"from_currency": "XXX", "to_currency": "EUR", "amount": "1"}, "Invalid currency code"),
+        ({"from_currency": "USD", "to_currency": "EUR,XXX", "amount": "1"}, "Invalid currency code"),
+        ({"from_currency": "USD,EUR", "to_currency": "MXN", "amount": "1"}, "Invalid currency code"),
+        ({"from_currency": "USD", "to_currency": ",", "amount": "1"}, "Invalid currency code"),
+        ({"from_currency": "USD", "to_currency": "EUR", "amount": "1,abc"}, "Invalid amount"),
+    ],
+)
+def test_convert_batch_rejects_bad_input(client, query_string, error):
+    response = client.get("/api/currency/convert_batch", query_string=query_string)
+
+    assert response.status_code == 400
+    assert response.json["error"] == error
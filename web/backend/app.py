@@ -8,6 +8,7 @@ from .routes.daily_checklist import daily_checklist_bp
 from .routes.dice import dice_bp
 from .routes.eight_ball import eight_ball_bp
 from .routes.encode import encode_bp
+from .routes.metrics import metrics_bp
 from .routes.rps import rps_bp
 from .routes.text_transform import text_transform_bp
 
@@ -19,6 +20,7 @@ app.register_blueprint(daily_checklist_bp)
 app.register_blueprint(dice_bp)
 app.register_blueprint(eight_ball_bp)
 app.register_blueprint(encode_bp)
+app.register_blueprint(metrics_bp)
 app.register_blueprint(rps_bp)
 app.register_blueprint(text_transform_bp)
 Swagger(app)
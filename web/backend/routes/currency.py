@@ -119,3 +119,95 @@ def convert_currency():
     except Exception as e:
         return log_and_send_json_response({"error": str(e)}, status_code=400)
     return log_and_send_json_response({"result": formatted})
+
+
+@currency_bp.route("/convert_batch", methods=["GET"])
+@log_request
+# @require_discord_id
+def convert_currency_batch():
+    """
+    Convert one amount into several currencies, or several amounts between two currencies, in one request.
+    ---
+    tags:
+      - currency
+    parameters:
+      - name: from_currency
+        in: query
+        type: string
+        required: true
+        description: The currency code to convert from
+      - name: to_currency
+        in: query
+        type: string
+        required: true
+        description: Comma-separated currency codes to convert to
+        example: EUR,MXN,JPY
+      - name: amount
+        in: query
+        type: string
+        required: true
+        description: Comma-separated amounts to convert
+        example: 10,25.5
+    responses:
+      200:
+        description: Conversion results, as structured rows and as preformatted text
+        schema:
+          type: object
+          properties:
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  amount:
+                    type: number
+                    example: 100
+                  from_currency:
+                    type: string
+                    example: USD
+                  to_currency:
+                    type: string
+                    example: EUR
+                  result:
+                    type: number
+                    example: 92.34
+            result:
+              type: string
+              example: "100 USD = 92.34 EUR\\n100 USD = 1705.2 MXN"
+      400:
+        description: Invalid input
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Invalid currency code or amount
+    """
+    from_currency_code = request.args.get("from_currency")
+    to_currency_codes = request.args.get("to_currency")
+    amounts = request.args.get("amount")
+    if not from_currency_code or not to_currency_codes or not amounts:
+        return log_and_send_json_response({"error": "Missing required parameters"}, status_code=400)
+    try:
+        from_currencies = currency.parse_currency_codes(from_currency_code)
+        to_currencies = currency.parse_currency_codes(to_currency_codes)
+    except KeyError:
+        return log_and_send_json_response({"error": "Invalid currency code"}, status_code=400)
+    if len(from_currencies) != 1 or not to_currencies:
+        return log_and_send_json_response({"error": "Invalid currency code"}, status_code=400)
+    try:
+        amounts = [float(amount) for amount in amounts.split(",")]
+    except ValueError:
+        return log_and_send_json_response({"error": "Invalid amount"}, status_code=400)
+    # Reject oversized batches before loading the rates.
+    if len(to_currencies) * len(amounts) > currency.MAX_BATCH_CONVERSIONS:
+        return log_and_send_json_response(
+            {"error": f"Too many conversions; the limit is {currency.MAX_BATCH_CONVERSIONS}."}, status_code=400
+        )
+    try:
+        conversions = currency.convert_currency_batch(from_currencies[0], to_currencies, amounts)
+    except Exception as e:
+        return log_and_send_json_response({"error": str(e)}, status_code=400)
+    return log_and_send_json_response(
+        {"results": [conversion._asdict() for conversion in conversions], "result": currency.format_conversions(conversions)}
+    )
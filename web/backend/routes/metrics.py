@@ -0,0 +1,21 @@
+from flask import Blueprint, Response
+
+from shared.metrics import metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """
+    In-process metrics (command and route latency, error and cache counters, queue gauges) in the Prometheus text format.
+    ---
+    tags:
+      - metrics
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: Prometheus text exposition
+    """
+    return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")